@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from . import core
+from .aio import AsyncAssemblyInfo
+from .core.chrom import _seqinfo_table
+from .core.contig import _contig_index
 from .interface import AssemblyInfo
 
 for module in [core]:
@@ -8,13 +11,16 @@ for module in [core]:
         if callable(func) and not name.startswith("_"):
             setattr(AssemblyInfo, name, func)
 
-__all__ = ["AssemblyInfo"]
+AssemblyInfo._warmup.extend([_seqinfo_table, _contig_index])
 
+__all__ = ["AssemblyInfo", "AsyncAssemblyInfo"]
 
-_db: AssemblyInfo | None = None
 
 def connect() -> AssemblyInfo:
-    global _db
-    if _db is None:
-        _db = AssemblyInfo()
-    return _db
+    """Returns the singleton instance of AssemblyInfo."""
+    return AssemblyInfo.connect()
+
+
+def preload() -> AssemblyInfo:
+    """Loads the database and its derived tables, e.g. before forking."""
+    return AssemblyInfo.preload()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable
+
+from .interface import AssemblyInfo
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = ["AsyncAssemblyInfo"]
+
+# the AssemblyInfo methods available as coroutines: read-only queries, so
+# that concurrent identical calls can share a result
+QUERIES = frozenset(
+    [
+        "assembly_info",
+        "available_accessions",
+        "available_assemblies",
+        "available_patches",
+        "available_species",
+        "build_assembly_info",
+        "compute_stats",
+        "detect_assemblies",
+        "diff_all_patches",
+        "diff_patches",
+        "filter_chromosome_data",
+        "find_contigs",
+        "find_sequence",
+        "get_accession_versions",
+        "get_assembly_from_accession",
+        "get_assembly_metadata",
+        "get_chrom_eq",
+        "get_chrom_ranks",
+        "get_chromnames",
+        "get_chromsizes",
+        "get_db",
+        "get_genbank_accession",
+        "get_info",
+        "get_metadata_table",
+        "get_organism_info",
+        "get_paired_accession",
+        "get_paired_accessions",
+        "get_patch_from_accession",
+        "get_refseq_accession",
+        "get_seqinfo",
+        "get_species_info",
+        "harmonize_dataset",
+        "match_accessions",
+        "partition_genome",
+        "query_metadata",
+        "resolve",
+        "resolve_accessions",
+        "sample_intervals",
+        "sample_positions",
+        "search",
+        "sort_intervals",
+        "sql",
+        "suggest",
+    ]
+)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converts call arguments into a hashable key, if possible."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    hash(value)
+    return value
+
+
+class AsyncAssemblyInfo:
+    """
+    Asyncio facade over :class:`AssemblyInfo`.
+
+    Every query method of AssemblyInfo, listed in ``QUERIES``, is available
+    as a coroutine. Methods changing the shared state, such as
+    ``register_assembly`` or ``set_output``, are not. Loading
+    the database and running queries happen in an executor, so they never
+    block the event loop. Concurrent calls with identical arguments are
+    coalesced into a single computation whose result is shared by all of
+    the awaiting callers, so results must not be modified in place.
+
+    Parameters
+    ----------
+    executor : Executor, optional
+        The executor queries run in. Defaults to a thread pool owned by the
+        facade and shut down by :meth:`close`.
+    max_workers : int, optional
+        The size of the default thread pool.
+
+    Examples
+    --------
+    >>> async with AsyncAssemblyInfo(max_workers=4) as db:
+    ...     chromsizes = await db.get_chromsizes("hg38", roles=["assembled"])
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+    ):
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="assemblyinfo"
+        )
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def __aenter__(self) -> Self:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shuts down the executor, if it is owned by the facade."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def _run(self, key: Hashable | None, func: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        if key is None:
+            return await loop.run_in_executor(self._executor, func)
+
+        key = (id(loop), key)
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.run_in_executor(self._executor, func)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shielded, so that a cancelled caller does not cancel the others
+        return await asyncio.shield(future)
+
+    async def connect(self) -> AssemblyInfo:
+        """Loads the database without blocking the event loop."""
+        if AssemblyInfo._instance is not None:
+            return AssemblyInfo._instance
+        return await self._run("connect", AssemblyInfo.connect)
+
+    async def call(self, name: str, *args, **kwargs) -> Any:
+        """
+        Runs an AssemblyInfo method in the executor.
+
+        Parameters
+        ----------
+        name : str
+            The name of the AssemblyInfo method, one of ``QUERIES``.
+        *args, **kwargs
+            The arguments of the method.
+
+        Returns
+        -------
+        Any
+            The result of the method.
+
+        Raises
+        ------
+        ValueError
+            If the method is not a query.
+
+        Examples
+        --------
+        >>> await db.call("get_assembly_metadata", "hg38")
+        """
+        if name not in QUERIES:
+            raise ValueError(f"ERROR: {name!r} is not an AssemblyInfo query!")
+        db = await self.connect()
+        func = functools.partial(getattr(db, name), *args, **kwargs)
+        try:
+            key = (name, _freeze(args), _freeze(kwargs))
+        except TypeError:
+            key = None
+        return await self._run(key, func)
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if name not in QUERIES:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        return functools.partial(self.call, name)
@@ -3,6 +3,8 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
 from bs4 import BeautifulSoup
 from schema import (
@@ -13,6 +15,15 @@ from schema import (
     REFSEQ_BLACKLIST,
 )
 
+from assemblyinfo.reports import (
+    merge_stat_info,
+    parse_chromosome_report,
+    parse_metadata_report,
+    parse_stats_report,
+    process_chromosome_info,
+)
+from assemblyinfo.storage import export_sqlite
+
 
 def get_directories(url: str) -> List[str]:
     """
@@ -201,8 +212,7 @@ def retrieve_file_from_url(url: str, pattern: str) -> List[str]:
 
 def get_metadata_info(url: str) -> Dict[str, str]:
     """
-    Reads the report file line by line until a '##' is encountered,
-    then splits the read lines and builds a dictionary from them.
+    Fetches the report file of an assembly and parses its metadata header.
 
     Parameters
     ----------
@@ -219,18 +229,7 @@ def get_metadata_info(url: str) -> Dict[str, str]:
     try:
         response = requests.get(file[0])
         response.raise_for_status()  # Ensure the request was successful
-        lines = response.text.split("\n")
-        collected_lines = []
-
-        for line in lines:
-            if line.strip() == "##" or len(line[1:].strip()) == 0:
-                break
-            collected_lines.append(line)
-
-        for item in collected_lines:
-            item = item[1:]
-            key, value = item.split(":", 1)  # Split only on the first colon
-            report_dict[key.strip().lower().replace(" ", "_")] = value.strip()
+        report_dict = parse_metadata_report(response.text)
 
     except Exception as e:
         print(f"Error reading report file from {url}: {e!s}")
@@ -240,8 +239,7 @@ def get_metadata_info(url: str) -> Dict[str, str]:
 
 def get_stats_info(url: str) -> pd.DataFrame:
     """
-    Reads the stats file line by line, then splits the read
-    lines and builds a dictionary from them.
+    Fetches the stats file of an assembly and parses it.
 
     Parameters
     ----------
@@ -254,43 +252,19 @@ def get_stats_info(url: str) -> pd.DataFrame:
         A DataFrame containing the stats information.
     """
     file = retrieve_file_from_url(url, "stats.txt")
-    dfs = []
     try:
         response = requests.get(file[0])
         response.raise_for_status()  # Ensure the request was successful
-        lines = response.text.split("\n")
-        collected_lines = []
-
-        for line in lines:
-            if line.startswith("#"):
-                continue
-            collected_lines.append(line)
-
-        for item in collected_lines:
-            if item.strip():
-                inner_df = pd.DataFrame(item.strip().split("\t")).T.replace(
-                    "na", np.NaN
-                )
-                inner_df.columns = [
-                    "unit-name",
-                    "molecule-name",
-                    "molecule-type",
-                    "sequence-type",
-                    "statistic",
-                    "value",
-                ]
-                dfs.append(inner_df)
+        return parse_stats_report(response.text)
 
     except Exception as e:
         print(f"Error reading stats file from {url}: {e!s}")
-
-    return pd.concat(dfs)
+        raise
 
 
 def get_chromosome_info(url: str) -> pd.DataFrame:
     """
-    Reads the report file line by line until a '##' is encountered,
-    then splits the read lines and builds a dictionary from them.
+    Fetches the report file of an assembly and parses its sequence table.
 
     Parameters
     ----------
@@ -303,91 +277,14 @@ def get_chromosome_info(url: str) -> pd.DataFrame:
         A DataFrame containing the chromosome information.
     """
     file = retrieve_file_from_url(url, "report.txt")
-    dfs = []
     try:
         response = requests.get(file[0])
         response.raise_for_status()  # Ensure the request was successful
-        lines = response.text.split("\n")
-        collected_lines = []
-
-        for line in lines:
-            if line.startswith("#"):
-                continue
-            collected_lines.append(line)
-
-        for item in collected_lines:
-            if item.strip():
-                inner_df = pd.DataFrame(item.strip().split("\t")).T.replace(
-                    "na", np.NaN
-                )
-                inner_df.columns = [
-                    "ncbi",
-                    "role",
-                    "molecule",
-                    "drop",
-                    "genbank",
-                    "drop1",
-                    "refseq",
-                    "unit",
-                    "length",
-                    "name",
-                ]
-                dfs.append(inner_df)
+        return parse_chromosome_report(response.text)
 
     except Exception as e:
         print(f"Error reading report file from {url}: {e!s}")
-
-    return pd.concat(dfs)
-
-
-def process_chromosome_info(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Processes the chromosome information DataFrame.
-
-    Parameters
-    ----------
-    df : pd.DataFrame
-        The DataFrame containing the chromosome information.
-
-    Returns
-    -------
-    pd.DataFrame
-        A processed DataFrame containing the chromosome information.
-    """
-    df = df.drop(columns=["drop", "drop1"]).reset_index(drop=True)
-    df["role"] = [role.split("-")[0] for role in df["role"]]
-    df = df[~df["role"].isin(["pseudo"])]
-
-    df["unit"] = [
-        unit.split()[0].lower().strip() if unit.startswith("P") else unit
-        for unit in df["unit"]
-    ]
-
-    df["name"].fillna(
-        {idx: f"chr{x}" for idx, x in enumerate(df["ncbi"])}, inplace=True
-    )
-
-    df = df.dropna(how="all", axis=1)
-
-    alias = {
-        molecule: name
-        for name, molecule in list(
-            zip(
-                df[df["role"] == "assembled"]["name"],
-                df[df["role"] == "assembled"]["molecule"],
-            )
-        )
-    }
-
-    df["molecule"] = [
-        alias[mol] if mol is not np.NaN and mol in alias else mol
-        for mol in df["molecule"]
-    ]
-
-    df = df.convert_dtypes()
-    df["length"] = df["length"].astype(pd.Int64Dtype())
-
-    return df
+        raise
 
 
 def insert_stat_info(df: pd.DataFrame, idx: int, path: str):
@@ -405,57 +302,7 @@ def insert_stat_info(df: pd.DataFrame, idx: int, path: str):
     path : str
         The path to the stats information.
     """
-    stats = get_stats_info(path)
-    stats = stats[stats["unit-name"].isin(["all", "Primary Assembly", "non_nuclear"])]
-    stats["molecule-type"].fillna("all", inplace=True)
-    stats["sequence-type"] = [s.split("-")[0] for s in stats["sequence-type"]]
-
-    # assembly
-    stats_all = stats[stats["molecule-type"] == "all"].reset_index(drop=True)
-
-    for i in stats_all.index:
-        if (
-            stats_all.loc[i, "unit-name"] == "Primary Assembly"
-            and stats_all.loc[i, "sequence-type"] == "all"
-        ):
-            stats_all.loc[i, "sequence-type"] = "primary"
-            stats_all.loc[i, "statistic"] = "-".join(
-                [stats_all.loc[i, "sequence-type"], stats_all.loc[i, "statistic"]]
-            )
-        elif stats_all.loc[i, "unit-name"] != "all":
-            tmp_name = stats_all.loc[i, "unit-name"].lower().replace(" ", "_")
-            stats_all.loc[i, "statistic"] = f"{tmp_name}-" + "-".join(
-                [stats_all.loc[i, "sequence-type"], stats_all.loc[i, "statistic"]]
-            )
-
-    df.at[idx, "metadata"] = df.loc[idx, "metadata"] | stats_all[
-        ["statistic", "value"]
-    ].set_index("statistic").astype(pd.Float64Dtype()).to_dict().get("value")
-
-    # chr
-    stats_chr = stats[stats["molecule-type"] != "all"].reset_index(drop=True)
-    stats_chr["statistic"] = [
-        "-".join([stats_chr.loc[idx, "sequence-type"], stats_chr.loc[idx, "statistic"]])
-        for idx in stats_chr.index
-    ]
-
-    for i in stats_chr.index:
-        if stats_chr.loc[i, "unit-name"] != "Primary Assembly":
-            name = stats_chr.loc[i, "unit-name"].lower().replace(" ", "_")
-            stats_chr.loc[i, "statistic"] = f"{name}-" + stats_chr.loc[i, "statistic"]
-
-    stats_chr = stats_chr[["molecule-name", "statistic", "value"]]
-    stats_chr = stats_chr.pivot(
-        index="molecule-name", columns="statistic", values="value"
-    ).astype(pd.Float64Dtype())
-    # drop all columns filled with None
-
-    tmp_df = pd.DataFrame.from_records(df.loc[idx, "seqinfo"]).set_index("ncbi")
-    df.at[idx, "seqinfo"] = (
-        pd.merge(tmp_df, stats_chr, left_index=True, right_index=True, how="left")
-        .reset_index()
-        .to_dict(orient="records")
-    )
+    merge_stat_info(df, idx, get_stats_info(path))
 
 
 def get_version(s: List[str]):
@@ -528,3 +375,92 @@ def builder(init_db: pd.DataFrame) -> pd.DataFrame:
         db.loc[db.query(f"patch=='{patch}'").index, "version"] = "latest"
 
     return db
+
+
+def deduplicate_seqinfo(db: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Splits the seqinfo of every patch into a table of distinct contigs.
+
+    Consecutive patches share nearly all their contigs, so each distinct
+    contig is stored once and every patch keeps the positions of its
+    contigs in that table, in their original order.
+
+    Parameters
+    ----------
+    db : pd.DataFrame
+        The database, as returned by ``builder``.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        The database with its 'seqinfo' column replaced by a 'contigs'
+        column of int32 positions, and the table of distinct contigs, to
+        be saved as 'db.parquet' and 'contigs.parquet'.
+    """
+    records = pd.DataFrame.from_records(
+        [contig for seqinfo in db["seqinfo"] for contig in seqinfo]
+    )
+    codes = records.groupby(
+        list(records.columns), dropna=False, sort=False
+    ).ngroup().to_numpy(np.int32)
+    _, first = np.unique(codes, return_index=True)
+    contigs = records.take(first).reset_index(drop=True)
+
+    offsets = np.cumsum([0] + [len(seqinfo) for seqinfo in db["seqinfo"]])
+    db = db.copy()
+    db["seqinfo"] = [codes[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+    return db.rename(columns={"seqinfo": "contigs"}), contigs
+
+
+def write_db(db: pd.DataFrame, directory: str):
+    """
+    Saves the database as 'db.parquet' and 'contigs.parquet'.
+
+    Parameters
+    ----------
+    db : pd.DataFrame
+        The database, as returned by ``builder``.
+
+    directory : str
+        The directory to save the files into.
+    """
+    db, contigs = deduplicate_seqinfo(db)
+
+    pq.write_table(
+        pa.Table.from_pandas(contigs, preserve_index=False),
+        f"{directory}/contigs.parquet",
+        compression="zstd",
+    )
+
+    table = pa.Table.from_pandas(db, preserve_index=False)
+    column = table.schema.get_field_index("contigs")
+    table = table.set_column(
+        column, "contigs", table["contigs"].cast(pa.list_(pa.int32()))
+    )
+    # the positions of a patch are mostly consecutive, so they delta-encode well
+    pq.write_table(
+        table,
+        f"{directory}/db.parquet",
+        compression="zstd",
+        use_dictionary=False,
+        column_encoding={"contigs.list.element": "DELTA_BINARY_PACKED"},
+    )
+
+
+def write_sqlite(directory: str):
+    """
+    Exports 'db.parquet' and 'contigs.parquet' as 'db.sqlite'.
+
+    The SQLite file holds the normalized assembly, patch and contig tables
+    read by ``SQLiteStorage``.
+
+    Parameters
+    ----------
+    directory : str
+        The directory holding the parquet files, written by ``write_db``.
+    """
+    export_sqlite(
+        f"{directory}/db.sqlite",
+        db_path=f"{directory}/db.parquet",
+        contigs_path=f"{directory}/contigs.parquet",
+    )
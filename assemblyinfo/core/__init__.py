@@ -1,8 +1,13 @@
 from .acc import (
+    get_accession_versions,
     get_assembly_from_accession,
     get_genbank_accession,
+    get_paired_accession,
+    get_paired_accessions,
     get_patch_from_accession,
     get_refseq_accession,
+    match_accessions,
+    resolve_accessions,
 )
 from .assembly import (
     Assembly,
@@ -15,6 +20,17 @@ from .chrom import (
     get_chromsizes,
     get_seqinfo,
 )
+from .contig import (
+    find_contigs,
+    find_sequence,
+)
+from .detect import detect_assemblies
+from .diff import (
+    diff_all_patches,
+    diff_patches,
+)
+from .export import export_references
+from .harmonize import harmonize_dataset
 from .info import (
     available_accessions,
     available_assemblies,
@@ -29,6 +45,29 @@ from .info import (
     get_version,
     info,
 )
+from .metadata import (
+    get_metadata_table,
+    query_metadata,
+)
+from .partition import partition_genome
+from .registry import register_assembly
+from .resolve import (
+    AssemblyKey,
+    resolve,
+    suggest,
+)
+from .sample import (
+    iter_sample_positions,
+    sample_intervals,
+    sample_positions,
+)
+from .search import search
+from .sort import (
+    get_chrom_ranks,
+    sort_intervals,
+)
+from .sql import sql
+from .stats import compute_stats
 
 __all__ = [
     "info",
@@ -39,6 +78,8 @@ __all__ = [
     "get_version",
     "build_assembly_info",
     "get_assembly_metadata",
+    "get_metadata_table",
+    "query_metadata",
     "available_assemblies",
     "available_patches",
     "available_species",
@@ -47,11 +88,36 @@ __all__ = [
     "get_refseq_accession",
     "get_patch_from_accession",
     "get_assembly_from_accession",
+    "get_accession_versions",
+    "get_paired_accession",
+    "match_accessions",
+    "get_paired_accessions",
+    "resolve_accessions",
     "filter_chromosome_data",
     "get_chromnames",
     "get_chromsizes",
     "get_chrom_eq",
     "get_seqinfo",
+    "find_sequence",
+    "find_contigs",
+    "diff_patches",
+    "diff_all_patches",
     "Assembly",
     "assembly_info",
+    "AssemblyKey",
+    "resolve",
+    "suggest",
+    "search",
+    "register_assembly",
+    "get_chrom_ranks",
+    "sort_intervals",
+    "harmonize_dataset",
+    "detect_assemblies",
+    "sql",
+    "compute_stats",
+    "sample_positions",
+    "sample_intervals",
+    "iter_sample_positions",
+    "partition_genome",
+    "export_references",
 ]
@@ -1,12 +1,117 @@
-from typing import List
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from ..dtypes import STRING_DTYPE, compact
+from .resolve import _rows, resolve
 
 __all__ = [
     "get_genbank_accession",
     "get_refseq_accession",
     "get_patch_from_accession",
     "get_assembly_from_accession",
+    "get_accession_versions",
+    "get_paired_accession",
+    "match_accessions",
+    "get_paired_accessions",
+    "resolve_accessions",
 ]
 
+# accession prefixes, by their integer code in the accession index
+PREFIXES = {"GCA": 0, "GCF": 1}
+PREFIX_COLUMNS = ["genbank_accession", "refseq_accession"]
+PREFIX_KINDS = ["genbank", "refseq"]
+ACCESSION_PATTERN = r"^\s*(GC[AF])_(\d{1,9})(?:\.(\d{1,3}))?\s*$"
+
+# an accession is keyed by (prefix * ID_SPAN + id) * VERSION_SPAN + version
+ID_SPAN = 10**9
+VERSION_SPAN = 10**3
+
+
+def _parse_accessions(accessions: Iterable[str]) -> pd.DataFrame:
+    """
+    Splits accessions into integer prefix, id and version columns.
+
+    The base key identifies the accession regardless of its version. Invalid
+    accessions get a base of -1 and missing versions a version of -1.
+    """
+    # sample sheets repeat a few accessions, so only distinct ones are parsed
+    codes, uniques = pd.factorize(pd.Series(list(accessions), dtype=object))
+    parts = (
+        pd.Series(uniques, dtype="string").str.upper().str.extract(ACCESSION_PATTERN)
+    )
+    prefix = parts[0].map(PREFIXES).astype("Int64")
+    number = pd.to_numeric(parts[1]).astype("Int64")
+    version = pd.to_numeric(parts[2]).astype("Int64")
+    parsed = pd.DataFrame(
+        {
+            "prefix": prefix.fillna(-1).to_numpy(np.int64),
+            "base": (prefix * ID_SPAN + number).fillna(-1).to_numpy(np.int64),
+            "version": version.fillna(-1).to_numpy(np.int64),
+        }
+    )
+    # missing inputs get the code -1, which takes the appended invalid entry
+    invalid = pd.DataFrame({"prefix": [-1], "base": [-1], "version": [-1]})
+    parsed = pd.concat([parsed, invalid], ignore_index=True)
+    return parsed.take(codes).reset_index(drop=True)
+
+
+def _accession_entries(data: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """Returns the accession index entries of database rows, unsorted."""
+    frames = []
+    for column in PREFIX_COLUMNS:
+        parsed = _parse_accessions(data[column].take(rows).fillna(""))
+        parsed["row"] = rows
+        frames.append(parsed[(parsed["base"] >= 0) & (parsed["version"] >= 0)])
+
+    entries = pd.concat(frames, ignore_index=True)
+    entries["key"] = entries["base"] * VERSION_SPAN + entries["version"]
+    return entries
+
+
+def _build_accession_index(cls) -> pd.DataFrame:
+    entries = _accession_entries(cls._data, np.arange(len(cls._data)))
+    return entries.sort_values(["key", "row"], ignore_index=True)
+
+
+def _accession_index(cls) -> pd.DataFrame:
+    """
+    Returns the accessions of the database, sorted by their integer key.
+
+    Each accession of a patch is one entry holding its prefix code, base
+    key, version, key and database row, so that exact and version-agnostic
+    lookups are binary searches over the sorted keys.
+    """
+    return cls._cached("accession_index", lambda: _build_accession_index(cls))
+
+
+def _accession_rows(cls, accession: str) -> pd.DataFrame:
+    """
+    Returns the index entries matching an accession.
+
+    Versioned accessions match exactly, unversioned ones match every
+    version of the accession, newest first.
+    """
+    index = _accession_index(cls)
+    parsed = _parse_accessions([accession]).iloc[0]
+    if parsed["base"] < 0:
+        raise ValueError(f"ERROR: {accession} is not a valid accession!")
+
+    keys = index["key"].to_numpy()
+    if parsed["version"] >= 0:
+        first = last = parsed["base"] * VERSION_SPAN + parsed["version"]
+    else:
+        first = parsed["base"] * VERSION_SPAN
+        last = first + VERSION_SPAN - 1
+    start, stop = keys.searchsorted([first, last + 1])
+    if start == stop:
+        raise ValueError(f"ERROR: {accession} not in database!")
+
+    entries = index.iloc[start:stop]
+    order = np.lexsort((entries["row"], -entries["version"]))
+    return entries.iloc[order]
+
 
 def get_genbank_accession(cls, patch: str) -> str:
     """
@@ -33,10 +138,10 @@ def get_genbank_accession(cls, patch: str) -> str:
     """
     if not patch:
         raise ValueError("ERROR: you must provide a patch!")
-    elif patch not in cls._data.patch.tolist():
-        raise ValueError("ERROR: patch not in database!")
 
-    return cls._data.query(f"patch=='{patch}'").genbank_accession.tolist()
+    key = resolve(cls, patch, kinds=["patch"])
+    rows = _rows(cls, "patch", key.patch)
+    return cls._data["genbank_accession"].take(rows).tolist()
 
 
 def get_refseq_accession(cls, patch: str) -> str:
@@ -64,20 +169,23 @@ def get_refseq_accession(cls, patch: str) -> str:
     """
     if not patch:
         raise ValueError("ERROR: you must provide a patch!")
-    elif patch not in cls._data.patch.tolist():
-        raise ValueError("ERROR: patch not in database!")
 
-    return cls._data.query(f"patch=='{patch}'").refseq_accession.tolist()
+    key = resolve(cls, patch, kinds=["patch"])
+    rows = _rows(cls, "patch", key.patch)
+    return cls._data["refseq_accession"].take(rows).tolist()
 
 
 def get_patch_from_accession(cls, accession: str) -> List[str]:
     """
     Returns the patches for the specified accession.
 
+    Accessions without a version match every version, and the patches are
+    then listed newest first.
+
     Parameters
     ----------
     accession : str
-        The accession to filter by.
+        The accession to filter by, with or without a version.
 
     Returns
     -------
@@ -92,31 +200,25 @@ def get_patch_from_accession(cls, accession: str) -> List[str]:
     Examples
     --------
     >>> AssemblyInfo.get_patch_from_accession("GCA_000001405.29")
+    >>> AssemblyInfo.get_patch_from_accession("GCF_000001405")
     """
     if not accession:
         raise ValueError("ERROR: you must provide an accession!")
-    elif (
-        accession not in cls._data.genbank_accession.dropna().tolist()
-        and accession not in cls._data.refseq_accession.dropna().tolist()
-    ):
-        raise ValueError("ERROR: accession not in database!")
-
-    if accession in cls._data.genbank_accession.dropna().tolist():
-        return cls._data.query(f"genbank_accession=='{accession}'").patch.tolist()
-    elif accession in cls._data.refseq_accession.dropna().tolist():
-        return cls._data.query(f"refseq_accession=='{accession}'").patch.tolist()
-    else:
-        raise ValueError("ERROR: accession not in database!")
+
+    rows = _accession_rows(cls, accession)["row"]
+    return cls._data["patch"].take(rows).tolist()
 
 
 def get_assembly_from_accession(cls, accession: str) -> List[str]:
     """
     Returns the assembly names for the specified accession.
 
+    Accessions without a version resolve to their newest version.
+
     Parameters
     ----------
     accession : str
-        The accession to filter by.
+        The accession to filter by, with or without a version.
 
     Returns
     -------
@@ -131,28 +233,239 @@ def get_assembly_from_accession(cls, accession: str) -> List[str]:
     Examples
     --------
     >>> AssemblyInfo.get_assembly_from_accession("GCA_000001405.29")
+    >>> AssemblyInfo.get_assembly_from_accession("GCA_000001405")
     """
     if not accession:
         raise ValueError("ERROR: you must provide an accession!")
-    elif (
-        accession not in cls._data.genbank_accession.dropna().tolist()
-        and accession not in cls._data.refseq_accession.dropna().tolist()
-    ):
-        raise ValueError("ERROR: accession not in database!")
-
-    if accession in cls._data.genbank_accession.dropna().tolist():
-        return (
-            cls._data.query(f"genbank_accession=='{accession}'")
-            .reset_index()
-            .loc[0, ["assembly", "assembly_ucsc"]]
-            .tolist()
-        )
-    elif accession in cls._data.refseq_accession.dropna().tolist():
-        return (
-            cls._data.query(f"refseq_accession=='{accession}'")
-            .reset_index()
-            .loc[0, ["assembly", "assembly_ucsc"]]
-            .tolist()
-        )
+
+    row = _accession_rows(cls, accession)["row"].iat[0]
+    return cls._data.loc[row, ["assembly", "assembly_ucsc"]].tolist()
+
+
+def get_accession_versions(cls, accession: str) -> List[str]:
+    """
+    Returns every version of an accession in the database, newest first.
+
+    Parameters
+    ----------
+    accession : str
+        The accession, with or without a version. A version is ignored.
+
+    Returns
+    -------
+    List[str]
+        The versioned accessions.
+
+    Raises
+    ------
+    ValueError
+        If the accession is not provided, not valid or not found in the
+        database.
+
+    Examples
+    --------
+    >>> AssemblyInfo.get_accession_versions("GCF_000001635")
+    ['GCF_000001635.27', 'GCF_000001635.26', 'GCF_000001635.25', ...]
+    """
+    if not accession:
+        raise ValueError("ERROR: you must provide an accession!")
+
+    unversioned = accession.strip().rsplit(".", 1)[0]
+    entries = _accession_rows(cls, unversioned)
+    entries = entries.drop_duplicates("key")
+    columns = [PREFIX_COLUMNS[p] for p in entries["prefix"]]
+    return [cls._data.at[row, c] for row, c in zip(entries["row"], columns)]
+
+
+def get_paired_accession(cls, accession: str) -> List[str]:
+    """
+    Returns the GenBank/RefSeq counterparts of an accession.
+
+    A GenBank (GCA) accession is paired with the RefSeq (GCF) accession of
+    the same patch, and vice versa. Accessions without a version pair
+    through their newest version.
+
+    Parameters
+    ----------
+    accession : str
+        The accession, with or without a version.
+
+    Returns
+    -------
+    List[str]
+        The paired accessions, empty if the patch has no counterpart.
+
+    Raises
+    ------
+    ValueError
+        If the accession is not provided, not valid or not found in the
+        database.
+
+    Examples
+    --------
+    >>> AssemblyInfo.get_paired_accession("GCA_000001405.28")
+    ['GCF_000001405.39']
+    >>> AssemblyInfo.get_paired_accession("GCF_000001405")
+    ['GCA_000001405.29']
+    """
+    if not accession:
+        raise ValueError("ERROR: you must provide an accession!")
+
+    entries = _accession_rows(cls, accession)
+    entries = entries[entries["key"] == entries["key"].iat[0]]
+    column = PREFIX_COLUMNS[1 - entries["prefix"].iat[0]]
+    return cls._data[column].take(entries["row"]).dropna().unique().tolist()
+
+
+def match_accessions(
+    cls,
+    accessions: Iterable[str],
+    ignore_version: bool = False,
+) -> np.ndarray:
+    """
+    Returns the database row of each accession, with a vectorized lookup.
+
+    Versioned accessions match exactly, unversioned ones match their newest
+    version. When an accession is shared by several patches, the first
+    patch in the database is matched.
+
+    Parameters
+    ----------
+    accessions : Iterable[str]
+        The accessions to look up.
+    ignore_version : bool
+        Whether to match the newest version of every accession, even when
+        a version is given.
+
+    Returns
+    -------
+    np.ndarray
+        The database row of each accession, or -1 if it is not valid or
+        not found.
+
+    Examples
+    --------
+    >>> AssemblyInfo.match_accessions(["GCF_000001405.40", "GCA_000001405"])
+    array([26, 26])
+    """
+    parsed = _parse_accessions(accessions)
+    return _match_parsed(cls, parsed, ignore_version)
+
+
+def _match_parsed(cls, parsed: pd.DataFrame, ignore_version: bool) -> np.ndarray:
+    index = _accession_index(cls)
+    keys = index["key"].to_numpy()
+    rows = index["row"].to_numpy()
+    base = parsed["base"].to_numpy()
+    version = parsed["version"].to_numpy()
+
+    newest = keys.searchsorted(base * VERSION_SPAN + VERSION_SPAN - 1, "right") - 1
+    newest_key = keys[np.maximum(newest, 0)]
+    found_newest = (newest >= 0) & (newest_key // VERSION_SPAN == base)
+
+    exact = (version >= 0) & (not ignore_version)
+    wanted = np.where(exact, base * VERSION_SPAN + version, newest_key)
+    position = np.minimum(keys.searchsorted(wanted), len(keys) - 1)
+    found = np.where(exact, keys[position] == wanted, found_newest) & (base >= 0)
+    return np.where(found, rows[position], -1)
+
+
+def get_paired_accessions(
+    cls,
+    accessions: Iterable[str],
+    ignore_version: bool = False,
+) -> pd.Series:
+    """
+    Returns the GenBank/RefSeq counterpart of each accession.
+
+    Parameters
+    ----------
+    accessions : Iterable[str]
+        The accessions to pair.
+    ignore_version : bool
+        Whether to pair the newest version of every accession, even when a
+        version is given.
+
+    Returns
+    -------
+    pd.Series
+        The paired accession of each input, indexed by the inputs, with NA
+        for accessions not found or without counterpart.
+
+    Examples
+    --------
+    >>> AssemblyInfo.get_paired_accessions(["GCA_000001405.28", "GCF_000001405"])
+    """
+    accessions = list(accessions)
+    parsed = _parse_accessions(accessions)
+    rows = _match_parsed(cls, parsed, ignore_version)
+    prefix = parsed["prefix"].to_numpy()
+    genbank = cls._data["genbank_accession"].to_numpy(object)[rows]
+    refseq = cls._data["refseq_accession"].to_numpy(object)[rows]
+
+    paired = pd.Series(
+        np.where(prefix == 0, refseq, genbank),
+        index=pd.Index(accessions, name="accession"),
+        name="paired_accession",
+        dtype=STRING_DTYPE,
+    )
+    return paired.mask(rows < 0)
+
+
+def resolve_accessions(
+    cls,
+    accessions: Iterable[str],
+    ignore_version: bool = False,
+) -> pd.DataFrame:
+    """
+    Resolves many accessions at once, e.g. the column of a sample sheet.
+
+    All accessions are matched against the accession index in a single
+    vectorized lookup. Unknown or invalid accessions are flagged in the
+    'found' column instead of raising, so that one bad entry does not
+    abort the batch.
+
+    Parameters
+    ----------
+    accessions : Iterable[str]
+        The accessions to resolve, with or without versions. The index of a
+        Series is kept in the result.
+    ignore_version : bool
+        Whether to resolve the newest version of every accession, even when
+        a version is given.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per input with the columns 'accession', 'accession_type'
+        ('genbank' or 'refseq'), 'assembly', 'assembly_ucsc', 'patch',
+        'species' and 'found'. Columns are NA for accessions not found.
+
+    Examples
+    --------
+    >>> AssemblyInfo.resolve_accessions(sheet["accession"])
+    >>> AssemblyInfo.resolve_accessions(["GCF_000001405.40", "GCA_000001635"])
+    """
+    if isinstance(accessions, pd.Series):
+        index = accessions.index
     else:
-        raise ValueError("ERROR: accession not in database!")
+        accessions = list(accessions)
+        index = pd.RangeIndex(len(accessions))
+
+    parsed = _parse_accessions(accessions)
+    rows = _match_parsed(cls, parsed, ignore_version)
+    found = rows >= 0
+    prefix = parsed["prefix"].to_numpy()
+
+    result = (
+        cls._data[["assembly", "assembly_ucsc", "patch", "species"]]
+        .take(np.where(found, rows, 0))
+        .set_axis(index)
+    )
+    result[~found] = pd.NA
+    result.insert(0, "accession", pd.array(accessions, dtype=STRING_DTYPE))
+    kinds = np.array(PREFIX_KINDS, dtype=object)[np.maximum(prefix, 0)]
+    result.insert(1, "accession_type", pd.array(kinds, dtype=STRING_DTYPE))
+    result.loc[~found, "accession_type"] = pd.NA
+    result["found"] = found
+    return compact(result)
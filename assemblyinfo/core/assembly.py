@@ -1,26 +1,116 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
-from .chrom import filter_chromosome_data
+from .chrom import _lookup_row, filter_chromosome_data
 from .info import get_assembly_metadata
 
 __all__ = ["Assembly", "assembly_info"]
 
+PROVIDERS = ["name", "ncbi", "genbank", "refseq"]
+
 
-@dataclass
 class Assembly:
     """
-    A dataclass to store assembly information.
+    A lazy handle on the information of an assembly.
+
+    The constructor takes the fields of the former eager dataclass, so that
+    an Assembly can still be built from known values. Fields left to None
+    are computed from ``db`` on first access and memoized on the instance:
+    only the assembly name and the chromosome filters are stored on
+    creation. The underlying tables are cached by the database in a bounded
+    LRU cache keyed on the resolved patch, so every Assembly created for
+    the same patch and filters shares them; they must not be modified in
+    place.
     """
 
-    assembly: str
-    species: str
-    common_name: str
-    seqinfo: pd.DataFrame
-    metadata: Dict[str, str]
-    aliases: Dict[str, Dict[str, str]]
+    def __init__(
+        self,
+        assembly: str,
+        species: Optional[str] = None,
+        common_name: Optional[str] = None,
+        seqinfo: Optional[pd.DataFrame] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        aliases: Optional[Dict[str, Dict[str, str]]] = None,
+        *,
+        db: Any = None,
+        provider: str = "name",
+        roles: Optional[Tuple[str, ...]] = None,
+        units: Optional[Tuple[str, ...]] = None,
+        length: Optional[str] = None,
+    ):
+        self.assembly = assembly
+        self.db = db
+        self.provider = provider
+        self.roles = roles
+        self.units = units
+        self.length = length
+
+        given = {
+            "species": species,
+            "common_name": common_name,
+            "seqinfo": seqinfo,
+            "metadata": metadata,
+            "aliases": aliases,
+        }
+        # stored values take precedence over the cached properties
+        vars(self).update({k: v for k, v in given.items() if v is not None})
+
+    @cached_property
+    def _index(self) -> int:
+        if self.db is None:
+            raise ValueError(
+                f"ERROR: Assembly {self.assembly!r} has no database to load from!"
+            )
+        return _lookup_row(self.db, self.assembly)
+
+    @cached_property
+    def _row(self) -> pd.Series:
+        return self.db._data.iloc[self._index]
+
+    @cached_property
+    def species(self) -> str:
+        return self._row["species"]
+
+    @cached_property
+    def common_name(self) -> str:
+        return self._row["common_name"]
+
+    @cached_property
+    def seqinfo(self) -> pd.DataFrame:
+        key = (
+            "assembly_seqinfo",
+            self._index,
+            self.provider,
+            self.roles,
+            self.units,
+            self.length,
+        )
+        return self.db._cached_query(
+            key,
+            lambda: filter_chromosome_data(
+                self.db,
+                assembly=self.assembly,
+                roles=list(self.roles) if self.roles else None,
+                units=list(self.units) if self.units else None,
+                length=self.length,
+                output="pandas",
+            ).set_index(self.provider),
+        )
+
+    @cached_property
+    def metadata(self) -> Dict[str, Any]:
+        return self.db._cached_query(
+            ("assembly_metadata", self._index),
+            lambda: get_assembly_metadata(
+                self.db, assembly=self.assembly, output="pandas"
+            ),
+        )
+
+    @cached_property
+    def aliases(self) -> Dict[str, Dict[str, str]]:
+        return self.chromeq.to_dict(orient="index")
 
     @property
     def chromnames(self) -> List[str]:
@@ -31,8 +121,8 @@ class Assembly:
         return self.seqinfo["length"]
 
     @property
-    def chromeq(self) -> Dict[str, Dict[str, str]]:
-        return pd.DataFrame(self.aliases).T
+    def chromeq(self) -> pd.DataFrame:
+        return self.seqinfo[[p for p in PROVIDERS if p != self.provider]]
 
     def __repr__(self):
         return (f"Assembly(assembly={self.assembly}, "
@@ -50,6 +140,10 @@ def assembly_info(
 ) -> Assembly:
     """
     Get assembly information for a given assembly.
+
+    The returned Assembly is lazy: its seqinfo, aliases and metadata are
+    only computed when first accessed.
+
     Parameters
     ----------
     assembly : str
@@ -66,6 +160,10 @@ def assembly_info(
     -------
     Assembly
         Assembly information.
+    Raises
+    ------
+    ValueError
+        If the provider is not valid or the assembly is not in the database.
     Examples
     --------
     >>> assembly_info("hg38")
@@ -77,26 +175,16 @@ def assembly_info(
     if provider == "ucsc" or provider is None:
         provider = "name"
 
-    if provider not in ["name", "ncbi", "genbank", "refseq"]:
+    if provider not in PROVIDERS:
         raise ValueError("Invalid provider.")
 
-    seqinfo = filter_chromosome_data(
-        cls, assembly=assembly, roles=roles, units=units, length=length
-    )
-
-    aliases = (
-        seqinfo[["name", "ncbi", "genbank", "refseq"]]
-        .set_index(provider)
-        .to_dict(orient="index")
-    )
-
-    metadata = get_assembly_metadata(cls, assembly=assembly)
+    _lookup_row(cls, assembly)
 
     return Assembly(
+        db=cls,
         assembly=assembly,
-        species=metadata["species"],
-        common_name=metadata["common_name"],
-        seqinfo=seqinfo.set_index(provider),
-        metadata=metadata,
-        aliases=aliases,
+        provider=provider,
+        roles=tuple(roles) if roles else None,
+        units=tuple(units) if units else None,
+        length=length,
     )
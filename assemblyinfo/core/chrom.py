@@ -1,6 +1,16 @@
 from __future__ import annotations
 
+import re
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ..dtypes import check_output, compact, extend_table, type_arrow_seqinfo
+from ..instrumentation import _phase
+from .resolve import ASSEMBLY_KINDS, resolve
 
 __all__ = [
     "filter_chromosome_data",
@@ -10,6 +20,185 @@ __all__ = [
     "get_seqinfo",
 ]
 
+PROVIDER_COLUMNS = {
+    "ucsc": "name",
+    "name": "name",
+    "ncbi": "ncbi",
+    "genbank": "genbank",
+    "refseq": "refseq",
+}
+
+# comparisons accepted in length conditions, for the Arrow output
+LENGTH_CONDITION = re.compile(r"^\s*(>=|<=|==|!=|>|<)\s*(\d+(?:\.\d+)?)\s*$")
+LENGTH_OPERATORS = {
+    ">=": pc.greater_equal,
+    "<=": pc.less_equal,
+    "==": pc.equal,
+    "!=": pc.not_equal,
+    ">": pc.greater,
+    "<": pc.less,
+}
+
+
+def _provider_column(provider: str | None) -> str:
+    """Maps a provider name to the seqinfo column holding its contig names."""
+    if not provider:
+        return "name"
+    elif provider in PROVIDER_COLUMNS:
+        return PROVIDER_COLUMNS[provider]
+    else:
+        error_msg = (
+            f"{provider} is not a valid provider!\n",
+            "Valid providers are 'ucsc', 'genbank', 'refseq', 'ncbi'",
+        )
+        raise ValueError(error_msg)
+
+
+def _output(cls, output: str | None) -> str:
+    """Returns the result type of a call, defaulting to the global one."""
+    return check_output(output or cls._output)
+
+
+def _lookup_row(cls, assembly: str) -> int:
+    """
+    Returns the database row holding the seqinfo of an assembly or patch.
+
+    Assembly names (NCBI or UCSC) resolve to their latest patch, while
+    patch names and accessions resolve to that exact patch.
+    """
+    return resolve(cls, assembly, kinds=ASSEMBLY_KINDS).row
+
+
+def _take_contigs(cls, positions: np.ndarray) -> pd.DataFrame:
+    """Returns the distinct contigs at the given positions, as a seqinfo."""
+    return compact(cls._contigs.take(positions).reset_index(drop=True))
+
+
+def _arrow_contigs(cls) -> pa.Table:
+    """Returns the distinct contigs as an Arrow table, read from the file."""
+
+    def build():
+        table = pq.read_table(cls._contigs_path).replace_schema_metadata()
+        # registered contigs follow the packaged ones
+        table = extend_table(table.combine_chunks(), cls._contigs.iloc[len(table) :])
+        return type_arrow_seqinfo(table)
+
+    return cls._cached("arrow_contigs", build)
+
+
+def _length_mask(lengths: pa.Array, length: str) -> pa.Array:
+    match = LENGTH_CONDITION.match(length)
+    if not match:
+        raise ValueError(f"ERROR: {length} is not a valid length condition!")
+    op, value = match.groups()
+    return LENGTH_OPERATORS[op](lengths, float(value))
+
+
+def _filter_pandas(
+    cls,
+    row: int,
+    roles: list[str] | None,
+    units: list[str] | None,
+    length: str | None,
+) -> pd.DataFrame:
+    """Returns the contigs of a database row passing the filters."""
+    q2 = ""
+
+    if length:
+        q2 += f"length {length}"
+
+    if roles:
+        if len(q2) > 0:
+            q2 += f" and role.isin({roles})"
+        else:
+            q2 += f"role.isin({roles})"
+
+    if units:
+        if len(q2) > 0:
+            q2 += f"  and unit.isin({units})"
+        else:
+            q2 += f"unit.isin({units})"
+
+    positions = cls._data["contigs"].iat[row]
+
+    if len(q2) > 0:
+        # only the filtered columns are queried, before building the rows
+        with _phase("filter"):
+            columns = cls._contigs[["length", "role", "unit"]].take(positions)
+            selected = columns.reset_index(drop=True).query(q2).index
+
+        with _phase("build"):
+            return _take_contigs(cls, positions[selected]).set_axis(selected)
+
+    with _phase("build"):
+        return _take_contigs(cls, positions)
+
+
+def _filter_arrow(
+    cls,
+    row: int,
+    roles: list[str] | None,
+    units: list[str] | None,
+    length: str | None,
+) -> pa.Table:
+    """Returns the contigs of a database row passing the filters, as Arrow."""
+    table = _arrow_contigs(cls)
+    positions = cls._data["contigs"].iat[row]
+    if length or roles or units:
+        with _phase("filter"):
+            columns = table.select(["length", "role", "unit"]).take(positions)
+            masks = []
+            if length:
+                masks.append(_length_mask(columns["length"], length))
+            if roles:
+                masks.append(pc.is_in(columns["role"], pa.array(roles)))
+            if units:
+                masks.append(pc.is_in(columns["unit"], pa.array(units)))
+            # contigs with a missing length fail length conditions
+            mask = pc.fill_null(masks[0], False)
+            for other in masks[1:]:
+                mask = pc.and_(mask, pc.fill_null(other, False))
+            positions = positions[mask.to_numpy(zero_copy_only=False)]
+
+    with _phase("build"):
+        return table.take(positions)
+
+
+def _seqinfo_rows(
+    data: pd.DataFrame, contigs: pd.DataFrame, rows: np.ndarray
+) -> pd.DataFrame:
+    """Returns the seqinfo of database rows flattened into a single table."""
+    membership = data["contigs"].take(rows)
+    table = contigs.take(np.concatenate(membership.tolist()))
+    table = table.reset_index(drop=True)
+    table.insert(0, "row", np.repeat(rows, membership.map(len).to_numpy()))
+    return table
+
+
+def _build_seqinfo_table(cls) -> pd.DataFrame:
+    return _seqinfo_rows(cls._data, cls._contigs, np.arange(len(cls._data)))
+
+
+def _extend_seqinfo(
+    table: pd.DataFrame, data: pd.DataFrame, contigs: pd.DataFrame, rows: np.ndarray
+) -> pd.DataFrame:
+    """
+    Returns the seqinfo table with the contigs of new database rows, which
+    follow every row of the table, appended.
+    """
+    table = pd.concat([table, _seqinfo_rows(data, contigs, rows)], ignore_index=True)
+    return compact(table)
+
+
+def _seqinfo_table(cls) -> pd.DataFrame:
+    """
+    Returns the seqinfo of every patch flattened into a single table.
+
+    The ``row`` column points back to the database row of each contig, and
+    the rows of each patch are stored contiguously in database order.
+    """
+    return cls._cached("seqinfo_table", lambda: _build_seqinfo_table(cls))
+
 
 def filter_chromosome_data(
     cls,
@@ -17,72 +206,52 @@ def filter_chromosome_data(
     roles: list[str] | None = None,
     units: list[str] | None = None,
     length: str | None = None,
-) -> pd.DataFrame:
+    output: str | None = None,
+) -> pd.DataFrame | pa.Table:
     """
     Filters the chromosome data based on the provided parameters.
 
     Parameters
     ----------
     assembly : str
-        The assembly name to filter by.
+        The assembly, patch or accession to filter by, resolved
+        case-insensitively (see ``resolve``).
     roles : list[str], optional
         The roles to filter by.
     units : list[str], optional
         The units to filter by.
     length : Optional[str]
         The length condition to filter by (e.g., '> 1000').
+    output : Optional[str]
+        'pandas' or 'arrow', to return a ``pyarrow.Table`` sliced from the
+        contigs file (default: set by ``AssemblyInfo.set_output``).
 
     Returns
     -------
-    pd.DataFrame
+    Union[pd.DataFrame, pyarrow.Table]
         The filtered chromosome data.
 
     Raises
     ------
     ValueError
-        If the assembly is not found in the database.
+        If the assembly is not found in the database, or the output or the
+        length condition is not valid.
 
     Examples
     --------
     >>> AssemblyInfo.filter_chromosome_data("hg38", roles=["assembled"])
+    >>> AssemblyInfo.filter_chromosome_data("hg38", output="arrow")
     """
-    if assembly in cls._data["assembly"].tolist():
-        group = "assembly"
-    elif assembly in cls._data["assembly_ucsc"].dropna().tolist():
-        group = "assembly_ucsc"
-    else:
-        raise ValueError(f"{assembly} not in database!")
+    output = _output(cls, output)
+    storage = cls._storage()
 
-    q1 = f'{group} == "{assembly}" and version == "latest"'
-    q2 = ""
-
-    if length:
-        q2 += f"length {length}"
-
-    if roles:
-        if len(q2) > 0:
-            q2 += f" and role.isin({roles})"
-        else:
-            q2 += f"role.isin({roles})"
-
-    if units:
-        if len(q2) > 0:
-            q2 += f"  and unit.isin({units})"
-        else:
-            q2 += f"unit.isin({units})"
+    with _phase("lookup"):
+        row = storage.lookup(assembly)
 
-    if len(q2) > 0:
-        mask = (
-            pd.DataFrame.from_records(cls._data.query(q1).seqinfo.iloc[0])
-            .query(q2)
-            .convert_dtypes()
-        )
-    else:
-        mask = pd.DataFrame.from_records(
-            cls._data.query(q1).seqinfo.iloc[0]
-        ).convert_dtypes()
+    if output == "arrow":
+        return storage.arrow_contigs(row, roles, units, length)
 
-    return mask
+    return storage.contigs(row, roles, units, length)
 
 
 def get_chromnames(
@@ -123,18 +292,10 @@ def get_chromnames(
     --------
     >>> AssemblyInfo.get_chromnames("hg38", provider="ucsc")
     """
-    if not provider or provider == "ucsc":
-        colname = "name"
-    elif provider in ["genbank", "refseq", "ncbi"]:
-        colname = provider
-    else:
-        error_msg = (
-            f"{provider} is not a valid provider!\n",
-            "Valid providers are 'ucsc', 'genbank', 'refseq', 'ncbi'",
-        )
-        raise ValueError(error_msg)
+    colname = _provider_column(provider)
 
-    return cls.filter_chromosome_data(assembly, roles, units, length)[colname].tolist()
+    df = cls.filter_chromosome_data(assembly, roles, units, length, output="pandas")
+    return df[colname].tolist()
 
 
 def get_chromsizes(
@@ -144,7 +305,8 @@ def get_chromsizes(
     roles: list[str] | None = None,
     units: list[str] | None = None,
     length: str | None = None,
-) -> pd.Series:
+    output: str | None = None,
+) -> pd.Series | pa.Table:
     """
     Returns the chromosome sizes for the specified assembly.
 
@@ -160,11 +322,15 @@ def get_chromsizes(
         The units to filter by.
     length : Optional[str]
         The length condition to filter by (e.g., '> 1000').
+    output : Optional[str]
+        'pandas' or 'arrow', to return a ``pyarrow.Table`` sliced from the
+        contigs file (default: set by ``AssemblyInfo.set_output``).
 
     Returns
     -------
-    pd.Series
-        A series with chromosome sizes.
+    Union[pd.Series, pyarrow.Table]
+        A series with chromosome sizes, or a table of the names and
+        lengths in Arrow output.
 
     Raises
     ------
@@ -175,18 +341,11 @@ def get_chromsizes(
     --------
     >>> AssemblyInfo.get_chromsizes("hg38", provider="ucsc")
     """
-    if not provider or provider == "ucsc":
-        colname = "name"
-    elif provider in ["genbank", "refseq", "ncbi"]:
-        colname = provider
-    else:
-        error_msg = (
-            f"{provider} is not a valid provider!\n",
-            "Valid providers are 'ucsc', 'genbank', 'refseq', 'ncbi'",
-        )
-        raise ValueError(error_msg)
+    colname = _provider_column(provider)
 
-    df = cls.filter_chromosome_data(assembly, roles, units, length)
+    df = cls.filter_chromosome_data(assembly, roles, units, length, output=output)
+    if isinstance(df, pa.Table):
+        return df.select([colname, "length"])
     return df.set_index(colname)["length"]
 
 
@@ -197,7 +356,8 @@ def get_chrom_eq(
     roles: list[str] | None = None,
     units: list[str] | None = None,
     length: str | None = None,
-) -> pd.DataFrame:
+    output: str | None = None,
+) -> pd.DataFrame | pa.Table:
     """
     Returns the chromosome equivalence for the specified assembly.
 
@@ -213,10 +373,13 @@ def get_chrom_eq(
         The units to filter by.
     length : Optional[str]
         The length condition to filter by (e.g., '> 1000').
+    output : Optional[str]
+        'pandas' or 'arrow', to return a ``pyarrow.Table`` sliced from the
+        contigs file (default: set by ``AssemblyInfo.set_output``).
 
     Returns
     -------
-    pd.DataFrame
+    Union[pd.DataFrame, pyarrow.Table]
         A DataFrame with chromosome equivalence across different providers.
 
     Raises
@@ -233,61 +396,50 @@ def get_chrom_eq(
     elif "ucsc" in providers:
         providers = [p if p != "ucsc" else "name" for p in providers]
 
-    return cls.filter_chromosome_data(assembly, roles, units, length)[providers]
+    df = cls.filter_chromosome_data(assembly, roles, units, length, output=output)
+    if isinstance(df, pa.Table):
+        return df.select(providers)
+    return df[providers]
 
 
-def get_seqinfo(cls, assembly: str) -> pd.DataFrame:
+def get_seqinfo(
+    cls, assembly: str, output: str | None = None
+) -> pd.DataFrame | pa.Table:
     """
     Returns the sequence information for the specified assembly.
 
     Parameters
     ----------
     assembly : str
-        The assembly name to filter by.
+        The assembly, patch or accession to filter by, resolved
+        case-insensitively (see ``resolve``).
+    output : Optional[str]
+        'pandas' or 'arrow', to return a ``pyarrow.Table`` sliced from the
+        contigs file (default: set by ``AssemblyInfo.set_output``).
 
     Returns
     -------
-    pd.DataFrame
-        A DataFrame with sequence information.
+    Union[pd.DataFrame, pyarrow.Table]
+        A DataFrame with sequence information, indexed by name in pandas
+        output.
 
     Raises
     ------
     ValueError
-        If the assembly is not found in the database.
+        If the assembly is not found in the database or the output is not
+        valid.
 
     Examples
     --------
     >>> AssemblyInfo.get_seqinfo("hg38")
     """
-    if assembly in cls._data["assembly"].tolist():
-        group = "assembly"
-    elif assembly in cls._data["assembly_ucsc"].dropna().tolist():
-        group = "assembly_ucsc"
-    elif assembly in cls._data["patch"].dropna().tolist():
-        group = "patch"
-    else:
-        error_msg = (
-            f"{assembly} not in database!\n",
-            "Valid assemblies are:\n\n",
-            f"NCBI:\n{cls._data.assembly.unique().tolist()}\n\n",
-            f"UCSC:\n{cls._data.assembly_ucsc.dropna().unique().tolist()}\n\n",
-            f"Patch:\n{cls._data.patch.dropna().unique().tolist()}",
-        )
-        raise ValueError(error_msg)
+    output = _output(cls, output)
+    storage = cls._storage()
 
-    q1 = f'{group} == "{assembly}"'
-    q2 = 'version == "latest"'
+    with _phase("lookup"):
+        row = storage.lookup(assembly)
 
-    local_db = cls._data.query(q1)
-    if len(local_db) > 1:
-        return (
-            pd.DataFrame.from_records(local_db.query(q2).seqinfo.iloc[0])
-            .convert_dtypes()
-            .set_index("name")
-        )
-    else:
-        return (
-            pd.DataFrame.from_records(local_db.seqinfo.iloc[0])
-            .convert_dtypes()
-            .set_index("name")
-        )
+    if output == "arrow":
+        return storage.arrow_contigs(row)
+
+    return storage.contigs(row).set_index("name")
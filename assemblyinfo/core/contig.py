@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ..dtypes import STRING_DTYPE, compact
+from .chrom import _provider_column, _seqinfo_table
+
+__all__ = ["find_sequence", "find_contigs"]
+
+# seqinfo columns holding contig names, by their code in the contig index
+SEQUENCE_COLUMNS = ["name", "ncbi", "genbank", "refseq"]
+CONTIG_COLUMNS = [*SEQUENCE_COLUMNS, "molecule", "role", "unit", "length"]
+PATCH_COLUMNS = ["assembly", "assembly_ucsc", "patch", "species"]
+
+
+class _ContigIndex(NamedTuple):
+    # distinct contig names, and the bounds of their postings
+    names: pd.Index
+    bounds: np.ndarray
+    # seqinfo table position and name column code of each posting, sorted
+    # by position within each name
+    positions: np.ndarray
+    columns: np.ndarray
+    # seqinfo table positions sorted by contig length, and those lengths
+    by_length: np.ndarray
+    lengths: np.ndarray
+
+
+def _postings(
+    table: pd.DataFrame, first: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the contig names of the seqinfo table from a position on, with
+    their positions and name column codes.
+    """
+    keys, positions, columns = [], [], []
+    for code, column in enumerate(SEQUENCE_COLUMNS):
+        valid = table[column].iloc[first:].notna().to_numpy(bool)
+        keys.append(table[column].iloc[first:].to_numpy(object)[valid])
+        positions.append(np.flatnonzero(valid) + first)
+        columns.append(np.full(valid.sum(), code, dtype=np.int8))
+    return np.concatenate(keys), np.concatenate(positions), np.concatenate(columns)
+
+
+def _lengths(table: pd.DataFrame, first: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the positions of the seqinfo table from a position on with a
+    length, and those lengths, sorted by length.
+    """
+    length = table["length"].iloc[first:]
+    positions = np.flatnonzero(length.notna().to_numpy(bool))
+    lengths = length.to_numpy(np.int64, na_value=0)[positions]
+    order = np.argsort(lengths, kind="stable")
+    return positions[order] + first, lengths[order]
+
+
+def _build_contig_index(cls) -> _ContigIndex:
+    table = _seqinfo_table(cls)
+
+    keys, positions, columns = _postings(table)
+    codes, names = pd.factorize(keys)
+    order = np.lexsort((positions, codes))
+    by_length, lengths = _lengths(table)
+
+    return _ContigIndex(
+        names=pd.Index(names),
+        bounds=np.searchsorted(codes[order], np.arange(len(names) + 1)),
+        positions=positions[order],
+        columns=columns[order],
+        by_length=by_length,
+        lengths=lengths,
+    )
+
+
+def _extend_contig_index(
+    index: _ContigIndex, table: pd.DataFrame, first: int
+) -> _ContigIndex:
+    """
+    Returns the contig index with the seqinfo table positions from ``first``
+    on added. These follow every indexed position, so their postings are
+    inserted after those of the same name, and after the positions of the
+    same length, without sorting the index again.
+    """
+    keys, positions, columns = _postings(table, first)
+    added = pd.Index(pd.unique(keys))
+    names = index.names.append(added[~added.isin(index.names)])
+    codes = names.get_indexer(keys)
+    order = np.lexsort((positions, codes))
+    codes, positions, columns = codes[order], positions[order], columns[order]
+
+    counts = np.diff(index.bounds)
+    ends = np.append(index.bounds, np.full(len(names) - len(index.names), counts.sum()))
+    inserted = ends[codes + 1]
+    counts = np.append(counts, np.zeros(len(names) - len(index.names), np.int64))
+    counts += np.bincount(codes, minlength=len(names))
+
+    by_length, lengths = _lengths(table, first)
+    at = np.searchsorted(index.lengths, lengths, "right")
+    return _ContigIndex(
+        names=names,
+        bounds=np.concatenate([[0], np.cumsum(counts)]),
+        positions=np.insert(index.positions, inserted, positions),
+        columns=np.insert(index.columns, inserted, columns),
+        by_length=np.insert(index.by_length, at, by_length),
+        lengths=np.insert(index.lengths, at, lengths),
+    )
+
+
+def _contig_index(cls) -> _ContigIndex:
+    """
+    Returns the index of every contig of every patch in the database.
+
+    Contig names of all providers are hashed to their postings in the
+    seqinfo table, and the table positions are sorted by contig length, so
+    that name lookups and length ranges do not scan any seqinfo.
+    """
+    return cls._cached("contig_index", lambda: _build_contig_index(cls))
+
+
+def _contig_rows(cls, positions: np.ndarray) -> pd.DataFrame:
+    """Returns the contigs at seqinfo table positions, with their patch."""
+    table = _seqinfo_table(cls)
+    contigs = table[["row", *CONTIG_COLUMNS]].take(positions)
+    patches = cls._data[PATCH_COLUMNS].take(contigs["row"])
+    return compact(
+        pd.concat(
+            [patches.reset_index(drop=True), contigs.reset_index(drop=True)], axis=1
+        ).drop(columns="row")
+    )
+
+
+def find_sequence(
+    cls,
+    sequence: str | Iterable[str],
+    provider: str | None = None,
+) -> pd.DataFrame:
+    """
+    Finds the assemblies and patches containing a sequence.
+
+    Sequences are looked up by any of their names (UCSC, NCBI, GenBank or
+    RefSeq) across every patch in the database, which traces orphan
+    sequence accessions such as 'NC_000001.11' or 'CM000663.2' back to
+    their assemblies.
+
+    Parameters
+    ----------
+    sequence : Union[str, List[str]]
+        The sequence name or accession, or a list of them.
+    provider : Optional[str]
+        The provider of the names ('ucsc', 'ncbi', 'genbank' or 'refseq'),
+        to only match names of that provider (default: any provider).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per matching contig, with the 'sequence' it matched, the
+        'provider' column it matched in, its patch (assembly,
+        assembly_ucsc, patch, species) and its seqinfo columns. The result
+        is empty if the sequence is not found.
+
+    Raises
+    ------
+    ValueError
+        If the provider is not valid.
+
+    Examples
+    --------
+    >>> AssemblyInfo.find_sequence("NC_000001.11")
+    >>> AssemblyInfo.find_sequence(["chr1", "chrX"], provider="ucsc")
+    """
+    queries = [sequence] if isinstance(sequence, str) else list(sequence)
+    column = SEQUENCE_COLUMNS.index(_provider_column(provider)) if provider else None
+
+    index = _contig_index(cls)
+    codes = index.names.get_indexer(queries)
+    found = codes >= 0
+    starts = index.bounds[codes[found]]
+    stops = index.bounds[codes[found] + 1]
+
+    # expand each query to the range of its postings
+    counts = stops - starts
+    offsets = np.cumsum(counts) - counts
+    postings = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+    query = np.repeat(np.flatnonzero(found), counts)
+    if column is not None:
+        keep = index.columns[postings] == column
+    else:
+        # a contig may carry the same name for several providers
+        positions = index.positions[postings]
+        keep = np.ones(len(postings), dtype=bool)
+        keep[1:] = (query[1:] != query[:-1]) | (positions[1:] != positions[:-1])
+    postings, query = postings[keep], query[keep]
+
+    providers = np.asarray(SEQUENCE_COLUMNS, dtype=object)[index.columns[postings]]
+    result = _contig_rows(cls, index.positions[postings])
+    result.insert(0, "sequence", pd.array(np.asarray(queries, dtype=object)[query]))
+    result.insert(1, "provider", pd.array(providers))
+    return result.astype({"sequence": STRING_DTYPE, "provider": STRING_DTYPE})
+
+
+def find_contigs(
+    cls,
+    min_length: int | None = None,
+    max_length: int | None = None,
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Finds the contigs of every patch within a length range.
+
+    Parameters
+    ----------
+    min_length : Optional[int]
+        The minimum contig length, inclusive.
+    max_length : Optional[int]
+        The maximum contig length, inclusive.
+    roles : list[str], optional
+        The roles to filter by (e.g. 'assembled', 'unplaced').
+    units : list[str], optional
+        The units to filter by.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per contig, sorted by length, with its patch (assembly,
+        assembly_ucsc, patch, species) and its seqinfo columns.
+
+    Examples
+    --------
+    >>> AssemblyInfo.find_contigs(1_000_000, 2_000_000, roles=["unplaced"])
+    """
+    index = _contig_index(cls)
+    start = 0 if min_length is None else index.lengths.searchsorted(min_length)
+    stop = (
+        len(index.lengths)
+        if max_length is None
+        else index.lengths.searchsorted(max_length, "right")
+    )
+    positions = index.by_length[start:stop]
+
+    table = _seqinfo_table(cls)
+    if roles:
+        positions = positions[table["role"].take(positions).isin(roles).to_numpy(bool)]
+    if units:
+        positions = positions[table["unit"].take(positions).isin(units).to_numpy(bool)]
+
+    return _contig_rows(cls, positions)
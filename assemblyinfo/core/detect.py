@@ -0,0 +1,508 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import hashlib
+import lzma
+import multiprocessing
+import os
+import re
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import _phase
+from .chrom import _seqinfo_table
+from .contig import SEQUENCE_COLUMNS
+
+__all__ = ["detect_assemblies"]
+
+# header formats by suffix, before any '.gz'
+FORMATS = {
+    ".sam": "sam",
+    ".bam": "bam",
+    ".cram": "cram",
+    ".vcf": "vcf",
+    ".bcf": "bcf",
+    ".fai": "fai",
+    ".dict": "dict",
+}
+# contig names returned by the workers, to find the naming provider
+SAMPLE_NAMES = 64
+
+VCF_CONTIG = re.compile(r"^##contig=<(.*)>\s*$")
+VCF_ID = re.compile(r"(?:^|,)ID=([^,]+)")
+VCF_LENGTH = re.compile(r"(?:^|,)length=(\d+)")
+
+CRAM_METHODS = {
+    0: lambda data: data,
+    1: gzip.decompress,
+    2: bz2.decompress,
+    3: lzma.decompress,
+}
+
+_INDEX = None
+
+
+class _LengthIndex(NamedTuple):
+    # distinct contig lengths, and the bounds of their postings
+    lengths: np.ndarray
+    bounds: np.ndarray
+    # database row of each posting, and whether the contig is a nuclear
+    # assembled chromosome of the row
+    rows: np.ndarray
+    primary: np.ndarray
+    # number of distinct lengths, and of primary ones, of each row
+    sizes: np.ndarray
+    primaries: np.ndarray
+    latest: np.ndarray
+    # rows by the fingerprint of their lengths, of their assembled ones
+    # and of their primary ones
+    fingerprints: dict[bytes, list[int]]
+
+
+def _fingerprint(lengths: np.ndarray) -> bytes:
+    """Hashes a set of contig lengths, the same in every process."""
+    values = np.unique(np.asarray(lengths, dtype=np.int64))
+    return hashlib.blake2b(values.tobytes(), digest_size=16).digest()
+
+
+def _length_pairs(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the distinct (length, row) postings of seqinfo contigs, sorted,
+    primary if any contig of the length is.
+    """
+    assembled = table["role"].eq("assembled").fillna(False)
+    pairs = pd.DataFrame(
+        {
+            "length": table["length"].to_numpy(np.int64, na_value=-1),
+            "row": table["row"].to_numpy(np.int32),
+            "assembled": assembled.to_numpy(bool),
+            "primary": (assembled & table["unit"].ne("non-nuclear")).to_numpy(bool),
+        }
+    )
+    # one posting per distinct length of a row, primary if any contig is
+    pairs = pairs[pairs["length"] >= 0].sort_values(
+        ["length", "row", "primary", "assembled"],
+        ascending=[True, True, False, False],
+    )
+    return pairs.drop_duplicates(["length", "row"])
+
+
+def _add_fingerprints(
+    fingerprints: dict[bytes, list[int]], pairs: pd.DataFrame
+) -> None:
+    """Adds the fingerprints of the rows of length postings, in place."""
+    for row, group in pairs.groupby("row", sort=True):
+        sizes = group["length"]
+        for values in [sizes, sizes[group["assembled"]], sizes[group["primary"]]]:
+            if len(values):
+                fingerprints.setdefault(_fingerprint(values), []).append(int(row))
+
+
+def _build_length_index(cls) -> _LengthIndex:
+    pairs = _length_pairs(_seqinfo_table(cls))
+    lengths, starts = np.unique(pairs["length"].to_numpy(), return_index=True)
+    rows = pairs["row"].to_numpy()
+    is_primary = pairs["primary"].to_numpy()
+    n_rows = len(cls._data)
+
+    fingerprints = {}
+    _add_fingerprints(fingerprints, pairs)
+
+    return _LengthIndex(
+        lengths=lengths,
+        bounds=np.append(starts, len(pairs)),
+        rows=rows,
+        primary=is_primary,
+        sizes=np.bincount(rows, minlength=n_rows),
+        primaries=np.bincount(rows[is_primary], minlength=n_rows),
+        latest=cls._data["version"].eq("latest").fillna(False).to_numpy(bool),
+        fingerprints=fingerprints,
+    )
+
+
+def _extend_length_index(
+    index: _LengthIndex, table: pd.DataFrame, first: int, data: pd.DataFrame
+) -> _LengthIndex:
+    """
+    Returns the length index with the contigs of the seqinfo table from
+    ``first`` on added. Their rows follow every indexed row, so their
+    postings are inserted after those of the same length, without sorting
+    the index again.
+    """
+    pairs = _length_pairs(table.iloc[first:])
+    lengths = pairs["length"].to_numpy()
+    rows = pairs["row"].to_numpy()
+    is_primary = pairs["primary"].to_numpy()
+    n_rows = len(data)
+
+    at = index.bounds[np.searchsorted(index.lengths, lengths, "right")]
+    posting_lengths = np.repeat(index.lengths, np.diff(index.bounds))
+    posting_lengths = np.insert(posting_lengths, at, lengths)
+    starts = np.flatnonzero(np.diff(posting_lengths, prepend=-1))
+
+    fingerprints = {k: list(v) for k, v in index.fingerprints.items()}
+    _add_fingerprints(fingerprints, pairs)
+
+    n_indexed = len(index.sizes)
+    return _LengthIndex(
+        lengths=posting_lengths[starts],
+        bounds=np.append(starts, len(posting_lengths)),
+        rows=np.insert(index.rows, at, rows),
+        primary=np.insert(index.primary, at, is_primary),
+        sizes=np.append(index.sizes, np.bincount(rows, minlength=n_rows)[n_indexed:]),
+        primaries=np.append(
+            index.primaries,
+            np.bincount(rows[is_primary], minlength=n_rows)[n_indexed:],
+        ),
+        latest=data["version"].eq("latest").fillna(False).to_numpy(bool),
+        fingerprints=fingerprints,
+    )
+
+
+def _length_index(cls) -> _LengthIndex:
+    """Returns the contig lengths of every patch, indexed for matching."""
+    return cls._cached("length_index", lambda: _build_length_index(cls))
+
+
+def _match(index: _LengthIndex, lengths: np.ndarray) -> tuple[int, float, int]:
+    """
+    Returns the row best matching a set of contig lengths, its confidence
+    and the number of rows matching as well.
+
+    The confidence is the fraction of the lengths found in the patch,
+    times the fraction of the patch's nuclear chromosomes that are found.
+    Rows with the same confidence are ranked by the Jaccard index of the
+    lengths, so that the patch with the fewest contigs absent from the set
+    wins, then latest patches first.
+    """
+    lengths = np.unique(np.asarray(lengths, dtype=np.int64))
+    if not len(lengths):
+        return -1, 0.0, 0
+
+    # a set equal to all, the assembled or the primary lengths of patches
+    exact = index.fingerprints.get(_fingerprint(lengths))
+    if exact is not None:
+        row = min(exact, key=lambda r: (index.sizes[r], not index.latest[r], r))
+        return row, 1.0, len(exact)
+
+    positions = np.searchsorted(index.lengths, lengths)
+    found = positions < len(index.lengths)
+    found[found] = index.lengths[positions[found]] == lengths[found]
+    positions = positions[found]
+    starts = index.bounds[positions]
+    counts = index.bounds[positions + 1] - starts
+    postings = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(
+        counts.sum()
+    )
+
+    n_rows = len(index.sizes)
+    rows = index.rows[postings]
+    matched = np.bincount(rows, minlength=n_rows)
+    primary = np.bincount(rows[index.primary[postings]], minlength=n_rows)
+
+    confidence = matched / len(lengths) * primary / np.maximum(index.primaries, 1)
+    jaccard = matched / (len(lengths) + index.sizes - matched)
+    order = np.lexsort((-np.arange(n_rows), index.latest, jaccard, confidence))
+    row = order[-1]
+    if confidence[row] <= 0:
+        return -1, 0.0, 0
+    return int(row), float(confidence[row]), int((confidence == confidence[row]).sum())
+
+
+def _format(path: Path) -> str | None:
+    suffixes = path.suffixes
+    if suffixes[-1:] == [".gz"] and len(suffixes) > 1:
+        return FORMATS.get(suffixes[-2])
+    return FORMATS.get(path.suffix)
+
+
+def _sam_contigs(lines: Iterable[str]) -> list[tuple[str, int]]:
+    """Reads the @SQ lines of a SAM header or sequence dictionary."""
+    contigs = []
+    for line in lines:
+        if not line.startswith("@"):
+            break
+        if line.startswith("@SQ\t"):
+            fields = dict(f.split(":", 1) for f in line.rstrip().split("\t")[1:])
+            contigs.append((fields["SN"], int(fields["LN"])))
+    return contigs
+
+
+def _vcf_contigs(lines: Iterable[str]) -> list[tuple[str, int]]:
+    """Reads the ##contig lines of a VCF header."""
+    contigs = []
+    for line in lines:
+        if not line.startswith("##"):
+            break
+        match = VCF_CONTIG.match(line)
+        if match:
+            name, length = VCF_ID.search(match[1]), VCF_LENGTH.search(match[1])
+            if name and length:
+                contigs.append((name[1], int(length[1])))
+    return contigs
+
+
+def _read(f: BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) < size:
+        raise ValueError("ERROR: truncated header!")
+    return data
+
+
+def _int32(f: BinaryIO) -> int:
+    return struct.unpack("<i", _read(f, 4))[0]
+
+
+def _itf8(f: BinaryIO) -> int:
+    """Reads a CRAM ITF8 integer."""
+    first = _read(f, 1)[0]
+    if first >= 0xF0:
+        rest = _read(f, 4)
+        return (
+            (first & 0x0F) << 28
+            | rest[0] << 20
+            | rest[1] << 12
+            | rest[2] << 4
+            | (rest[3] & 0x0F)
+        )
+    # the number of leading set bits is the number of bytes that follow
+    size = next(n for n in range(4) if not first & (0x80 >> n))
+    value = first & (0x7F >> size)
+    for byte in _read(f, size):
+        value = value << 8 | byte
+    return value
+
+
+def _ltf8(f: BinaryIO) -> int:
+    """Reads a CRAM LTF8 integer."""
+    first = _read(f, 1)[0]
+    size = next((n for n in range(8) if not first & (0x80 >> n)), 8)
+    value = first & (0xFF >> (size + 1))
+    for byte in _read(f, size):
+        value = value << 8 | byte
+    return value
+
+
+def _bam_contigs(path: Path) -> list[tuple[str, int]]:
+    """Reads the reference sequences of a BAM header."""
+    with gzip.open(path, "rb") as f:
+        if _read(f, 4) != b"BAM\1":
+            raise ValueError(f"ERROR: {path} is not a BAM file!")
+        _read(f, _int32(f))
+        contigs = []
+        for _ in range(_int32(f)):
+            name = _read(f, _int32(f)).rstrip(b"\0").decode()
+            contigs.append((name, _int32(f)))
+    return contigs
+
+
+def _bcf_contigs(path: Path) -> list[tuple[str, int]]:
+    """Reads the ##contig lines of a BCF header."""
+    with gzip.open(path, "rb") as f:
+        if _read(f, 3) != b"BCF":
+            raise ValueError(f"ERROR: {path} is not a BCF file!")
+        _read(f, 2)
+        text = _read(f, struct.unpack("<I", _read(f, 4))[0])
+    return _vcf_contigs(text.rstrip(b"\0").decode().splitlines())
+
+
+def _cram_contigs(path: Path) -> list[tuple[str, int]]:
+    """Reads the @SQ lines of the SAM header of a CRAM file."""
+    with open(path, "rb") as f:
+        if _read(f, 4) != b"CRAM":
+            raise ValueError(f"ERROR: {path} is not a CRAM file!")
+        major = _read(f, 2)[0]
+        _read(f, 20)
+
+        # the header container, whose first block holds the SAM header
+        _int32(f)
+        for _ in range(4):
+            _itf8(f)
+        _ltf8(f)
+        _ltf8(f)
+        _itf8(f)
+        for _ in range(_itf8(f)):
+            _itf8(f)
+        if major >= 3:
+            _read(f, 4)
+
+        method = _read(f, 1)[0]
+        _read(f, 1)
+        _itf8(f)
+        size = _itf8(f)
+        _itf8(f)
+        if method not in CRAM_METHODS:
+            raise ValueError(f"ERROR: {path} has an unsupported header codec!")
+        data = CRAM_METHODS[method](_read(f, size))
+
+    (length,) = struct.unpack("<i", data[:4])
+    return _sam_contigs(data[4 : 4 + length].decode().splitlines())
+
+
+def _read_contigs(path: Path, fmt: str) -> list[tuple[str, int]]:
+    """Reads the contig names and lengths of a header, and nothing else."""
+    if fmt == "bam":
+        return _bam_contigs(path)
+    elif fmt == "bcf":
+        return _bcf_contigs(path)
+    elif fmt == "cram":
+        return _cram_contigs(path)
+
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt") as f:
+        if fmt in ["sam", "dict"]:
+            return _sam_contigs(f)
+        elif fmt == "vcf":
+            return _vcf_contigs(f)
+        return [(name, int(length)) for name, length, *_ in map(str.split, f)]
+
+
+def _detect_file(index: _LengthIndex, path: Path) -> dict:
+    result = {"path": str(path), "format": _format(path), "n_contigs": 0}
+    try:
+        if result["format"] is None:
+            raise ValueError(f"ERROR: {path} is not a supported file!")
+        contigs = _read_contigs(path, result["format"])
+        lengths = np.array([length for _, length in contigs], dtype=np.int64)
+        row, confidence, candidates = _match(index, lengths)
+    except (OSError, ValueError, KeyError, EOFError, zlib.error, lzma.LZMAError) as e:
+        return dict(
+            result, row=-1, confidence=0.0, candidates=0, names=[], error=str(e)
+        )
+
+    return dict(
+        result,
+        n_contigs=len(contigs),
+        row=row,
+        confidence=confidence,
+        candidates=candidates,
+        names=[name for name, _ in contigs[:SAMPLE_NAMES]],
+        error=None,
+    )
+
+
+def _init_worker(index: _LengthIndex) -> None:
+    global _INDEX
+    _INDEX = index
+
+
+def _detect_in_worker(path: Path) -> dict:
+    return _detect_file(_INDEX, path)
+
+
+def _provider(cls, row: int, names: list[str], providers: dict) -> str | None:
+    """Returns the provider whose names most of the sampled names are."""
+    if row not in providers:
+        seqinfo = _seqinfo_table(cls)
+        offsets = np.searchsorted(seqinfo["row"].to_numpy(), [row, row + 1])
+        contigs = seqinfo.iloc[offsets[0] : offsets[1]]
+        providers[row] = {c: set(contigs[c].dropna()) for c in SEQUENCE_COLUMNS}
+
+    counts = {
+        c: sum(n in values for n in names) for c, values in providers[row].items()
+    }
+    best = max(SEQUENCE_COLUMNS, key=lambda c: counts[c])
+    return ("ucsc" if best == "name" else best) if counts[best] else None
+
+
+def _input_files(paths: str | Path | Iterable[str | Path]) -> list[Path]:
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if _format(p) is not None))
+        else:
+            files.append(path)
+    return files
+
+
+def detect_assemblies(
+    cls,
+    paths: str | Path | Iterable[str | Path],
+    processes: int | None = None,
+) -> pd.DataFrame:
+    """
+    Identifies the reference assembly of alignment and variant files.
+
+    Only the header of each file is read: the @SQ lines of SAM, BAM, CRAM
+    and sequence dictionary ('.dict') files, the ##contig lines of VCF and
+    BCF files, or the names and lengths of FASTA indexes ('.fai'). The set
+    of contig lengths is matched against fingerprints of every patch in the
+    database, first exactly and then by an inverted index of contig
+    lengths, in a pool of worker processes.
+
+    The confidence of a match is the fraction of the file's contig lengths
+    found in the patch, times the fraction of the patch's nuclear
+    chromosomes found in the file, so that it is 1 when the file holds the
+    chromosomes of the patch and no foreign contig. Among patches with the
+    same confidence, the one with the fewest contigs absent from the file
+    is reported, and their number is given as 'candidates'.
+
+    Parameters
+    ----------
+    paths : Union[str, Path, Iterable[Union[str, Path]]]
+        The files, or directories whose supported files are all read. VCF,
+        SAM, '.fai' and '.dict' files may be gzipped.
+    processes : Optional[int]
+        The number of worker processes (default: the number of CPUs, at
+        most one per file). Files are read in this process with 1.
+        Workers are spawned, so scripts must guard their entry point with
+        ``if __name__ == "__main__":``.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per file, with its 'path', 'format' and number of contigs
+        ('n_contigs'), the best 'assembly' and 'patch', the 'provider' of
+        its contig names, the 'confidence' of the match, the number of
+        patches matching as well ('candidates'), and the 'error' if the
+        header could not be read.
+
+    Examples
+    --------
+    >>> AssemblyInfo.detect_assemblies("alignments/", processes=16)
+    >>> AssemblyInfo.detect_assemblies(["sample.cram", "calls.vcf.gz"])
+    """
+    files = _input_files(paths)
+
+    with _phase("lookup"):
+        index = _length_index(cls)
+
+    with _phase("build"):
+        processes = min(processes or os.cpu_count() or 1, len(files))
+        if processes <= 1:
+            results = [_detect_file(index, path) for path in files]
+        else:
+            with ProcessPoolExecutor(
+                processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(index,),
+            ) as pool:
+                chunksize = max(1, len(files) // (processes * 16))
+                results = list(pool.map(_detect_in_worker, files, chunksize=chunksize))
+
+        data, providers = cls._data, {}
+        for result in results:
+            row = result.pop("row")
+            names = result.pop("names")
+            matched = row >= 0
+            result["assembly"] = data["assembly"].iat[row] if matched else None
+            result["patch"] = data["patch"].iat[row] if matched else None
+            result["provider"] = (
+                _provider(cls, row, names, providers) if matched else None
+            )
+
+    columns = ["path", "format", "n_contigs", "assembly", "patch", "provider"]
+    return pd.DataFrame(
+        results, columns=[*columns, "confidence", "candidates", "error"]
+    )
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from ..dtypes import STRING_DTYPE
+from .chrom import _lookup_row, _provider_column, _seqinfo_table
+from .info import get_version
+
+__all__ = ["diff_patches", "diff_all_patches"]
+
+DIFF_STATUSES = ["added", "removed", "changed"]
+
+
+def _patch_version(assembly: str, patch: str) -> tuple[int, ...]:
+    """Returns a sortable version for a patch relative to its assembly."""
+    suffix = patch[len(assembly) :] if patch.startswith(assembly) else patch
+    return get_version(suffix)
+
+
+def _diff_rows(
+    cls,
+    pairs: pd.DataFrame,
+    key: str,
+    compare: list[str],
+) -> pd.DataFrame:
+    """
+    Compares the seqinfo of pairs of database rows in a single merge.
+
+    ``pairs`` must hold a ``pair`` id and the ``row_a``/``row_b`` database
+    rows to compare. Contigs are matched on the ``key`` column and reported
+    as changed when any of the ``compare`` columns differ.
+    """
+    fields = list(dict.fromkeys(["role", "unit", "length", *compare]))
+    table = (
+        _seqinfo_table(cls)[["row", key, *fields]]
+        .dropna(subset=[key])
+        .drop_duplicates(subset=["row", key])
+    )
+
+    left = pairs[["pair", "row_a"]].merge(table, left_on="row_a", right_on="row")
+    right = pairs[["pair", "row_b"]].merge(table, left_on="row_b", right_on="row")
+    merged = left.drop(columns=["row_a", "row"]).merge(
+        right.drop(columns=["row_b", "row"]),
+        on=["pair", key],
+        how="outer",
+        suffixes=("_a", "_b"),
+        indicator=True,
+    )
+
+    changed = pd.Series(False, index=merged.index)
+    for field in compare:
+        a, b = merged[f"{field}_a"], merged[f"{field}_b"]
+        same = (a == b).fillna(False).astype(bool) | (a.isna() & b.isna())
+        changed |= ~same
+
+    merged["status"] = pd.NA
+    merged.loc[merged["_merge"] == "right_only", "status"] = "added"
+    merged.loc[merged["_merge"] == "left_only", "status"] = "removed"
+    merged.loc[(merged["_merge"] == "both") & changed, "status"] = "changed"
+
+    columns = ["pair", key, "status"]
+    columns += [f"{field}_{side}" for field in fields for side in "ab"]
+    return (
+        merged.dropna(subset=["status"])[columns]
+        .astype({"status": STRING_DTYPE})
+        .sort_values(["pair", "status", key])
+        .reset_index(drop=True)
+    )
+
+
+def diff_patches(
+    cls,
+    patch_a: str,
+    patch_b: str,
+    provider: str | None = None,
+    compare: list[str] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Compares the seqinfo of two patches or assemblies.
+
+    Parameters
+    ----------
+    patch_a : str
+        The reference patch or assembly name.
+    patch_b : str
+        The patch or assembly name to compare against ``patch_a``.
+    provider : Optional[str]
+        The naming used to match contigs ('ucsc', 'genbank', 'refseq', 'ncbi').
+    compare : Optional[List[str]]
+        The seqinfo columns that flag a contig as changed (default: length).
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        The 'added', 'removed' and 'changed' contigs, with the values of
+        each compared column in ``patch_a`` (``_a``) and ``patch_b`` (``_b``).
+
+    Raises
+    ------
+    ValueError
+        If a patch is not found in the database or the provider is not valid.
+
+    Examples
+    --------
+    >>> AssemblyInfo.diff_patches("GRCh38.p13", "GRCh38.p14")
+    >>> AssemblyInfo.diff_patches("hg19", "hg38", provider="ucsc")
+    """
+    key = _provider_column(provider)
+    compare = compare or ["length"]
+
+    pairs = pd.DataFrame(
+        {
+            "pair": [0],
+            "row_a": [_lookup_row(cls, patch_a)],
+            "row_b": [_lookup_row(cls, patch_b)],
+        }
+    )
+    diff = _diff_rows(cls, pairs, key, compare).drop(columns="pair")
+
+    return {
+        status: diff[diff["status"] == status]
+        .drop(columns="status")
+        .reset_index(drop=True)
+        for status in DIFF_STATUSES
+    }
+
+
+def diff_all_patches(
+    cls,
+    provider: str | None = None,
+    compare: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Compares every pair of consecutive patches in the database.
+
+    Patches are ordered within each assembly by their patch version and all
+    pairs are diffed in a single pass.
+
+    Parameters
+    ----------
+    provider : Optional[str]
+        The naming used to match contigs ('ucsc', 'genbank', 'refseq', 'ncbi').
+    compare : Optional[List[str]]
+        The seqinfo columns that flag a contig as changed (default: length).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per added, removed or changed contig, labelled with the
+        assembly and the two patches it was found between.
+
+    Examples
+    --------
+    >>> AssemblyInfo.diff_all_patches()
+    """
+    key = _provider_column(provider)
+    compare = compare or ["length"]
+
+    patches = (
+        cls._data[["assembly", "patch"]]
+        .drop_duplicates(subset="patch")
+        .rename_axis("row")
+        .reset_index()
+    )
+    patches["order"] = [
+        _patch_version(a, p) for a, p in zip(patches["assembly"], patches["patch"])
+    ]
+    patches = patches.sort_values(["assembly", "order"], kind="stable")
+
+    following = patches.groupby("assembly").shift(-1)
+    pairs = pd.DataFrame(
+        {
+            "assembly": patches["assembly"],
+            "patch_a": patches["patch"],
+            "patch_b": following["patch"],
+            "row_a": patches["row"],
+            "row_b": following["row"],
+        }
+    ).dropna(subset=["row_b"])
+    pairs = pairs.astype({"row_b": int}).reset_index(drop=True)
+    pairs["pair"] = pairs.index
+
+    diff = _diff_rows(cls, pairs, key, compare)
+    return (
+        pairs[["pair", "assembly", "patch_a", "patch_b"]]
+        .merge(diff, on="pair")
+        .drop(columns="pair")
+    )
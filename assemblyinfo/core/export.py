@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from ..instrumentation import _phase
+from .chrom import _provider_column, _seqinfo_table
+
+__all__ = ["export_references"]
+
+# file suffix of each reference format
+FORMATS = {
+    "chrom.sizes": ".chrom.sizes",
+    "fai": ".fa.fai",
+    "dict": ".dict",
+    "bed": ".bed",
+}
+# the layout of the FASTA files described by the .fai skeletons
+FASTA_LINE_BASES = 60
+# the hashes of the written files, to skip those whose source is unchanged
+MANIFEST = ".assemblyinfo-export.json"
+# bump to rewrite every file when the output of a format changes
+EXPORT_VERSION = 1
+
+_WRITE_OPTIONS = pacsv.WriteOptions(
+    include_header=False, delimiter="\t", quoting_style="none"
+)
+
+
+def _fai_columns(names: pa.Array, lengths: np.ndarray) -> dict:
+    """
+    Returns the .fai columns of a FASTA file with fixed-width lines, whose
+    headers are the bare contig names.
+    """
+    headers = pc.binary_length(names).to_numpy().astype(np.int64) + 2
+    sizes = lengths + -(-lengths // FASTA_LINE_BASES)
+    offsets = np.cumsum(headers + sizes) - sizes
+    return {
+        "name": names,
+        "length": lengths,
+        "offset": offsets,
+        "linebases": np.full(len(names), FASTA_LINE_BASES),
+        "linewidth": np.full(len(names), FASTA_LINE_BASES + 1),
+    }
+
+
+def _dict_columns(names: pa.Array, lengths: np.ndarray, patch: str) -> dict:
+    return {
+        "tag": pa.array(["@SQ"] * len(names)),
+        "name": pc.binary_join_element_wise("SN:", names, ""),
+        "length": pc.binary_join_element_wise(
+            "LN:", pc.cast(pa.array(lengths), pa.string()), ""
+        ),
+        "assembly": pa.array([f"AS:{patch}"] * len(names)),
+    }
+
+
+def _write_reference(
+    fmt: str, output: str, names: list[str], lengths: np.ndarray, patch: str
+) -> None:
+    """Writes a reference file atomically, in a single buffered stream."""
+    names = pa.array(names, type=pa.string())
+    header = b""
+    if fmt == "fai":
+        columns = _fai_columns(names, lengths)
+    elif fmt == "dict":
+        header = b"@HD\tVN:1.6\tSO:unsorted\n"
+        columns = _dict_columns(names, lengths, patch)
+    elif fmt == "bed":
+        columns = {
+            "name": names,
+            "start": np.zeros(len(names), dtype=np.int64),
+            "end": lengths,
+        }
+    else:
+        columns = {"name": names, "length": lengths}
+
+    output = Path(output)
+    partial = output.with_name(f".{output.name}.{os.getpid()}")
+    try:
+        with pa.output_stream(partial, buffer_size=1 << 20) as sink:
+            sink.write(header)
+            pacsv.write_csv(pa.table(columns), sink, _WRITE_OPTIONS)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, output)
+
+
+def _digest(fmt: str, patch: str, names: list[str], lengths: np.ndarray) -> str:
+    """Returns the content hash of the source of a reference file."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{EXPORT_VERSION}\0{fmt}\0{patch}\0".encode())
+    digest.update("\0".join(names).encode())
+    digest.update(lengths.astype("<i8").tobytes())
+    return digest.hexdigest()
+
+
+def _read_manifest(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    partial = path.with_name(f"{path.name}.{os.getpid()}")
+    partial.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(partial, path)
+
+
+def _sources(
+    cls,
+    assemblies: list[str],
+    rows: list[int],
+    filters: dict[str, list[str] | None],
+    columns: dict[str, str],
+) -> Iterator[tuple[str, str, str, str, list[str], np.ndarray]]:
+    """
+    Yields the contig names and lengths of every assembly, filter and
+    provider, sliced from the seqinfo table.
+
+    The slices are found by binary search on the ``row`` column, which
+    relies on the seqinfo table storing patches in database order: it is
+    built so, and registration only appends rows after the existing ones.
+    """
+    table = _seqinfo_table(cls)
+    starts = table["row"].to_numpy().searchsorted(np.array(rows), "left")
+    ends = table["row"].to_numpy().searchsorted(np.array(rows), "right")
+
+    for assembly, row, start, end in zip(assemblies, rows, starts, ends):
+        patch = cls._data["patch"].iat[row]
+        seqinfo = table.iloc[start:end]
+        for label, roles in filters.items():
+            selected = seqinfo[seqinfo["role"].isin(roles)] if roles else seqinfo
+            for provider, column in columns.items():
+                named = selected[selected[column].notna()]
+                lengths = named["length"].to_numpy(np.int64, na_value=0)
+                yield assembly, patch, label, provider, named[column].tolist(), lengths
+
+
+def export_references(
+    cls,
+    assemblies: list[str],
+    output_dir: str | Path,
+    providers: list[str] | None = None,
+    filters: dict[str, list[str] | None] | None = None,
+    formats: list[str] | None = None,
+    processes: int | None = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    Writes reference files for assemblies, providers and role filters.
+
+    Every combination of assembly, provider, role filter and format is
+    written to '<assembly>.<provider>.<filter><suffix>' in the output
+    directory: UCSC chrom.sizes ('.chrom.sizes'), .fai skeletons of FASTA
+    files with 60 bases per line ('.fa.fai'), sequence dictionaries in the
+    SAM format used by GATK ('.dict'), and BED genome files ('.bed').
+    Contigs are read from the loaded seqinfo table, and files are written
+    by a pool of processes. The content hash of the source of each file is
+    kept in a manifest in the output directory, and files whose source has
+    not changed since they were written are skipped.
+
+    Parameters
+    ----------
+    assemblies : List[str]
+        The assemblies, patches or accessions, resolved case-insensitively
+        (see ``resolve``), as named in the output files.
+    output_dir : Union[str, Path]
+        The directory the files are written to.
+    providers : Optional[List[str]]
+        The providers of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: ['ucsc']). Contigs without a name are left out.
+    filters : Optional[Dict[str, Optional[List[str]]]]
+        The roles of the contigs of each file, by name used in the output
+        files, None keeping every contig (default: {'all': None}).
+    formats : Optional[List[str]]
+        The formats to write ('chrom.sizes', 'fai', 'dict', 'bed', default:
+        all of them).
+    processes : Optional[int]
+        The number of worker processes (default: the number of CPUs, at
+        most one per file). Files are written in this process with 1.
+        Workers are spawned, so scripts must guard their entry point with
+        ``if __name__ == "__main__":``.
+    force : bool
+        Whether to write files whose source has not changed (default:
+        False).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per file, with its 'assembly', 'patch', 'provider',
+        'filter', 'format', 'output' path, number of 'contigs', and whether
+        it was 'written' or skipped.
+
+    Raises
+    ------
+    ValueError
+        If an assembly is not found in the database, or a provider or
+        format is not valid.
+
+    Examples
+    --------
+    >>> AssemblyInfo.export_references(
+    ...     ["hg38", "mm39"], "references/",
+    ...     providers=["ucsc", "refseq"],
+    ...     filters={"all": None, "primary": ["assembled"]},
+    ... )
+    """
+    providers = providers or ["ucsc"]
+    filters = filters or {"all": None}
+    formats = formats or list(FORMATS)
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        raise ValueError(
+            f"ERROR: {', '.join(unknown)} not a valid format, expected one of: "
+            f"{', '.join(FORMATS)}."
+        )
+    columns = {provider: _provider_column(provider) for provider in providers}
+
+    with _phase("lookup"):
+        storage = cls._storage()
+        rows = [storage.lookup(assembly) for assembly in assemblies]
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST
+    manifest = _read_manifest(manifest_path)
+
+    with _phase("build"):
+        records, tasks = [], []
+        sources = _sources(cls, assemblies, rows, filters, columns)
+        for assembly, patch, label, provider, names, lengths in sources:
+            for fmt in formats:
+                output = output_dir / f"{assembly}.{provider}.{label}{FORMATS[fmt]}"
+                digest = _digest(fmt, patch, names, lengths)
+                written = (
+                    force or not output.is_file() or manifest.get(output.name) != digest
+                )
+                if written:
+                    tasks.append((fmt, str(output), names, lengths, patch))
+                    manifest[output.name] = digest
+                source = (assembly, patch, provider, label, fmt, str(output))
+                records.append((*source, len(names), written))
+
+        processes = min(processes or os.cpu_count() or 1, len(tasks))
+        if processes <= 1:
+            for task in tasks:
+                _write_reference(*task)
+        elif tasks:
+            with ProcessPoolExecutor(
+                processes, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                list(pool.map(_write_reference, *zip(*tasks)))
+
+    if tasks:
+        _write_manifest(manifest_path, manifest)
+
+    return pd.DataFrame(
+        records,
+        columns=[
+            "assembly",
+            "patch",
+            "provider",
+            "filter",
+            "format",
+            "output",
+            "contigs",
+            "written",
+        ],
+    )
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import functools
+import gzip
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from ..instrumentation import _phase
+from .chrom import _provider_column
+from .contig import SEQUENCE_COLUMNS
+
+__all__ = ["harmonize_dataset"]
+
+# file formats by suffix, before any '.gz'
+FORMATS = {".parquet": "parquet", ".pq": "parquet", ".bed": "bed"}
+BED_HEADERS = ("#", "track", "browser")
+OUT_OF_BOUNDS = ["drop", "clip", "error"]
+
+
+class _Mapping(NamedTuple):
+    # contig names of every provider, and the code of their target name
+    names: pa.Array
+    codes: pa.Array
+    # target names and the contig lengths, by code
+    targets: pa.Array
+    lengths: pa.Array
+
+
+def _format(path: Path) -> str:
+    suffixes = path.suffixes
+    suffix = (
+        suffixes[-2] if suffixes[-1:] == [".gz"] and len(suffixes) > 1 else path.suffix
+    )
+    if suffix not in FORMATS:
+        raise ValueError(
+            f"ERROR: {path} is not a {', '.join(FORMATS)} file, optionally gzipped!"
+        )
+    return FORMATS[suffix]
+
+
+def _input_files(input_paths: str | Path | Iterable[str | Path]) -> list[Path]:
+    """Returns the input files, with directories expanded to their files."""
+    if isinstance(input_paths, (str, Path)):
+        input_paths = [input_paths]
+
+    paths = []
+    for path in map(Path, input_paths):
+        if path.is_dir():
+            paths.extend(
+                sorted(p for p in path.iterdir() if p.is_file() and _is_supported(p))
+            )
+        elif path.is_file():
+            _format(path)
+            paths.append(path)
+        else:
+            raise ValueError(f"ERROR: {path} does not exist!")
+    return paths
+
+
+def _is_supported(path: Path) -> bool:
+    try:
+        _format(path)
+    except ValueError:
+        return False
+    return True
+
+
+def _build_mapping(
+    cls,
+    assembly: str,
+    to_provider: str | None,
+    roles: list[str] | None,
+    units: list[str] | None,
+) -> _Mapping:
+    target = _provider_column(to_provider)
+    seqinfo = cls.filter_chromosome_data(assembly, roles, units, output="pandas")
+    seqinfo = seqinfo[seqinfo[target].notna()].reset_index(drop=True)
+
+    # the first provider in ``SEQUENCE_COLUMNS`` wins on shared names
+    names = pd.concat([seqinfo[c] for c in SEQUENCE_COLUMNS], ignore_index=True)
+    codes = np.tile(np.arange(len(seqinfo), dtype=np.int32), len(SEQUENCE_COLUMNS))
+    keep = (names.notna() & ~names.duplicated()).to_numpy(bool)
+    return _Mapping(
+        names=pa.array(names[keep].to_numpy(object), pa.string()),
+        codes=pa.array(codes[keep]),
+        targets=pa.array(seqinfo[target].to_numpy(object), pa.string()),
+        lengths=pa.array(seqinfo["length"].to_numpy(np.int64)),
+    )
+
+
+def _count(mask: pa.Array) -> int:
+    return pc.sum(mask).as_py() or 0
+
+
+def _harmonize_batch(
+    batch: pa.RecordBatch,
+    mapping: _Mapping,
+    chrom: str,
+    start: str,
+    end: str,
+    out_of_bounds: str,
+) -> tuple[pa.Table, int, int]:
+    """Renames, filters and bounds-checks a batch of intervals."""
+    table = pa.Table.from_batches([batch])
+    names = table[chrom].cast(pa.string())
+    codes = pc.take(mapping.codes, pc.index_in(names, value_set=mapping.names))
+    keep = pc.is_valid(codes)
+    unknown = len(table) - _count(keep)
+    table = table.set_column(
+        table.schema.get_field_index(chrom), chrom, pc.take(mapping.targets, codes)
+    )
+
+    outside = 0
+    if start in table.column_names and end in table.column_names:
+        lengths = pc.take(mapping.lengths, codes)
+        starts, ends = table[start], table[end]
+        inside = pc.and_(
+            pc.and_(pc.greater_equal(starts, 0), pc.less_equal(ends, lengths)),
+            pc.less_equal(starts, ends),
+        )
+        # intervals without positions are left as they are
+        outside_mask = pc.and_(keep, pc.invert(pc.fill_null(inside, True)))
+        outside = _count(outside_mask)
+        if outside and out_of_bounds == "clip":
+            ends = pc.min_element_wise(ends, lengths.cast(ends.type))
+            starts = pc.min_element_wise(pc.max_element_wise(starts, 0), ends)
+            table = table.set_column(
+                table.schema.get_field_index(start), start, starts
+            ).set_column(table.schema.get_field_index(end), end, ends)
+        elif outside:
+            keep = pc.and_(keep, pc.invert(outside_mask))
+
+    return table.filter(keep), unknown, outside
+
+
+def _bed_layout(path: Path) -> tuple[list[str], int | None]:
+    """Returns the header lines of a BED file and its number of columns."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    headers = []
+    with opener(path, "rt") as f:
+        for line in f:
+            if not line.startswith(BED_HEADERS):
+                return headers, len(line.rstrip("\r\n").split("\t"))
+            headers.append(line)
+    return headers, None
+
+
+def _read_bed(
+    path: Path, columns: list[str], n_headers: int, batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    # BED columns are read as strings, so that they round-trip unchanged
+    types = {column: pa.string() for column in columns}
+    types.update({columns[1]: pa.int64(), columns[2]: pa.int64()})
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(
+            column_names=columns,
+            skip_rows=n_headers,
+            # blocks are sized in bytes, for lines of about 64 characters
+            block_size=batch_size * 64,
+        ),
+        parse_options=pacsv.ParseOptions(delimiter="\t", quote_char=False),
+        convert_options=pacsv.ConvertOptions(
+            column_types=types, strings_can_be_null=False
+        ),
+    )
+    yield from reader
+
+
+def _harmonize_file(
+    mapping: _Mapping,
+    path: Path,
+    output: Path,
+    chrom: str,
+    start: str,
+    end: str,
+    out_of_bounds: str,
+    batch_size: int,
+) -> dict:
+    """Harmonizes one file batch by batch, writing it atomically."""
+    stats = {
+        "input": str(path),
+        "output": str(output),
+        "rows": 0,
+        "kept": 0,
+        "unknown_contig": 0,
+        "out_of_bounds": 0,
+    }
+    partial = output.with_name(f".{output.name}.{os.getpid()}")
+
+    if _format(path) == "parquet":
+        file = pq.ParquetFile(path)
+        schema = file.schema_arrow
+        batches = file.iter_batches(batch_size=batch_size)
+        headers = []
+    else:
+        headers, n_columns = _bed_layout(path)
+        columns = [chrom, start, end] + [
+            f"column_{i}" for i in range(3, n_columns or 3)
+        ]
+        schema = pa.schema(
+            [(c, pa.int64() if c in (start, end) else pa.string()) for c in columns]
+        )
+        batches = (
+            _read_bed(path, columns, len(headers), batch_size) if n_columns else []
+        )
+
+    if chrom not in schema.names:
+        raise ValueError(f"ERROR: {path} has no '{chrom}' column!")
+    schema = schema.set(schema.get_field_index(chrom), pa.field(chrom, pa.string()))
+
+    if _format(path) == "parquet":
+        sink, writer = None, pq.ParquetWriter(partial, schema)
+    else:
+        sink = pa.output_stream(partial, compression=_compression(output))
+        sink.write("".join(headers).encode())
+        writer = pacsv.CSVWriter(
+            sink,
+            schema,
+            write_options=pacsv.WriteOptions(
+                include_header=False, delimiter="\t", quoting_style="none"
+            ),
+        )
+
+    done = False
+    try:
+        for batch in batches:
+            table, unknown, outside = _harmonize_batch(
+                batch, mapping, chrom, start, end, out_of_bounds
+            )
+            if outside and out_of_bounds == "error":
+                raise ValueError(
+                    f"ERROR: {path} has {outside} out of bounds intervals!"
+                )
+            writer.write_table(table.cast(schema))
+            stats["rows"] += batch.num_rows
+            stats["kept"] += table.num_rows
+            stats["unknown_contig"] += unknown
+            stats["out_of_bounds"] += outside
+        done = True
+    finally:
+        writer.close()
+        if sink is not None:
+            sink.close()
+        if not done:
+            partial.unlink(missing_ok=True)
+
+    os.replace(partial, output)
+    return stats
+
+
+def _compression(path: Path) -> str | None:
+    return "gzip" if path.suffix == ".gz" else None
+
+
+def harmonize_dataset(
+    cls,
+    input_paths: str | Path | Iterable[str | Path],
+    output_dir: str | Path,
+    assembly: str,
+    to_provider: str | None = "ucsc",
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+    chrom: str = "chrom",
+    start: str = "start",
+    end: str = "end",
+    out_of_bounds: str = "drop",
+    processes: int | None = None,
+    batch_size: int = 1 << 16,
+) -> pd.DataFrame:
+    """
+    Harmonizes the contig names of interval files in parallel.
+
+    Contig names of any provider are renamed to the names of the target
+    provider, and intervals on contigs outside the chosen roles and units
+    are dropped. Intervals must lie within their contig, and those that do
+    not are dropped, clipped or reported. Each file is streamed in record
+    batches and written batch by batch, so files are never fully loaded,
+    and files are processed by a pool of processes.
+
+    Parquet files ('.parquet', '.pq') keep their schema, with the contig
+    column as strings. BED files ('.bed', optionally gzipped) are read as
+    tab-separated columns, the first three being the contig, start and end,
+    and their header lines are kept.
+
+    Parameters
+    ----------
+    input_paths : Union[str, Path, Iterable[Union[str, Path]]]
+        The input files, or directories whose Parquet and BED files are all
+        harmonized.
+    output_dir : Union[str, Path]
+        The directory the harmonized files are written to, under the names
+        of the input files.
+    assembly : str
+        The assembly, patch or accession of the intervals, resolved
+        case-insensitively (see ``resolve``).
+    to_provider : Optional[str]
+        The provider of the output contig names ('ucsc', 'genbank',
+        'refseq', 'ncbi', default: 'ucsc').
+    roles : Optional[List[str]]
+        The roles of the contigs to keep (default: all of them).
+    units : Optional[List[str]]
+        The units of the contigs to keep (default: all of them).
+    chrom, start, end : str
+        The columns holding the contig names and positions in Parquet
+        files (default: 'chrom', 'start' and 'end'). Bounds are only
+        checked when both position columns are present.
+    out_of_bounds : str
+        What to do with intervals outside their contig: 'drop' them, 'clip'
+        them to the contig, or raise an 'error' (default: 'drop').
+    processes : Optional[int]
+        The number of worker processes (default: the number of CPUs, at
+        most one per file). Files are processed in this process with 1.
+        Workers are spawned, so scripts must guard their entry point with
+        ``if __name__ == "__main__":``.
+    batch_size : int
+        The number of rows per record batch (approximate for BED files).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per file, with its 'input' and 'output' paths, its number
+        of 'rows', the number of rows 'kept', and the number of rows on an
+        'unknown_contig' or 'out_of_bounds'.
+
+    Raises
+    ------
+    ValueError
+        If the assembly is not found in the database, the provider or
+        ``out_of_bounds`` is not valid, an input file is missing or of an
+        unknown format, two input files have the same name, or an interval
+        is out of bounds with ``out_of_bounds='error'``.
+
+    Examples
+    --------
+    >>> AssemblyInfo.harmonize_dataset(
+    ...     "peaks/", "peaks_ucsc/", "hg38", to_provider="ucsc",
+    ...     roles=["assembled"], processes=8,
+    ... )
+    """
+    if out_of_bounds not in OUT_OF_BOUNDS:
+        raise ValueError(
+            f"ERROR: out_of_bounds must be one of {', '.join(OUT_OF_BOUNDS)}!"
+        )
+
+    paths = _input_files(input_paths)
+    outputs = [Path(output_dir) / path.name for path in paths]
+    if len(set(outputs)) < len(outputs):
+        raise ValueError("ERROR: input files must have distinct names!")
+
+    with _phase("lookup"):
+        mapping = _build_mapping(cls, assembly, to_provider, roles, units)
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    task = functools.partial(
+        _harmonize_file,
+        mapping,
+        chrom=chrom,
+        start=start,
+        end=end,
+        out_of_bounds=out_of_bounds,
+        batch_size=batch_size,
+    )
+    processes = min(processes or os.cpu_count() or 1, len(paths))
+
+    with _phase("build"):
+        if processes <= 1:
+            results = list(map(task, paths, outputs))
+        else:
+            # workers are spawned rather than forked from a process running
+            # Arrow threads, and use a single thread each so that they scale
+            # with the number of processes
+            with ProcessPoolExecutor(
+                processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=pa.set_cpu_count,
+                initargs=(1,),
+            ) as pool:
+                results = list(pool.map(task, paths, outputs))
+
+    return pd.DataFrame(
+        results,
+        columns=["input", "output", "rows", "kept", "unknown_contig", "out_of_bounds"],
+    )
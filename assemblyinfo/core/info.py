@@ -1,7 +1,13 @@
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..dtypes import extend_table
+from .chrom import _output
+from .resolve import _rows, resolve
 
 __all__ = [
     "info",
@@ -19,11 +25,33 @@ __all__ = [
 ]
 
 
+def _build_db(cls) -> pd.DataFrame:
+    records = cls._contigs.to_dict(orient="records")
+    db = cls._data.copy()
+    db["contigs"] = [[records[i] for i in contigs] for contigs in db["contigs"]]
+    return db.rename(columns={"contigs": "seqinfo"})
+
+
+def _arrow_db(cls) -> pa.Table:
+    """Returns the database without its contigs, as an Arrow table."""
+
+    def build():
+        names = [n for n in pq.read_schema(cls._db_path).names if n != "contigs"]
+        table = pq.read_table(cls._db_path, columns=names).replace_schema_metadata()
+        # registered patches follow the packaged ones
+        return extend_table(table.combine_chunks(), cls._data[names].iloc[len(table) :])
+
+    return cls._cached("arrow_db", build)
+
+
 def get_db(cls) -> pd.DataFrame:
     """
     Returns the AssemblyInfo database.
 
-    This method returns the database stored in the class attribute `_data`.
+    This method returns the database stored in the class attribute `_data`,
+    with the 'seqinfo' column of each patch rebuilt as a list of contig
+    records from the table of distinct contigs. It is built on first call
+    and shared afterwards, so it must not be modified in place.
 
     Parameters
     ----------
@@ -40,7 +68,7 @@ def get_db(cls) -> pd.DataFrame:
     >>> AssemblyInfo.get_db()
     """
 
-    return cls._data
+    return cls._cached("db", lambda: _build_db(cls))
 
 
 def info(cls) -> str:
@@ -228,7 +256,9 @@ def get_organism_info(cls, organism: Optional[str] = None) -> str:
     return msg
 
 
-def get_assembly_metadata(cls, assembly: Optional[str] = None) -> Dict[str, Any]:
+def get_assembly_metadata(
+    cls, assembly: Optional[str] = None, output: Optional[str] = None
+) -> Union[Dict[str, Any], pa.Table]:
     """
     Retrieves the detailed information for the specified assembly.
 
@@ -236,16 +266,22 @@ def get_assembly_metadata(cls, assembly: Optional[str] = None) -> Dict[str, Any]
     ----------
     assembly : Optional[str]
         The assembly name to filter by, using either NCBI or UCSC nomenclature.
+    output : Optional[str]
+        'pandas' or 'arrow', to return the database rows of the assembly
+        patches as a ``pyarrow.Table``, with their 'metadata' struct column
+        (default: set by ``AssemblyInfo.set_output``).
 
     Returns
     -------
-    Dict[str, Any]
-        A dictionary containing detailed information about the assembly.
+    Union[Dict[str, Any], pyarrow.Table]
+        A dictionary containing detailed information about the assembly,
+        or its patches in Arrow output.
 
     Raises
     ------
     ValueError
-        If the assembly is not provided or not found in the database.
+        If the assembly is not provided or not found in the database, or
+        the output is not valid.
 
     Examples
     --------
@@ -259,43 +295,16 @@ def get_assembly_metadata(cls, assembly: Optional[str] = None) -> Dict[str, Any]
         }
     """
     if assembly is None:
-        error_msg = (
-            "ERROR: You did not provide any assembly! ",
-            "Pick an assembly using the NCBI nomenclature from:\n\n",
-            f"{cls._data['assembly'].unique().tolist()}\n\n",
-            "or the UCSC nomenclature from:\n\n",
-            f"{cls._data['assembly_ucsc'].dropna().unique().tolist()}",
-        )
-        raise ValueError(error_msg)
-
-    if assembly in cls._data["assembly"].tolist():
-        local_db = cls._data.set_index("assembly").loc[assembly, :]
-        if isinstance(local_db, pd.Series):
-            local_db = local_db.to_frame().T.reset_index(names="assembly")
-        else:
-            local_db = local_db.reset_index(names="assembly")
-        out = cls.build_assembly_info(local_db, assembly)
-
-        return out
-
-    elif assembly in cls._data["assembly_ucsc"].dropna().tolist():
-        local_db = cls._data.set_index("assembly_ucsc").loc[assembly, :]
-        if isinstance(local_db, pd.Series):
-            local_db = local_db.to_frame().T.reset_index(names="assembly_ucsc")
-        else:
-            local_db = local_db.reset_index(names="assembly_ucsc")
-        out = cls.build_assembly_info(local_db, assembly)
-
-        return out
-    else:
-        error_msg = (
-            f"ERROR: {assembly} not in database! ",
-            "Pick an assembly using the NCBI nomenclature from:\n\n",
-            f"{cls._data['assembly'].unique().tolist()}\n\n",
-            "or the UCSC nomenclature from:\n\n",
-            f"{cls._data['assembly_ucsc'].dropna().unique().tolist()}",
-        )
-        raise ValueError(error_msg)
+        raise ValueError("ERROR: You did not provide any assembly!")
+
+    output = _output(cls, output)
+    key = resolve(cls, assembly, kinds=["assembly", "ucsc"])
+    if output == "arrow":
+        return _arrow_db(cls).take(_rows(cls, key.kind, key.name))
+
+    local_db = cls._data.take(_rows(cls, key.kind, key.name)).reset_index(drop=True)
+
+    return cls.build_assembly_info(local_db, key.name)
 
 
 def build_assembly_info(cls, local_db: pd.DataFrame, assembly: str) -> Dict[str, Any]:
@@ -318,13 +327,13 @@ def build_assembly_info(cls, local_db: pd.DataFrame, assembly: str) -> Dict[str,
     --------
     >>> AssemblyInfo.build_assembly_info(local_db, "hg38")
     """
-    if len(local_db.patch) > 1:
-        latest = sorted(local_db.patch.tolist(), key=get_version, reverse=True)[0]
-        core = local_db.query(f"patch=='{latest}'").metadata.tolist()[0]
+    # the metadata of the latest patch, or of the highest patch version
+    latest = local_db["version"].eq("latest").fillna(False).to_numpy(bool)
+    if latest.any():
+        core = local_db.metadata[latest].iat[0]
     else:
-        core = local_db.query(
-            f"patch=='{local_db.assembly.unique()[0]}'"
-        ).metadata.tolist()[0]
+        patches = local_db.patch.tolist()
+        core = local_db.metadata.iat[patches.index(max(patches, key=get_version))]
 
     return dict(core, **{
         "species": local_db.species.unique()[0],
@@ -418,8 +427,9 @@ def available_patches(cls, assembly: Optional[str] = None) -> List[str]:
     """
     if not assembly:
         return cls._data.patch.unique().tolist()
-    else:
-        return cls._data.query(f"assembly=='{assembly}'").patch.unique().tolist()
+
+    key = resolve(cls, assembly, kinds=["assembly", "ucsc"])
+    return cls._data["patch"].take(_rows(cls, key.kind, key.name)).unique().tolist()
 
 
 def available_species(cls) -> List[str]:
@@ -474,9 +484,6 @@ def available_accessions(cls, assembly: str) -> List[str]:
     if not assembly:
         raise ValueError("ERROR: you must provide an assembly!")
 
-    if assembly in cls._data["assembly"].tolist():
-        db = cls._data.query(f"assembly=='{assembly}'")
-        return db["genbank_accession"].tolist() + db["refseq_accession"].tolist()
-    else:
-        db = cls._data.query(f"assembly_ucsc=='{assembly}'")
-        return db["genbank_accession"].tolist() + db["refseq_accession"].tolist()
+    key = resolve(cls, assembly, kinds=["assembly", "ucsc"])
+    db = cls._data.take(_rows(cls, key.kind, key.name))
+    return db["genbank_accession"].tolist() + db["refseq_accession"].tolist()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..dtypes import STRING_DTYPE
+from .chrom import _output
+from .info import _arrow_db
+
+__all__ = ["get_metadata_table", "query_metadata"]
+
+# database columns identifying each patch, leading the metadata columns
+PATCH_COLUMNS = [
+    "assembly",
+    "assembly_ucsc",
+    "patch",
+    "species",
+    "common_name",
+    "genbank_accession",
+    "refseq_accession",
+]
+# metadata keys with few distinct values
+CATEGORICAL_KEYS = [
+    "assembly_level",
+    "assembly_type",
+    "excluded_from_refseq",
+    "expected_final_version",
+    "genome_representation",
+    "refseq_assembly_and_genbank_assemblies_identical",
+    "refseq_category",
+    "release_type",
+    "sex",
+]
+# numeric keys that are fractions, the others being counts and lengths
+FLOAT_SUFFIXES = ("gc-perc",)
+
+_TYPES = {
+    pa.string(): STRING_DTYPE,
+    pa.large_string(): STRING_DTYPE,
+    pa.int64(): pd.Int64Dtype(),
+}
+
+
+def _column(key: str, values: pa.Array) -> pa.Array:
+    """Converts the values of a metadata key to their type."""
+    if key == "date":
+        return pc.strptime(values, format="%Y-%m-%d", unit="s", error_is_null=True)
+    elif key == "taxid":
+        return values.cast(pa.int64())
+    elif key == "genome_coverage":
+        # e.g. '80.0x'
+        coverage = pc.extract_regex(values, r"^\s*(?P<x>\d+(?:\.\d+)?)\s*[xX]?\s*$")
+        return pc.struct_field(coverage, "x").cast(pa.float64())
+    elif key in CATEGORICAL_KEYS:
+        return values.dictionary_encode()
+    elif pa.types.is_floating(values.type) and not key.endswith(FLOAT_SUFFIXES):
+        try:
+            return values.cast(pa.int64())
+        except pa.ArrowInvalid:
+            return values
+    return values
+
+
+def _build_metadata_table(cls) -> pa.Table:
+    db = _arrow_db(cls)
+    metadata = db["metadata"].combine_chunks()
+
+    columns = {column: db[column] for column in PATCH_COLUMNS}
+    columns["latest"] = pc.fill_null(pc.equal(db["version"], "latest"), False)
+    for field in metadata.type:
+        name = field.name.replace("-", "_")
+        columns[name] = _column(field.name, metadata.field(field.name))
+    return pa.table(columns)
+
+
+def _metadata_table(cls) -> pa.Table:
+    """Returns the metadata of every patch as a typed Arrow table."""
+    return cls._cached("metadata_table", lambda: _build_metadata_table(cls))
+
+
+def _metadata_frame(cls) -> pd.DataFrame:
+    def build():
+        table = _metadata_table(cls).combine_chunks()
+        return table.to_pandas(types_mapper=_TYPES.get)
+
+    return cls._cached("metadata_frame", build)
+
+
+def get_metadata_table(cls, output: str | None = None) -> pd.DataFrame | pa.Table:
+    """
+    Returns the metadata of every patch as a typed, flattened table.
+
+    Each key of the patch metadata (see ``get_assembly_metadata``) is a
+    column, with '-' replaced by '_' so that columns are valid names in
+    ``DataFrame.query``. Dates are datetimes, counts, lengths and taxids
+    are nullable integers, GC percentages and the genome coverage are
+    floats, and levels and categories are categoricals. The table is built
+    once, so that assemblies are compared with vectorized operations, and
+    must not be modified in place.
+
+    Parameters
+    ----------
+    output : Optional[str]
+        'pandas' or 'arrow', to return a ``pyarrow.Table`` (default: set by
+        ``AssemblyInfo.set_output``).
+
+    Returns
+    -------
+    Union[pd.DataFrame, pyarrow.Table]
+        One row per patch, with the assembly, patch, species and accession
+        columns, a 'latest' flag and the metadata columns.
+
+    Raises
+    ------
+    ValueError
+        If the output is not valid.
+
+    Examples
+    --------
+    >>> table = AssemblyInfo.get_metadata_table()
+    >>> table[table["latest"]].nlargest(5, "contig_N50")
+    """
+    if _output(cls, output) == "arrow":
+        return _metadata_table(cls)
+    return _metadata_frame(cls)
+
+
+def query_metadata(
+    cls,
+    expr: str | None = None,
+    sort_by: str | list[str] | None = None,
+    ascending: bool = True,
+    limit: int | None = None,
+) -> pd.DataFrame:
+    """
+    Filters and ranks patches by their metadata.
+
+    Parameters
+    ----------
+    expr : Optional[str]
+        A ``DataFrame.query`` expression over the columns of
+        ``get_metadata_table`` (default: every patch).
+    sort_by : Optional[Union[str, List[str]]]
+        The columns to rank the patches by.
+    ascending : bool
+        Whether to rank in ascending order (default: True).
+    limit : Optional[int]
+        The maximum number of patches to return.
+
+    Returns
+    -------
+    pd.DataFrame
+        The matching rows of the metadata table.
+
+    Raises
+    ------
+    ValueError
+        If a column of the expression or of ``sort_by`` does not exist.
+
+    Examples
+    --------
+    >>> AssemblyInfo.query_metadata("latest and contig_N50 > 10e6")
+    >>> AssemblyInfo.query_metadata(
+    ...     "species == 'homo_sapiens'", sort_by="date", ascending=False, limit=1
+    ... )
+    """
+    df = _metadata_frame(cls)
+
+    try:
+        if expr:
+            df = df.query(expr)
+        if sort_by:
+            df = df.sort_values(sort_by, ascending=ascending, kind="stable")
+    except (KeyError, pd.errors.UndefinedVariableError) as e:
+        raise ValueError(f"ERROR: {e} is not a metadata column!") from e
+
+    return df.head(limit) if limit is not None else df
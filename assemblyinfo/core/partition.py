@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import _phase
+from .sample import _contig_sizes
+
+__all__ = ["partition_genome"]
+
+
+def _pack(sizes: np.ndarray, n_chunks: int) -> np.ndarray:
+    """
+    Assigns items to chunks with the longest-processing-time heuristic.
+
+    Items are placed from the longest to the shortest, each in the chunk
+    with the smallest total so far, so that the largest chunk is at most
+    4/3 of the optimum.
+    """
+    chunks = np.empty(len(sizes), dtype=np.int64)
+    loads = [(0, chunk) for chunk in range(n_chunks)]
+    for item in np.argsort(-sizes, kind="stable"):
+        load, chunk = loads[0]
+        chunks[item] = chunk
+        heapq.heapreplace(loads, (load + int(sizes[item]), chunk))
+    return chunks
+
+
+def partition_genome(
+    cls,
+    assembly: str,
+    n_chunks: int | None = None,
+    target_size: int | None = None,
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+    provider: str | None = None,
+    split_contigs: bool = False,
+) -> pd.DataFrame:
+    """
+    Partitions an assembly into chunks of similar total length.
+
+    Contigs, or pieces of them, are packed into chunks with the
+    longest-processing-time heuristic: from the longest to the shortest,
+    each goes to the chunk with the smallest total so far. Small contigs
+    are thus grouped together, and no chunk is much longer than the others
+    unless a single contig is.
+
+    Parameters
+    ----------
+    assembly : str
+        The assembly, patch or accession, resolved case-insensitively (see
+        ``resolve``).
+    n_chunks : Optional[int]
+        The number of chunks.
+    target_size : Optional[int]
+        The target total length of each chunk, instead of ``n_chunks``.
+    roles : list[str], optional
+        The roles of the contigs to partition (e.g. 'assembled').
+    units : list[str], optional
+        The units of the contigs to partition.
+    provider : Optional[str]
+        The provider of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: 'ucsc'). Contigs without a name are left out.
+    split_contigs : bool
+        Whether contigs longer than the target size are split into pieces of
+        that size, starting at multiples of it (default: False, contigs are
+        never split).
+
+    Returns
+    -------
+    pd.DataFrame
+        The regions of every chunk, with 'chunk', 'chrom', 'start' and 'end'
+        columns in BED coordinates, sorted by chunk then in assembly order.
+
+    Raises
+    ------
+    ValueError
+        If not exactly one of ``n_chunks`` and ``target_size`` is given or
+        it is not positive, or if the assembly is not found in the database.
+
+    Examples
+    --------
+    >>> regions = AssemblyInfo.partition_genome(
+    ...     "hg38", n_chunks=64, roles=["assembled"], split_contigs=True
+    ... )
+    >>> for chunk, chunk_regions in regions.groupby("chunk"):
+    ...     ...
+    """
+    if (n_chunks is None) == (target_size is None):
+        raise ValueError("ERROR: you must provide either n_chunks or target_size!")
+    if (n_chunks if target_size is None else target_size) < 1:
+        raise ValueError("ERROR: the number or size of the chunks must be positive!")
+
+    names, sizes = _contig_sizes(cls, assembly, provider, roles, units)
+
+    with _phase("build"):
+        total = int(sizes.sum())
+        if target_size is None:
+            target_size = max(-(-total // n_chunks), 1)
+        else:
+            n_chunks = max(-(-total // target_size), 1)
+
+        if split_contigs:
+            pieces = np.maximum(-(-sizes // target_size), 1)
+            contigs = np.repeat(np.arange(len(sizes)), pieces)
+            first = np.cumsum(pieces) - pieces
+            starts = (np.arange(len(contigs)) - first[contigs]) * target_size
+            ends = np.minimum(starts + target_size, sizes[contigs])
+        else:
+            contigs = np.arange(len(sizes))
+            starts = np.zeros(len(sizes), dtype=np.int64)
+            ends = sizes
+
+        chunks = _pack(ends - starts, min(n_chunks, len(contigs)))
+        order = np.lexsort((starts, contigs, chunks))
+
+        return pd.DataFrame(
+            {
+                "chunk": chunks[order],
+                "chrom": names[contigs[order]],
+                "start": starts[order],
+                "end": ends[order],
+            }
+        )
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..dtypes import CATEGORICAL_COLUMNS, compact, extend_table
+from ..reports import (
+    merge_stat_info,
+    parse_chrom_sizes,
+    parse_chromosome_report,
+    parse_metadata_report,
+    parse_stats_report,
+    process_chromosome_info,
+)
+from .acc import _accession_entries
+from .chrom import _extend_seqinfo
+from .contig import _extend_contig_index
+from .detect import _extend_length_index
+from .resolve import (
+    KIND_COLUMNS,
+    AssemblyKey,
+    _add_row_arrays,
+    _add_rows,
+    _index,
+    _normalize,
+    _trigrams,
+    _value,
+    resolve,
+)
+from .search import _search_entries
+
+__all__ = ["register_assembly"]
+
+# columns of the overlay file, which holds registered patches as rows of
+# the database with their seqinfo records
+OVERLAY_COLUMNS = [
+    "assembly",
+    "patch",
+    "genbank_accession",
+    "refseq_accession",
+    "genbank_path",
+    "refseq_path",
+    "species",
+    "assembly_ucsc",
+    "seqinfo",
+    "metadata",
+    "common_name",
+    "version",
+]
+ORGANISM_PATTERN = r"^\s*(.+?)\s*(?:\((.+)\))?\s*$"
+DEFAULT_OVERLAY = Path("~/.assemblyinfo/overlay.parquet")
+
+
+def _overlay_path() -> Path | None:
+    """
+    Returns the path of the user overlay, read from the environment, or
+    None when the ``ASSEMBLYINFO_OVERLAY`` variable is set but empty.
+    """
+    path = os.environ.get("ASSEMBLYINFO_OVERLAY", str(DEFAULT_OVERLAY))
+    return Path(path).expanduser() if path else None
+
+
+def _read_overlay(path: Path) -> pd.DataFrame:
+    """Returns the patches registered in an overlay file."""
+    overlay = pq.read_table(path).to_pandas()[OVERLAY_COLUMNS]
+    overlay["seqinfo"] = overlay["seqinfo"].map(list)
+    overlay["metadata"] = [
+        {k: v for k, v in m.items() if v is not None} for m in overlay["metadata"]
+    ]
+    return overlay
+
+
+def _write_overlay(path: Path, overlay: pd.DataFrame) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.{os.getpid()}")
+    pq.write_table(pa.Table.from_pandas(overlay, preserve_index=False), partial)
+    os.replace(partial, path)
+
+
+def _insert_sorted(
+    index: pd.DataFrame, entries: pd.DataFrame, keys, new_keys
+) -> pd.DataFrame:
+    """
+    Inserts the sorted entries of new database rows into an index sorted by
+    key and row. New rows follow every indexed row, so each entry goes after
+    the indexed entries of its key, found with a ``searchsorted`` instead of
+    sorting the whole index again.
+    """
+    positions = np.searchsorted(np.asarray(keys), np.asarray(new_keys), "right")
+    return pd.DataFrame(
+        {
+            column: np.insert(
+                index[column].to_numpy(), positions, entries[column].to_numpy()
+            )
+            for column in index.columns
+        }
+    ).astype(index.dtypes.to_dict())
+
+
+def _search_keys(index: pd.DataFrame) -> np.ndarray:
+    """Returns the (token, field) pairs of search entries as sortable strings."""
+    # tokens hold no spaces, and a space sorts before every token character
+    return index["token"].to_numpy(object) + " " + index["field"].to_numpy(object)
+
+
+def _refreshed_cache(
+    cache: dict, data: pd.DataFrame, contigs: pd.DataFrame, rows: np.ndarray
+) -> dict:
+    """
+    Returns the cached lookup indexes extended with new database rows.
+
+    The identifier, row, trigram, accession, search, contig and length
+    indexes, the seqinfo table and the Arrow tables are extended with the
+    rows alone, without sorting them again, so lookups of registered patches
+    go through the same structures as packaged ones. The tables built from
+    these (the metadata table and frame, the search lookup, the database
+    with its seqinfo records, the chromosome ranks and the SQL connection)
+    are left out and rebuilt from them on their next use. The indexes of the
+    given cache are copied, not modified.
+    """
+    index = cache.get("resolve_index")
+    trigrams = cache.get("resolve_trigrams")
+    rows_index = cache.get("resolve_rows")
+    accessions = cache.get("accession_index")
+    search = cache.get("search_index")
+
+    refreshed = {}
+    if "parquet_storage" in cache:
+        refreshed["parquet_storage"] = cache["parquet_storage"]
+
+    if index is not None:
+        extended = defaultdict(dict, {k: dict(v) for k, v in index.items()})
+        # the names of assemblies with a new latest patch resolve to it, so
+        # they are added again from every patch of these assemblies
+        latest = data["version"].take(rows).eq("latest").fillna(False).to_numpy()
+        assemblies = data["assembly"].take(rows[latest])
+        moved = np.flatnonzero(data["assembly"].isin(assemblies).to_numpy(bool))
+        for kind in ["assembly", "ucsc"]:
+            for value in data[KIND_COLUMNS[kind]].take(moved):
+                if _value(value) is not None:
+                    extended[_normalize(value)].pop(kind, None)
+        _add_rows(extended, data, np.union1d(rows, moved))
+        refreshed["resolve_index"] = dict(extended)
+        if trigrams is not None:
+            postings = {k: list(v) for k, v in trigrams.items()}
+            for key in extended.keys() - index.keys():
+                for trigram in _trigrams(key):
+                    postings.setdefault(trigram, []).append(key)
+            refreshed["resolve_trigrams"] = postings
+
+    if rows_index is not None:
+        rows_index = dict(rows_index)
+        _add_row_arrays(rows_index, data, rows)
+        refreshed["resolve_rows"] = rows_index
+
+    if accessions is not None:
+        entries = _accession_entries(data, rows).sort_values(
+            ["key", "row"], ignore_index=True
+        )
+        refreshed["accession_index"] = _insert_sorted(
+            accessions, entries, accessions["key"], entries["key"]
+        )
+
+    if search is not None:
+        entries = _search_entries(data, rows).sort_values(
+            ["token", "field", "row"], ignore_index=True
+        )
+        refreshed["search_index"] = _insert_sorted(
+            search, entries, _search_keys(search), _search_keys(entries)
+        )
+
+    table = cache.get("seqinfo_table")
+    if table is not None:
+        first = len(table)
+        table = _extend_seqinfo(table, data, contigs, rows)
+        refreshed["seqinfo_table"] = table
+        if "contig_index" in cache:
+            refreshed["contig_index"] = _extend_contig_index(
+                cache["contig_index"], table, first
+            )
+        if "length_index" in cache:
+            refreshed["length_index"] = _extend_length_index(
+                cache["length_index"], table, first, data
+            )
+
+    if "arrow_contigs" in cache:
+        arrow_contigs = cache["arrow_contigs"]
+        refreshed["arrow_contigs"] = extend_table(
+            arrow_contigs, contigs.iloc[arrow_contigs.num_rows :]
+        )
+
+    if "arrow_db" in cache:
+        arrow_db = cache["arrow_db"]
+        arrow_db = extend_table(
+            arrow_db, data[arrow_db.column_names].iloc[arrow_db.num_rows :]
+        )
+        # demoted patches are no longer the latest
+        version = arrow_db.schema.get_field_index("version")
+        refreshed["arrow_db"] = arrow_db.set_column(
+            version,
+            arrow_db.schema.field(version),
+            pa.array(
+                data["version"].astype(object).where(data["version"].notna(), None),
+                type=arrow_db.schema.field(version).type,
+            ),
+        )
+
+    return refreshed
+
+
+def _cast_like(df: pd.DataFrame, like: pd.DataFrame) -> pd.DataFrame:
+    """Casts the columns of new rows to the dtypes of the loaded table."""
+    dtypes = {
+        column: dtype
+        for column, dtype in like.dtypes.items()
+        # categoricals are merged by ``compact`` unless the column is empty
+        if column not in CATEGORICAL_COLUMNS or df[column].isna().all()
+    }
+    return df.astype(dtypes)
+
+
+def _append_overlay(
+    data: pd.DataFrame, contigs: pd.DataFrame, overlay: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns the database and distinct contigs tables with registered
+    patches appended. Registered patches replace the latest patch of their
+    assembly.
+    """
+    added = pd.DataFrame.from_records(
+        [contig for seqinfo in overlay["seqinfo"] for contig in seqinfo]
+    ).reindex(columns=contigs.columns)
+    added = _cast_like(added, contigs)
+
+    sizes = overlay["seqinfo"].map(len).to_numpy()
+    positions = np.arange(len(contigs), len(contigs) + sizes.sum())
+    rows = overlay.drop(columns="seqinfo").assign(
+        contigs=np.split(positions.astype(np.int32), np.cumsum(sizes)[:-1])
+    )[data.columns]
+    rows = _cast_like(rows, data)
+
+    contigs = compact(pd.concat([contigs, added], ignore_index=True))
+    data = compact(pd.concat([data, rows], ignore_index=True))
+    latest = data["version"].eq("latest").fillna(False)
+    demoted = latest & data["assembly"].where(latest).duplicated(keep="last")
+    data.loc[demoted.to_numpy(bool), "version"] = None
+    return data, contigs
+
+
+def _merge_overlay(cls, overlay: pd.DataFrame) -> None:
+    """
+    Appends registered patches to the loaded tables and their indexes.
+
+    The tables and caches are replaced rather than modified, so concurrent
+    readers see either the tables before or after the registration.
+    """
+    with cls._cache_lock:
+        first = len(cls._data)
+        data, contigs = _append_overlay(cls._data, cls._contigs, overlay)
+        cache = _refreshed_cache(cls._cache, data, contigs, np.arange(first, len(data)))
+        # readers do not take the lock, so the new tables and caches are
+        # built aside and swapped in: the tables only grow, and a reader
+        # still holding the old indexes gets rows that exist in both
+        cls._contigs, cls._data = contigs, data
+        cls._cache, cls._query_cache = cache, OrderedDict()
+
+
+def _parse_source(text: str) -> tuple[dict, pd.DataFrame]:
+    """Parses an assembly report or a chrom.sizes file."""
+    if text.lstrip().startswith("#"):
+        metadata = parse_metadata_report(text)
+        seqinfo = process_chromosome_info(parse_chromosome_report(text))
+        return metadata, seqinfo
+    return {}, parse_chrom_sizes(text)
+
+
+def register_assembly(
+    cls,
+    path: str | Path,
+    assembly: str | None = None,
+    species: str | None = None,
+    common_name: str | None = None,
+    assembly_ucsc: str | None = None,
+    stats: str | Path | None = None,
+) -> AssemblyKey:
+    """
+    Registers a local assembly in the user overlay.
+
+    The file is parsed with the parsers of the database builder, and the
+    resulting patch is saved to the user overlay file, which is merged on
+    every later connection, as the latest patch of its assembly. The
+    overlay is the path in the ``ASSEMBLYINFO_OVERLAY`` environment
+    variable when the database is connected, or
+    '~/.assemblyinfo/overlay.parquet'. The patch is appended
+    to the loaded tables and lookup indexes without reloading the
+    database, so that it resolves like packaged patches. A SQLite storage
+    backend (see ``AssemblyInfo.set_storage``) is not updated, and must be
+    exported again with the overlay (see ``export_sqlite``) to hold it.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        An NCBI ``*_assembly_report.txt`` or a UCSC ``*.chrom.sizes`` file.
+    assembly : Optional[str]
+        The assembly name (default: the assembly name of the report, without
+        its patch suffix). Required for chrom.sizes files.
+    species : Optional[str]
+        The species (default: the organism name of the report, e.g.
+        'homo_sapiens'). Required for chrom.sizes files.
+    common_name : Optional[str]
+        The common name of the species (default: the one in the report).
+    assembly_ucsc : Optional[str]
+        The UCSC name of the assembly (default: that of the assembly, when
+        it is already in the database).
+    stats : Optional[Union[str, Path]]
+        An NCBI ``*_assembly_stats.txt`` file, to add the statistics of the
+        assembly to its metadata and seqinfo.
+
+    Returns
+    -------
+    AssemblyKey
+        The key of the registered patch.
+
+    Raises
+    ------
+    ValueError
+        If the name or species of a chrom.sizes file is missing, the patch
+        is already in the database, or the user overlay is disabled.
+
+    Examples
+    --------
+    >>> AssemblyInfo.register_assembly("GRCh38_decoy_assembly_report.txt")
+    >>> AssemblyInfo.register_assembly(
+    ...     "K562.chrom.sizes", assembly="K562", species="homo_sapiens"
+    ... )
+    >>> AssemblyInfo.get_chromsizes("K562")
+    """
+    metadata, seqinfo = _parse_source(Path(path).read_text())
+
+    patch = metadata.get("assembly_name") or assembly
+    if not patch:
+        raise ValueError(f"ERROR: you must provide the assembly name of {path}!")
+    organism = re.match(ORGANISM_PATTERN, metadata.get("organism_name", ""))
+    if organism is not None:
+        species = species or organism.group(1).lower().replace(" ", "_")
+        common_name = common_name or organism.group(2)
+    if not species:
+        raise ValueError(f"ERROR: you must provide the species of {path}!")
+    if "patch" in _index(cls).get(_normalize(patch), {}):
+        raise ValueError(f"ERROR: {patch} is already in database!")
+    metadata.setdefault("assembly_name", patch)
+    assembly = assembly or re.sub(r"\.p\d+$", "", patch)
+    previous = _index(cls).get(_normalize(assembly), {}).get("assembly")
+    if assembly_ucsc is None and previous is not None:
+        assembly_ucsc = previous.assembly_ucsc
+
+    overlay_path = cls._overlay_path
+    if overlay_path is None:
+        raise ValueError(
+            "ERROR: the user overlay is disabled, set ASSEMBLYINFO_OVERLAY to its path!"
+        )
+
+    overlay = pd.DataFrame(
+        {
+            "assembly": [assembly],
+            "patch": [patch],
+            "genbank_accession": [metadata.get("genbank_assembly_accession")],
+            "refseq_accession": [metadata.get("refseq_assembly_accession")],
+            "genbank_path": [None],
+            "refseq_path": [None],
+            "species": [species],
+            "assembly_ucsc": [assembly_ucsc],
+            "seqinfo": [seqinfo.to_dict(orient="records")],
+            "metadata": [metadata],
+            "common_name": [common_name or species],
+            "version": ["latest"],
+        }
+    )
+    if stats is not None:
+        merge_stat_info(overlay, 0, parse_stats_report(Path(stats).read_text()))
+
+    if overlay_path.is_file():
+        registered = _read_overlay(overlay_path)
+        registered.loc[registered["assembly"] == assembly, "version"] = None
+        _write_overlay(
+            overlay_path, pd.concat([registered, overlay], ignore_index=True)
+        )
+    else:
+        _write_overlay(overlay_path, overlay)
+
+    _merge_overlay(cls, overlay)
+    return resolve(cls, patch, kinds=["patch"])
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["AssemblyKey", "resolve", "suggest"]
+
+# identifier kinds, in the order they take precedence when a name is shared
+KINDS = ["assembly", "ucsc", "patch", "genbank", "refseq", "species", "common_name"]
+ASSEMBLY_KINDS = ["assembly", "ucsc", "patch", "genbank", "refseq"]
+
+KIND_COLUMNS = {
+    "assembly": "assembly",
+    "ucsc": "assembly_ucsc",
+    "patch": "patch",
+    "genbank": "genbank_accession",
+    "refseq": "refseq_accession",
+    "species": "species",
+    "common_name": "common_name",
+}
+
+
+class AssemblyKey(NamedTuple):
+    """
+    A resolved identifier.
+
+    ``kind`` tells which kind of name the identifier matched ('assembly',
+    'ucsc', 'patch', 'genbank', 'refseq', 'species' or 'common_name').
+    Assembly names resolve to their latest patch, while patch names and
+    accessions resolve to that exact patch. Species and common names only
+    fill ``species``, with ``row`` set to None.
+    """
+
+    kind: str
+    name: str
+    species: str
+    assembly: str | None = None
+    assembly_ucsc: str | None = None
+    patch: str | None = None
+    accession: str | None = None
+    row: int | None = None
+
+
+def _normalize(identifier: str) -> str:
+    return identifier.strip().lower()
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Returns the edit distance between strings, counting transpositions."""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+def _value(value) -> str | None:
+    return None if pd.isna(value) else value
+
+
+def _add_rows(
+    index: dict[str, dict[str, AssemblyKey]], data: pd.DataFrame, rows: np.ndarray
+) -> None:
+    """
+    Adds the identifiers of database rows to an index, in place.
+
+    Identifiers already in the index keep resolving to their current key.
+    """
+    latest = data["version"].take(rows).eq("latest").fillna(False).to_numpy()
+    # rows of the latest patches first, so assembly names resolve to them
+    latest_first = rows[np.lexsort((rows, ~latest))]
+
+    for kind in ASSEMBLY_KINDS:
+        ordered = latest_first if kind in ["assembly", "ucsc"] else rows
+        values = data[KIND_COLUMNS[kind]]
+        for row in ordered:
+            value = _value(values.iat[row])
+            if value is None or kind in index[_normalize(value)]:
+                continue
+            index[_normalize(value)][kind] = AssemblyKey(
+                kind=kind,
+                name=value,
+                species=data["species"].iat[row],
+                assembly=data["assembly"].iat[row],
+                assembly_ucsc=_value(data["assembly_ucsc"].iat[row]),
+                patch=data["patch"].iat[row],
+                accession=value if kind in ["genbank", "refseq"] else None,
+                row=int(row),
+            )
+
+    for kind in ["species", "common_name"]:
+        pairs = data[["species", KIND_COLUMNS[kind]]].take(rows).drop_duplicates()
+        for species, value in pairs.itertuples(index=False):
+            index[_normalize(value)].setdefault(
+                kind, AssemblyKey(kind=kind, name=value, species=species)
+            )
+
+
+def _build_index(cls) -> dict[str, dict[str, AssemblyKey]]:
+    index = defaultdict(dict)
+    _add_rows(index, cls._data, np.arange(len(cls._data)))
+    return dict(index)
+
+
+def _add_row_arrays(
+    rows_index: dict[tuple[str, str], np.ndarray], data: pd.DataFrame, rows: np.ndarray
+) -> None:
+    """
+    Adds database rows to a map of (kind, value) pairs to the rows holding
+    them, in place. Rows must follow those already in the map.
+    """
+    for kind, column in KIND_COLUMNS.items():
+        codes, uniques = pd.factorize(data[column].take(rows))
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        groups = np.split(rows[order[(codes < 0).sum() :]], np.cumsum(counts)[:-1])
+        for value, group in zip(uniques, groups):
+            previous = rows_index.get((kind, value))
+            rows_index[(kind, value)] = (
+                group if previous is None else np.concatenate([previous, group])
+            )
+
+
+def _build_rows_index(cls) -> dict[tuple[str, str], np.ndarray]:
+    rows_index = {}
+    _add_row_arrays(rows_index, cls._data, np.arange(len(cls._data)))
+    return rows_index
+
+
+def _rows(cls, kind: str, value: str) -> np.ndarray:
+    """Returns the database rows whose ``kind`` column equals ``value``."""
+    rows_index = cls._cached("resolve_rows", lambda: _build_rows_index(cls))
+    return rows_index.get((kind, value), np.empty(0, dtype=np.int64))
+
+
+def _index(cls) -> dict[str, dict[str, AssemblyKey]]:
+    """Returns the map of normalized identifiers to their resolved keys."""
+    return cls._cached("resolve_index", lambda: _build_index(cls))
+
+
+def _trigram_index(cls) -> dict[str, list[str]]:
+    """Returns the map of trigrams to the normalized identifiers holding them."""
+
+    def build():
+        postings = defaultdict(list)
+        for key in _index(cls):
+            for trigram in _trigrams(key):
+                postings[trigram].append(key)
+        return dict(postings)
+
+    return cls._cached("resolve_trigrams", build)
+
+
+def suggest(
+    cls,
+    identifier: str,
+    kinds: Sequence[str] | None = None,
+    n: int = 3,
+) -> list[str]:
+    """
+    Returns the known names closest to an identifier.
+
+    Candidates sharing trigrams with the identifier are retrieved from a
+    precomputed trigram index, then ranked by edit distance.
+
+    Parameters
+    ----------
+    identifier : str
+        The identifier to find suggestions for.
+    kinds : Optional[List[str]]
+        The kinds of names to suggest (default: all kinds).
+    n : int
+        The maximum number of suggestions.
+
+    Returns
+    -------
+    List[str]
+        The suggested names, best match first.
+
+    Examples
+    --------
+    >>> AssemblyInfo.suggest("hg83")
+    ['hg38', 'hg18']
+    """
+    index = _index(cls)
+    postings = _trigram_index(cls)
+    query = _normalize(identifier)
+    trigrams = _trigrams(query)
+
+    shared = Counter()
+    for trigram in trigrams:
+        shared.update(postings.get(trigram, []))
+
+    scored = []
+    for key, count in shared.items():
+        matches = [index[key][k] for k in kinds or KINDS if k in index[key]]
+        if not matches:
+            continue
+        distance = _edit_distance(query, key)
+        similarity = 2 * count / (len(trigrams) + len(_trigrams(key)))
+        if distance <= max(2, len(query) // 3) or similarity >= 0.5:
+            scored.append((distance, -similarity, key, matches[0].name))
+
+    return [name for *_, name in sorted(scored)[:n]]
+
+
+def resolve(
+    cls,
+    identifier: str,
+    kinds: Sequence[str] | None = None,
+) -> AssemblyKey:
+    """
+    Resolves any assembly, patch, accession or species identifier.
+
+    Identifiers are matched case-insensitively through a precomputed map.
+    When a name is shared by several kinds of identifiers, the first kind
+    in ``kinds`` wins.
+
+    Parameters
+    ----------
+    identifier : str
+        An NCBI or UCSC assembly name, a patch name, a GenBank or RefSeq
+        accession, a species or a common name.
+    kinds : Optional[List[str]]
+        The kinds of identifiers accepted, in order of precedence (default:
+        'assembly', 'ucsc', 'patch', 'genbank', 'refseq', 'species',
+        'common_name').
+
+    Returns
+    -------
+    AssemblyKey
+        The resolved key.
+
+    Raises
+    ------
+    ValueError
+        If the identifier is not provided or not found in the database.
+
+    Examples
+    --------
+    >>> AssemblyInfo.resolve("Hg38")
+    AssemblyKey(kind='ucsc', name='hg38', species='homo_sapiens', ...)
+    >>> AssemblyInfo.resolve("GCF_000001405.40")
+    """
+    if not identifier or not isinstance(identifier, str):
+        raise ValueError("ERROR: you must provide an identifier!")
+
+    matches = _index(cls).get(_normalize(identifier), {})
+    for kind in kinds or KINDS:
+        if kind in matches:
+            return matches[kind]
+
+    error_msg = f"ERROR: {identifier} not in database!"
+    if matches:
+        found = ", ".join(matches)
+        error_msg += f" It is a {found} name, expected one of: {', '.join(kinds)}."
+    else:
+        suggestions = suggest(cls, identifier, kinds=kinds)
+        if suggestions:
+            error_msg += f" Did you mean: {', '.join(suggestions)}?"
+    raise ValueError(error_msg)
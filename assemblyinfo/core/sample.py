@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import _phase
+from .chrom import _provider_column
+
+__all__ = ["iter_sample_positions", "sample_intervals", "sample_positions"]
+
+
+def _contig_sizes(
+    cls,
+    assembly: str,
+    provider: str | None,
+    roles: list[str] | None,
+    units: list[str] | None,
+) -> tuple[pd.Index, np.ndarray]:
+    """
+    Returns the contig names of an assembly and their lengths, kept in the
+    bounded query cache under the resolved patch row.
+    """
+    colname = _provider_column(provider)
+
+    with _phase("lookup"):
+        row = cls._storage().lookup(assembly)
+
+    def build():
+        seqinfo = cls._storage().contigs(row, roles, units)
+        seqinfo = seqinfo[seqinfo[colname].notna()]
+        names = pd.Index(seqinfo[colname].to_numpy(object), name=colname)
+        return names, seqinfo["length"].to_numpy(np.int64, na_value=0)
+
+    key = tuple(roles) if roles else None, tuple(units) if units else None
+    return cls._cached_query(("contig_sizes", row, colname, *key), build)
+
+
+def _sample(
+    names: pd.Index, sizes: np.ndarray, n: int, rng: np.random.Generator
+) -> tuple[pd.Categorical, np.ndarray]:
+    """
+    Draws offsets uniformly in the concatenated contigs, and maps them to
+    contigs and positions with a single ``searchsorted``.
+    """
+    ends = np.cumsum(sizes)
+    offsets = rng.integers(0, ends[-1], size=n)
+    codes = ends.searchsorted(offsets, "right")
+    positions = offsets - (ends - sizes)[codes]
+    return pd.Categorical.from_codes(codes, categories=names), positions
+
+
+def _sizes(
+    cls, assembly, provider, roles, units, length: int = 1
+) -> tuple[pd.Index, np.ndarray]:
+    """Returns the contig names and the number of intervals each can hold."""
+    names, sizes = _contig_sizes(cls, assembly, provider, roles, units)
+    starts = np.maximum(sizes - length + 1, 0)
+    if not starts.sum():
+        raise ValueError(
+            f"ERROR: no contig of {assembly} can hold an interval of {length} bp!"
+        )
+    return names, starts
+
+
+def sample_positions(
+    cls,
+    assembly: str,
+    n: int,
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+    provider: str | None = None,
+    seed: int | np.random.Generator | None = None,
+) -> tuple[pd.Categorical, np.ndarray]:
+    """
+    Samples genomic positions uniformly at random.
+
+    Every base of the selected contigs is equally likely, so contigs are
+    drawn in proportion to their length. Offsets are drawn in the
+    concatenated contigs and mapped to contigs with a single
+    ``searchsorted`` over their cumulative lengths.
+
+    Parameters
+    ----------
+    assembly : str
+        The assembly, patch or accession, resolved case-insensitively (see
+        ``resolve``).
+    n : int
+        The number of positions.
+    roles : list[str], optional
+        The roles of the contigs to sample from (e.g. 'assembled').
+    units : list[str], optional
+        The units of the contigs to sample from.
+    provider : Optional[str]
+        The provider of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: 'ucsc'). Contigs without a name are left out.
+    seed : Optional[Union[int, numpy.random.Generator]]
+        The seed or generator of the random numbers.
+
+    Returns
+    -------
+    Tuple[pd.Categorical, np.ndarray]
+        The contig names, as a categorical over the selected contigs, and
+        the 0-based positions.
+
+    Raises
+    ------
+    ValueError
+        If the assembly is not found in the database, the provider is not
+        valid, or no contig is selected.
+
+    Examples
+    --------
+    >>> chroms, positions = AssemblyInfo.sample_positions(
+    ...     "hg38", 1_000_000, roles=["assembled"], seed=0
+    ... )
+    """
+    names, sizes = _sizes(cls, assembly, provider, roles, units)
+    with _phase("build"):
+        return _sample(names, sizes, n, np.random.default_rng(seed))
+
+
+def iter_sample_positions(
+    cls,
+    assembly: str,
+    n: int,
+    chunk_size: int = 1 << 20,
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+    provider: str | None = None,
+    seed: int | np.random.Generator | None = None,
+) -> Iterator[tuple[pd.Categorical, np.ndarray]]:
+    """
+    Samples genomic positions uniformly at random, in chunks.
+
+    The positions are those of ``sample_positions`` with the same seed,
+    yielded in chunks so that very large samples are not held in memory at
+    once.
+
+    Parameters
+    ----------
+    assembly : str
+        The assembly, patch or accession, resolved case-insensitively (see
+        ``resolve``).
+    n : int
+        The total number of positions.
+    chunk_size : int
+        The number of positions of each chunk (default: 1048576).
+    roles : list[str], optional
+        The roles of the contigs to sample from (e.g. 'assembled').
+    units : list[str], optional
+        The units of the contigs to sample from.
+    provider : Optional[str]
+        The provider of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: 'ucsc').
+    seed : Optional[Union[int, numpy.random.Generator]]
+        The seed or generator of the random numbers.
+
+    Yields
+    ------
+    Tuple[pd.Categorical, np.ndarray]
+        The contig names and 0-based positions of each chunk.
+
+    Raises
+    ------
+    ValueError
+        If the assembly is not found in the database, the provider is not
+        valid, or no contig is selected.
+
+    Examples
+    --------
+    >>> for chroms, positions in AssemblyInfo.iter_sample_positions(
+    ...     "hg38", 10**9, roles=["assembled"], seed=0
+    ... ):
+    ...     ...
+    """
+    names, sizes = _sizes(cls, assembly, provider, roles, units)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk_size):
+        yield _sample(names, sizes, min(chunk_size, n - start), rng)
+
+
+def sample_intervals(
+    cls,
+    assembly: str,
+    n: int,
+    length: int,
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+    provider: str | None = None,
+    seed: int | np.random.Generator | None = None,
+) -> pd.DataFrame:
+    """
+    Samples genomic intervals of a fixed length uniformly at random.
+
+    Every interval lying within a selected contig is equally likely, so
+    contigs are drawn in proportion to the number of intervals they hold,
+    and contigs shorter than the intervals are never drawn.
+
+    Parameters
+    ----------
+    assembly : str
+        The assembly, patch or accession, resolved case-insensitively (see
+        ``resolve``).
+    n : int
+        The number of intervals.
+    length : int
+        The length of the intervals.
+    roles : list[str], optional
+        The roles of the contigs to sample from (e.g. 'assembled').
+    units : list[str], optional
+        The units of the contigs to sample from.
+    provider : Optional[str]
+        The provider of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: 'ucsc').
+    seed : Optional[Union[int, numpy.random.Generator]]
+        The seed or generator of the random numbers.
+
+    Returns
+    -------
+    pd.DataFrame
+        The intervals, with 'chrom', 'start' and 'end' columns in BED
+        coordinates (0-based, half-open).
+
+    Raises
+    ------
+    ValueError
+        If the assembly is not found in the database, the provider is not
+        valid, or no selected contig holds an interval of that length.
+
+    Examples
+    --------
+    >>> AssemblyInfo.sample_intervals("hg38", 10_000, 1_000, roles=["assembled"])
+    """
+    if length < 1:
+        raise ValueError(f"ERROR: the interval length must be positive, not {length}!")
+    names, starts = _sizes(cls, assembly, provider, roles, units, length)
+    with _phase("build"):
+        chroms, positions = _sample(names, starts, n, np.random.default_rng(seed))
+        return pd.DataFrame(
+            {"chrom": chroms, "start": positions, "end": positions + length}
+        )
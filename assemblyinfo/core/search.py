@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["search"]
+
+# words, with their dotted, underscored or dashed compounds, e.g. accessions
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+(?:[._:-][0-9a-z]+)*")
+WORD_PATTERN = re.compile(r"[0-9a-z]+")
+# the columns identifying the matched patches
+SEARCH_COLUMNS = [
+    "assembly",
+    "assembly_ucsc",
+    "patch",
+    "species",
+    "genbank_accession",
+    "refseq_accession",
+]
+
+
+class _SearchLookup(NamedTuple):
+    """The search index as sorted tokens with offsets into their postings."""
+
+    tokens: list[str]
+    offsets: np.ndarray
+    fields: pd.Index
+    field_codes: np.ndarray
+    rows: np.ndarray
+
+
+def _tokens(text: str) -> set[str]:
+    """Returns the tokens of a text, with the words of its compounds."""
+    text = text.lower()
+    return set(TOKEN_PATTERN.findall(text)) | set(WORD_PATTERN.findall(text))
+
+
+def _search_entries(data: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """Returns the search index entries of database rows, unsorted."""
+    entries = [
+        (token, field, row)
+        for row, metadata in zip(rows, data["metadata"].iloc[rows])
+        for field, value in (metadata or {}).items()
+        if isinstance(value, str)
+        for token in _tokens(value)
+    ]
+    return pd.DataFrame(entries, columns=["token", "field", "row"]).astype(
+        {"token": object, "field": object, "row": np.int64}
+    )
+
+
+def _build_search_index(cls) -> pd.DataFrame:
+    entries = _search_entries(cls._data, np.arange(len(cls._data)))
+    return entries.sort_values(["token", "field", "row"], ignore_index=True)
+
+
+def _search_index(cls) -> pd.DataFrame:
+    """
+    Returns the tokens of the metadata strings, sorted, with their fields
+    and database rows.
+    """
+    return cls._cached("search_index", lambda: _build_search_index(cls))
+
+
+def _search_lookup(cls) -> _SearchLookup:
+    def build():
+        index = _search_index(cls)
+        tokens, starts = np.unique(index["token"].to_numpy(str), return_index=True)
+        field_codes, fields = pd.factorize(index["field"])
+        return _SearchLookup(
+            tokens=tokens.tolist(),
+            offsets=np.append(starts, len(index)),
+            fields=fields,
+            field_codes=field_codes,
+            rows=index["row"].to_numpy(),
+        )
+
+    return cls._cached("search_lookup", build)
+
+
+def _search_rows(
+    cls, text: str, fields: list[str] | None = None, prefix: bool = False
+) -> np.ndarray:
+    """Returns the database rows matching every token of a text, sorted."""
+    lookup = _search_lookup(cls)
+    codes = None
+    if fields is not None:
+        codes = lookup.fields.get_indexer(fields)
+        if (codes < 0).any():
+            unknown = [f for f, c in zip(fields, codes) if c < 0]
+            raise ValueError(
+                f"ERROR: {', '.join(unknown)} not a searchable field, expected "
+                f"one of: {', '.join(sorted(lookup.fields))}."
+            )
+
+    found = None
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        first = bisect_left(lookup.tokens, token)
+        if prefix:
+            last = bisect_left(lookup.tokens, token + "\U0010ffff")
+        else:
+            exact = first < len(lookup.tokens) and lookup.tokens[first] == token
+            last = first + exact
+        start, stop = lookup.offsets[first], lookup.offsets[last]
+        rows = lookup.rows[start:stop]
+        if codes is not None:
+            rows = rows[np.isin(lookup.field_codes[start:stop], codes)]
+        rows = np.unique(rows)
+        found = rows if found is None else np.intersect1d(found, rows)
+        if not len(found):
+            break
+
+    return np.empty(0, dtype=np.int64) if found is None else found
+
+
+def search(
+    cls, text: str, fields: list[str] | None = None, prefix: bool = False
+) -> pd.DataFrame:
+    """
+    Finds the patches whose metadata match a text.
+
+    The metadata strings of every patch (e.g. BioProject, BioSample,
+    submitter, taxid, description) are split into lowercase tokens, held
+    in an inverted index built on first call. Registered patches are added
+    to the index as they are registered. A patch matches when every token
+    of the text is found in one of the searched fields.
+
+    Parameters
+    ----------
+    text : str
+        The words to search, case-insensitively. Accessions such as
+        'GCA_000001405.29' are single tokens, and so are their parts.
+    fields : Optional[List[str]]
+        The metadata keys to search (default: every string key).
+    prefix : bool
+        Whether the tokens of the text also match the tokens they start
+        (default: False, exact tokens).
+
+    Returns
+    -------
+    pd.DataFrame
+        The matched patches (assembly, assembly_ucsc, patch, species and
+        accessions), in database order.
+
+    Raises
+    ------
+    ValueError
+        If a field is not a searchable metadata key.
+
+    Examples
+    --------
+    >>> AssemblyInfo.search("PRJNA31257", fields=["bioproject"])
+    >>> AssemblyInfo.search("genome reference consortium")
+    >>> AssemblyInfo.search("GCA_0000014", prefix=True)
+    """
+    rows = _search_rows(cls, text, fields, prefix)
+    return cls._data[SEARCH_COLUMNS].take(rows).reset_index(drop=True)
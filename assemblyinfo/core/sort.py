@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import _phase
+from .chrom import _provider_column
+from .contig import SEQUENCE_COLUMNS
+
+__all__ = ["get_chrom_ranks", "sort_intervals"]
+
+# canonical order of the contig roles; novel patches are alternate loci
+ROLE_CLASSES = {
+    "assembled": 0,
+    "unlocalized": 1,
+    "unplaced": 2,
+    "alt": 3,
+    "novel": 3,
+    "fix": 4,
+}
+# contigs with other roles follow the fixes, and non-nuclear ones come last
+OTHER_CLASS = 5
+NON_NUCLEAR_CLASS = 6
+
+
+def _canonical_ranks(seqinfo: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the canonical rank of each contig of a seqinfo.
+
+    Contigs are ordered by role class, then by the karyotype position of
+    the chromosome they belong to, then by their position in the assembly
+    report. The karyotype is the report order of the assembled nuclear
+    chromosomes.
+    """
+    roles = pd.Index(list(ROLE_CLASSES)).get_indexer(seqinfo["role"].astype(object))
+    classes = np.where(
+        roles >= 0, np.array(list(ROLE_CLASSES.values()))[roles], OTHER_CLASS
+    )
+    classes[seqinfo["unit"].eq("non-nuclear").fillna(False).to_numpy(bool)] = (
+        NON_NUCLEAR_CLASS
+    )
+
+    molecules = seqinfo["molecule"].astype(object)
+    karyotype = pd.Index(molecules[classes == 0].dropna().unique())
+    chromosomes = karyotype.get_indexer(molecules)
+    # contigs without a known chromosome follow the others of their class
+    chromosomes[chromosomes < 0] = len(karyotype)
+
+    order = np.lexsort((np.arange(len(seqinfo)), chromosomes, classes))
+    ranks = np.empty(len(seqinfo), dtype=np.int32)
+    ranks[order] = np.arange(len(seqinfo), dtype=np.int32)
+    return ranks
+
+
+def _rank_table(cls, row: int) -> pd.DataFrame:
+    """Returns the contig names of a patch for every provider, with ranks."""
+
+    def build():
+        seqinfo = cls._storage().contigs(row)
+        table = seqinfo[SEQUENCE_COLUMNS].reset_index(drop=True)
+        table["rank"] = _canonical_ranks(seqinfo)
+        return table.sort_values("rank", ignore_index=True)
+
+    return cls._cached(("chrom_ranks", row), build)
+
+
+def _rank_lookup(cls, row: int, provider: str | None) -> tuple[pd.Index, np.ndarray]:
+    """
+    Returns the contig names of a patch and their ranks, for lookups.
+
+    Without a provider, the names of every provider are looked up, the
+    first provider in ``SEQUENCE_COLUMNS`` winning on shared names.
+    """
+
+    def build():
+        table = _rank_table(cls, row)
+        columns = [_provider_column(provider)] if provider else SEQUENCE_COLUMNS
+        names = pd.concat([table[column] for column in columns], ignore_index=True)
+        ranks = np.tile(table["rank"].to_numpy(), len(columns))
+        keep = names.notna().to_numpy(bool) & ~names.duplicated().to_numpy(bool)
+        return pd.Index(names[keep].to_numpy(object)), ranks[keep]
+
+    return cls._cached(("chrom_rank_lookup", row, provider), build)
+
+
+def get_chrom_ranks(cls, assembly: str, provider: str | None = None) -> pd.Series:
+    """
+    Returns the canonical rank of each contig of an assembly.
+
+    The canonical order lists the assembled chromosomes in karyotype order,
+    then the unlocalized, unplaced, alternate and fix contigs, each group
+    ordered by chromosome, and the mitochondrial genome last. Ranks are
+    computed once per patch and shared by every provider.
+
+    Parameters
+    ----------
+    assembly : str
+        The assembly, patch or accession, resolved case-insensitively (see
+        ``resolve``).
+    provider : Optional[str]
+        The provider of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: 'ucsc').
+
+    Returns
+    -------
+    pd.Series
+        The integer ranks, indexed by contig name and sorted by rank.
+        Contigs without a name for the provider are left out.
+
+    Raises
+    ------
+    ValueError
+        If the assembly is not found in the database or the provider is not
+        valid.
+
+    Examples
+    --------
+    >>> AssemblyInfo.get_chrom_ranks("hg38")
+    >>> AssemblyInfo.get_chrom_ranks("hg38", provider="refseq")
+    """
+    colname = _provider_column(provider)
+
+    with _phase("lookup"):
+        row = cls._storage().lookup(assembly)
+
+    with _phase("build"):
+        table = _rank_table(cls, row)
+        table = table[table[colname].notna()]
+        return pd.Series(
+            table["rank"].to_numpy(),
+            index=pd.Index(table[colname], name=colname),
+            name="rank",
+        )
+
+
+def sort_intervals(
+    cls,
+    df: pd.DataFrame,
+    assembly: str,
+    chrom: str = "chrom",
+    start: str = "start",
+    end: str | None = "end",
+    provider: str | None = None,
+) -> pd.DataFrame:
+    """
+    Sorts intervals in the canonical contig order of an assembly.
+
+    Contig names are factorized once and mapped to their canonical rank
+    (see ``get_chrom_ranks``), and the rows are sorted with a single
+    ``numpy.lexsort`` over the integer ranks and positions, so that no
+    strings are compared. Contigs not in the assembly follow the others,
+    in lexicographic order, and missing contig names come last.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The intervals to sort.
+    assembly : str
+        The assembly, patch or accession, resolved case-insensitively (see
+        ``resolve``).
+    chrom : str
+        The column holding the contig names (default: 'chrom').
+    start : str
+        The column holding the start positions (default: 'start').
+    end : Optional[str]
+        The column holding the end positions, used to break ties when it is
+        in ``df`` (default: 'end').
+    provider : Optional[str]
+        The provider of the contig names ('ucsc', 'genbank', 'refseq',
+        'ncbi', default: any of them).
+
+    Returns
+    -------
+    pd.DataFrame
+        The sorted intervals, with their original index.
+
+    Raises
+    ------
+    ValueError
+        If the assembly is not found in the database or the provider is not
+        valid.
+
+    Examples
+    --------
+    >>> AssemblyInfo.sort_intervals(bed, "hg38")
+    >>> AssemblyInfo.sort_intervals(vcf, "GRCh38.p14", chrom="CHROM", start="POS")
+    """
+    if provider:
+        _provider_column(provider)
+
+    with _phase("lookup"):
+        row = cls._storage().lookup(assembly)
+
+    with _phase("build"):
+        names, ranks = _rank_lookup(cls, row, provider)
+
+        codes, uniques = pd.factorize(df[chrom])
+        uniques = np.asarray(uniques, dtype=object)
+        positions = names.get_indexer(uniques)
+        unique_ranks = np.where(positions >= 0, ranks[positions], len(names))
+        unknown = np.flatnonzero(positions < 0)
+        unique_ranks[unknown] += np.argsort(np.argsort(uniques[unknown]))
+        # missing names (code -1) take the last slot
+        unique_ranks = np.append(unique_ranks, len(names) + len(uniques))
+
+        keys = [df[start].to_numpy(), unique_ranks[codes]]
+        if end is not None and end in df.columns:
+            keys.insert(0, df[end].to_numpy())
+        order = np.lexsort(keys)
+
+    return df.take(order)
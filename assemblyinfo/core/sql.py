@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..dtypes import to_pandas
+from .chrom import _arrow_contigs, _output
+from .info import _arrow_db
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover
+    duckdb = None
+
+__all__ = ["sql"]
+
+PATCH_COLUMNS = [
+    "assembly",
+    "assembly_ucsc",
+    "patch",
+    "species",
+    "common_name",
+    "genbank_accession",
+    "refseq_accession",
+]
+
+# views over the tables loaded into the engine, named as in the docstring
+VIEWS = {
+    "patches": "SELECT * FROM _patches",
+    "assemblies": """
+        SELECT
+            assembly,
+            any_value(assembly_ucsc) AS assembly_ucsc,
+            any_value(species) AS species,
+            any_value(common_name) AS common_name,
+            arg_max(patch, (latest, patch_id)) AS latest_patch,
+            max(date) FILTER (WHERE latest) AS date,
+            count(*) AS n_patches
+        FROM _patches
+        GROUP BY assembly
+    """,
+    "contigs": """
+        SELECT
+            p.patch_id, p.assembly, p.assembly_ucsc, p.patch, p.species,
+            pc.position, c.* EXCLUDE (contig_id)
+        FROM _patch_contigs pc
+        JOIN _patches p USING (patch_id)
+        JOIN _contigs c USING (contig_id)
+    """,
+    "metadata": """
+        SELECT m.patch_id, p.assembly, p.patch, m.key, m.value, m.number
+        FROM _metadata m
+        JOIN _patches p USING (patch_id)
+    """,
+}
+
+
+def _patch_table(cls) -> pa.Table:
+    db = _arrow_db(cls)
+    dates = pc.struct_field(db["metadata"], "date")
+    return pa.table(
+        {
+            "patch_id": pa.array(np.arange(db.num_rows, dtype=np.int32)),
+            **{column: db[column] for column in PATCH_COLUMNS},
+            "latest": pc.fill_null(pc.equal(db["version"], "latest"), False),
+            "date": pc.strptime(
+                dates, format="%Y-%m-%d", unit="s", error_is_null=True
+            ).cast(pa.date32()),
+            "n_contigs": pa.array(cls._data["contigs"].map(len).to_numpy(np.int32)),
+        }
+    )
+
+
+def _metadata_table(cls) -> pa.Table:
+    """Returns the metadata of every patch as one row per non-null key."""
+    metadata = _arrow_db(cls)["metadata"].combine_chunks()
+    patch_ids = pa.array(np.arange(len(metadata), dtype=np.int32))
+
+    tables = []
+    for field in metadata.type:
+        values = metadata.field(field.name)
+        valid = pc.is_valid(values)
+        numeric = pa.types.is_floating(field.type) or pa.types.is_integer(field.type)
+        tables.append(
+            pa.table(
+                {
+                    "patch_id": patch_ids.filter(valid),
+                    "key": pa.array([field.name] * len(metadata)).filter(valid),
+                    "value": values.cast(pa.string()).filter(valid),
+                    "number": (
+                        values.cast(pa.float64())
+                        if numeric
+                        else pa.nulls(len(metadata), pa.float64())
+                    ).filter(valid),
+                }
+            )
+        )
+    return pa.concat_tables(tables)
+
+
+def _contig_tables(cls) -> tuple[pa.Table, pa.Table]:
+    """Returns the distinct contigs, and the contigs of each patch."""
+    contigs = _arrow_contigs(cls)
+    contigs = contigs.set_column(
+        contigs.schema.get_field_index("length"),
+        "length",
+        contigs["length"].cast(pa.int64()),
+    ).add_column(0, "contig_id", pa.array(np.arange(contigs.num_rows, dtype=np.int32)))
+
+    sizes = cls._data["contigs"].map(len).to_numpy()
+    offsets = np.cumsum(sizes) - sizes
+    patch_contigs = pa.table(
+        {
+            "patch_id": np.repeat(np.arange(len(sizes), dtype=np.int32), sizes),
+            "position": (np.arange(sizes.sum()) - np.repeat(offsets, sizes)).astype(
+                np.int32
+            ),
+            "contig_id": np.concatenate(cls._data["contigs"].tolist()),
+        }
+    )
+    return contigs, patch_contigs
+
+
+def _build_connection(cls):
+    contigs, patch_contigs = _contig_tables(cls)
+    tables = {
+        "_patches": _patch_table(cls),
+        "_metadata": _metadata_table(cls),
+        "_contigs": contigs,
+        "_patch_contigs": patch_contigs,
+    }
+
+    connection = duckdb.connect(":memory:")
+    # copied into the engine's own columnar storage, so that every cursor
+    # sees them and filters skip row groups by their min/max statistics
+    for name, table in tables.items():
+        connection.register("_arrow", table)
+        connection.execute(f"CREATE TABLE {name} AS SELECT * FROM _arrow")
+        connection.unregister("_arrow")
+    for name, query in VIEWS.items():
+        connection.execute(f"CREATE VIEW {name} AS {query}")
+    return connection
+
+
+def _connection(cls):
+    """Returns the engine holding the views, built once per process."""
+    if duckdb is None:
+        raise ImportError(
+            "ERROR: AssemblyInfo.sql requires duckdb, "
+            "install it with `pip install assemblyinfo[sql]`!"
+        )
+    return cls._cached(("sql_connection", os.getpid()), lambda: _build_connection(cls))
+
+
+def sql(
+    cls,
+    query: str,
+    params: Sequence[Any] | dict[str, Any] | None = None,
+    output: str | None = None,
+) -> pd.DataFrame | pa.Table:
+    """
+    Runs a SQL query over flattened views of the database.
+
+    Queries run on an in-process columnar engine (DuckDB), which only scans
+    the columns a query uses and pushes its filters down to the scans, so
+    that queries across every assembly do not loop over seqinfo in Python.
+    The available views are:
+
+    - 'assemblies': one row per assembly, with its 'latest_patch', the
+      'date' of that patch and its number of patches ('n_patches').
+    - 'patches': one row per patch, with its 'patch_id', accessions,
+      'latest' flag, release 'date' and number of contigs ('n_contigs').
+    - 'contigs': one row per contig of every patch, with the patch columns
+      and the seqinfo columns.
+    - 'metadata': one row per metadata key of every patch, with the
+      'value' as a string and, for numeric keys, as a 'number'.
+
+    Parameters
+    ----------
+    query : str
+        The SQL query.
+    params : Union[List[Any], Dict[str, Any]], optional
+        The values of the query placeholders ('?' or '$name').
+    output : Optional[str]
+        'pandas' or 'arrow', to return a ``pyarrow.Table`` (default: set by
+        ``AssemblyInfo.set_output``).
+
+    Returns
+    -------
+    Union[pd.DataFrame, pyarrow.Table]
+        The query result.
+
+    Raises
+    ------
+    ImportError
+        If duckdb is not installed.
+    ValueError
+        If the output is not valid.
+
+    Examples
+    --------
+    >>> AssemblyInfo.sql(
+    ...     "SELECT assembly, name, length FROM contigs "
+    ...     "WHERE role = 'assembled' AND length > 100e6 AND patch IN "
+    ...     "(SELECT latest_patch FROM assemblies)"
+    ... )
+    >>> AssemblyInfo.sql(
+    ...     "SELECT * FROM assemblies WHERE date >= current_date - INTERVAL 1 YEAR"
+    ... )
+    """
+    output = _output(cls, output)
+    cursor = _connection(cls).cursor()
+    try:
+        table = cursor.execute(query, params).arrow()
+        # recent duckdb versions stream the result as record batches
+        if isinstance(table, pa.RecordBatchReader):
+            table = table.read_all()
+    finally:
+        cursor.close()
+
+    return table if output == "arrow" else to_pandas(table)
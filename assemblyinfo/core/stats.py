@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from ..instrumentation import _phase
+from .chrom import _seqinfo_table
+
+__all__ = ["compute_stats"]
+
+# the Nx statistics, as percentages of the total length
+NX_LEVELS = [50, 90]
+# the columns identifying each patch
+PATCH_COLUMNS = ["assembly", "assembly_ucsc", "patch", "species"]
+
+
+def _nx(
+    lengths: np.ndarray, starts: np.ndarray, totals: np.ndarray, level: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the Nx and Lx of groups of lengths sorted in descending order.
+
+    The cumulative sum of every group is a slice of a single cumulative sum,
+    so the first contig reaching x% of each group total is found with a
+    single ``searchsorted``, in integer arithmetic.
+    """
+    cumsum = np.cumsum(lengths)
+    before = cumsum[starts] - lengths[starts]
+    targets = before + (totals * level + 99) // 100
+    positions = np.maximum(cumsum.searchsorted(targets), starts)
+    return lengths[positions], positions - starts + 1
+
+
+def compute_stats(
+    cls,
+    assemblies: list[str] | None = None,
+    roles: list[str] | None = None,
+    units: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Computes the quality statistics of assemblies from their contig lengths.
+
+    The statistics of every patch are computed together from the seqinfo
+    table: contigs are sorted once by patch and decreasing length, and the
+    N50 and N90 of every patch are found in the cumulative lengths with a
+    single ``searchsorted``.
+
+    Parameters
+    ----------
+    assemblies : Optional[List[str]]
+        The assemblies, patches or accessions, resolved case-insensitively
+        (see ``resolve``, default: every patch).
+    roles : list[str], optional
+        The roles of the contigs to include (e.g. 'assembled', 'unplaced').
+    units : list[str], optional
+        The units of the contigs to include.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per patch, with its names, the number of contigs, the total,
+        ungapped and assembled lengths, the N50, L50, N90 and L90, and the
+        number of contigs of each role. The ungapped length is missing when
+        the assembly stats of some contigs are. The Nx and Lx are missing
+        for patches without contigs.
+
+    Raises
+    ------
+    ValueError
+        If an assembly is not found in the database.
+
+    Examples
+    --------
+    >>> AssemblyInfo.compute_stats()
+    >>> AssemblyInfo.compute_stats(["hg38", "mm39"], roles=["assembled"])
+    """
+    with _phase("lookup"):
+        if assemblies is None:
+            rows = np.arange(len(cls._data))
+        else:
+            storage = cls._storage()
+            rows = np.array([storage.lookup(a) for a in assemblies], dtype=np.int64)
+
+    with _phase("build"):
+        table = _seqinfo_table(cls)
+        keep = table["row"].isin(rows).to_numpy(bool)
+        if roles:
+            keep &= table["role"].isin(roles).to_numpy(bool)
+        if units:
+            keep &= table["unit"].isin(units).to_numpy(bool)
+
+        contig_rows = table["row"].to_numpy()[keep]
+        lengths = table["length"].to_numpy(np.int64, na_value=0)[keep]
+        ungapped = table["all-ungapped-length"].to_numpy(np.float64, na_value=np.nan)
+        ungapped = ungapped[keep]
+        role_codes = table["role"].cat.codes.to_numpy()[keep]
+        role_names = table["role"].cat.categories
+
+        order = np.lexsort((-lengths, contig_rows))
+        contig_rows, lengths = contig_rows[order], lengths[order]
+        ungapped, role_codes = ungapped[order], role_codes[order]
+
+        groups, starts, sizes = np.unique(
+            contig_rows, return_index=True, return_counts=True
+        )
+        group_ids = np.repeat(np.arange(len(groups)), sizes)
+        totals = np.add.reduceat(lengths, starts) if len(groups) else lengths[:0]
+
+        stats = pd.DataFrame(index=pd.Index(groups, name="row"))
+        stats["contig_count"] = sizes
+        stats["total_length"] = totals
+        missing = np.bincount(group_ids, np.isnan(ungapped), len(groups)) > 0
+        stats["ungapped_length"] = pd.array(
+            np.bincount(group_ids, np.nan_to_num(ungapped), len(groups)),
+            dtype="Int64",
+        )
+        stats.loc[missing, "ungapped_length"] = pd.NA
+        assembled = role_codes == role_names.get_loc("assembled")
+        stats["assembled_length"] = np.bincount(
+            group_ids, np.where(assembled, lengths, 0), len(groups)
+        ).astype(np.int64)
+        for level in NX_LEVELS:
+            nx, lx = _nx(lengths, starts, totals, level)
+            stats[f"N{level}"], stats[f"L{level}"] = nx, lx
+
+        # contigs without a role are left out of the role counts
+        known = role_codes >= 0
+        counts = np.bincount(
+            group_ids[known] * len(role_names) + role_codes[known],
+            minlength=len(groups) * len(role_names),
+        ).reshape(len(groups), len(role_names))
+        for i, role in enumerate(role_names):
+            stats[f"{role}_count"] = counts[:, i]
+
+        stats = stats.reindex(rows)
+        counted = ["contig_count", "total_length", "assembled_length"]
+        counted += [f"{role}_count" for role in role_names]
+        stats[counted] = stats[counted].fillna(0).astype(np.int64)
+        nx = [f"{x}{level}" for level in NX_LEVELS for x in "NL"]
+        stats[nx] = stats[nx].astype("Int64")
+
+        names = cls._data[PATCH_COLUMNS].take(rows).reset_index(drop=True)
+        return pd.concat([names, stats.reset_index(drop=True)], axis=1)
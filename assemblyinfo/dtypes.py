@@ -0,0 +1,120 @@
+"""
+Compact dtypes for the loaded database and the tables derived from it.
+
+Strings are held in Arrow-backed ``string[pyarrow]`` columns instead of
+Python objects, and low-cardinality columns are stored as categoricals.
+Functions taking an ``output`` argument can also skip pandas and return
+Arrow tables sliced from the data files.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+
+__all__ = [
+    "CATEGORICAL_COLUMNS",
+    "OUTPUTS",
+    "STRING_DTYPE",
+    "check_output",
+    "compact",
+    "extend_table",
+    "seqinfo_dtype",
+    "to_pandas",
+    "type_arrow_seqinfo",
+    "type_seqinfo",
+]
+
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+# columns with few distinct values, in the database or the seqinfo tables
+CATEGORICAL_COLUMNS = ["species", "common_name", "version", "molecule", "role", "unit"]
+
+# numeric seqinfo columns holding fractions, the others being lengths and counts
+FRACTION_SUFFIXES = ("gc-perc",)
+
+# result types of the functions taking an ``output`` argument
+OUTPUTS = ["pandas", "arrow"]
+
+_TYPES = {pa.string(): STRING_DTYPE, pa.large_string(): STRING_DTYPE}
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Converts an Arrow table without materializing its strings."""
+    return compact(table.combine_chunks().to_pandas(types_mapper=_TYPES.get))
+
+
+def _is_string(values: pd.Series) -> bool:
+    if values.dtype == STRING_DTYPE:
+        return False
+    if values.dtype != object and not isinstance(values.dtype, pd.StringDtype):
+        return False
+    return pd.api.types.infer_dtype(values) == "string"
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts string columns to Arrow-backed strings, in place.
+
+    Columns listed in ``CATEGORICAL_COLUMNS`` become categoricals, without
+    the categories that are unused in ``df``.
+    """
+    for column, dtype in df.dtypes.items():
+        if column in CATEGORICAL_COLUMNS:
+            if isinstance(dtype, pd.CategoricalDtype):
+                df[column] = df[column].cat.remove_unused_categories()
+            else:
+                df[column] = df[column].astype("category")
+        elif _is_string(df[column]):
+            df[column] = df[column].astype(STRING_DTYPE)
+    return df
+
+
+def extend_table(table: pa.Table, df: pd.DataFrame) -> pa.Table:
+    """Appends the rows of a DataFrame to an Arrow table, cast to its schema."""
+    if len(df) == 0:
+        return table
+    rows = pa.Table.from_pandas(df, schema=table.schema, preserve_index=False)
+    return pa.concat_tables([table, rows]).combine_chunks()
+
+
+def seqinfo_dtype(column: str) -> pd.api.extensions.ExtensionDtype:
+    """Returns the nullable dtype of a numeric seqinfo column."""
+    if column.endswith(FRACTION_SUFFIXES):
+        return pd.Float64Dtype()
+    return pd.Int64Dtype()
+
+
+def _is_numeric(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+        dtype
+    )
+
+
+def type_seqinfo(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts the numeric columns of a seqinfo to nullable integers, or floats
+    for fractions, so that every seqinfo has the same dtypes.
+    """
+    return df.astype(
+        {c: seqinfo_dtype(c) for c, dtype in df.dtypes.items() if _is_numeric(dtype)}
+    )
+
+
+def type_arrow_seqinfo(table: pa.Table) -> pa.Table:
+    """Casts the numeric columns of an Arrow seqinfo like ``type_seqinfo``."""
+    types = {pd.Int64Dtype(): pa.int64(), pd.Float64Dtype(): pa.float64()}
+    fields = [
+        field.with_type(types[seqinfo_dtype(field.name)])
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+        else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields))
+
+
+def check_output(output: str) -> str:
+    """Validates an ``output`` argument."""
+    if output not in OUTPUTS:
+        raise ValueError(f"ERROR: output must be one of {', '.join(OUTPUTS)}!")
+    return output
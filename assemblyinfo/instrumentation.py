@@ -0,0 +1,232 @@
+"""
+Opt-in instrumentation of AssemblyInfo queries.
+
+When enabled, every public AssemblyInfo method is wrapped to count calls
+and record their latency in a histogram, the time spent in the internal
+query phases (loading, lookup, filtering and DataFrame building) is
+accumulated, and the hit rate of the memoized tables is tracked.
+
+When disabled, the original methods are restored and phase timers reduce
+to a shared no-op context manager, so the overhead is negligible.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "add_hook",
+    "disable",
+    "enable",
+    "get_stats",
+    "is_enabled",
+    "remove_hook",
+    "reset",
+]
+
+# upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = [10.0**e for e in np.arange(-6, 1.5, 0.5)] + [np.inf]
+
+_enabled = False
+_lock = threading.Lock()
+_hooks: list[Callable[[str, str, float], Any]] = []
+# hooks added by ``enable``, removed by ``disable``
+_enable_hooks: list[Callable[[str, str, float], Any]] = []
+_originals: dict[str, Callable] = {}
+_noop = nullcontext()
+
+
+class _QueryStats:
+    def __init__(self):
+        self.calls = defaultdict(lambda: np.zeros(len(LATENCY_BUCKETS), np.int64))
+        self.totals = defaultdict(float)
+        self.maxima = defaultdict(float)
+        self.phases = defaultdict(lambda: [0, 0.0])
+        self.cache = defaultdict(lambda: [0, 0])
+
+
+_stats = _QueryStats()
+
+
+def _emit(event: str, name: str, value: float) -> None:
+    for hook in _hooks:
+        hook(event, name, value)
+
+
+def _record_call(name: str, elapsed: float) -> None:
+    bucket = np.searchsorted(LATENCY_BUCKETS, elapsed)
+    with _lock:
+        _stats.calls[name][bucket] += 1
+        _stats.totals[name] += elapsed
+        _stats.maxima[name] = max(_stats.maxima[name], elapsed)
+    _emit("call", name, elapsed)
+
+
+def _record_cache(key: Any, hit: bool) -> None:
+    """Records a lookup of a memoized table, if instrumentation is enabled."""
+    if not _enabled:
+        return
+    with _lock:
+        _stats.cache[str(key)][0 if hit else 1] += 1
+    _emit("cache_hit" if hit else "cache_miss", str(key), 1.0)
+
+
+@contextmanager
+def _timed_phase(name: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        with _lock:
+            _stats.phases[name][0] += 1
+            _stats.phases[name][1] += elapsed
+        _emit("phase", name, elapsed)
+
+
+def _phase(name: str):
+    """Returns a context manager timing a query phase, if enabled."""
+    return _timed_phase(name) if _enabled else _noop
+
+
+def _timed(name: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record_call(name, perf_counter() - start)
+
+    return wrapper
+
+
+def enable(klass: type, hooks: list[Callable[[str, str, float], Any]] | None = None):
+    """
+    Starts recording query statistics.
+
+    Parameters
+    ----------
+    klass : type
+        The class whose public methods are instrumented.
+    hooks : List[Callable], optional
+        Callables receiving ``(event, name, value)`` for every recorded
+        call, phase or cache lookup, e.g. to forward them to a metrics
+        system. They are removed by :func:`disable`.
+    """
+    global _enabled
+
+    for hook in hooks or []:
+        if hook not in _hooks:
+            add_hook(hook)
+            _enable_hooks.append(hook)
+
+    with _lock:
+        for name, func in list(vars(klass).items()):
+            if name.startswith("_") or not inspect.isfunction(func):
+                continue
+            if name not in _originals:
+                _originals[name] = func
+                setattr(klass, name, _timed(name, func))
+        _enabled = True
+
+
+def disable(klass: type) -> None:
+    """
+    Stops recording query statistics, restores the original methods and
+    removes the hooks passed to :func:`enable`.
+    """
+    global _enabled
+
+    with _lock:
+        _enabled = False
+        for name, func in _originals.items():
+            setattr(klass, name, func)
+        _originals.clear()
+
+    for hook in _enable_hooks:
+        remove_hook(hook)
+    _enable_hooks.clear()
+
+
+def is_enabled() -> bool:
+    """Returns whether query statistics are being recorded."""
+    return _enabled
+
+
+def add_hook(hook: Callable[[str, str, float], Any]) -> None:
+    """Registers a callable receiving ``(event, name, value)`` records."""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[str, str, float], Any]) -> None:
+    """Unregisters a hook added with :func:`add_hook`."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def get_stats() -> dict[str, pd.DataFrame]:
+    """
+    Returns the query statistics recorded so far.
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        - 'calls': call count, total, mean and max latency per method.
+        - 'latency': latency histogram per method, with one column per
+          bucket labelled by its upper bound in seconds.
+        - 'phases': call count, total and mean time per query phase.
+        - 'cache': hits, misses and hit rate per memoized table.
+    """
+    with _lock:
+        names = sorted(_stats.calls)
+        histograms = [_stats.calls[name].copy() for name in names]
+        totals = [_stats.totals[name] for name in names]
+        maxima = [_stats.maxima[name] for name in names]
+        phases = {name: list(value) for name, value in _stats.phases.items()}
+        cache = {name: list(value) for name, value in _stats.cache.items()}
+
+    counts = [int(h.sum()) for h in histograms]
+    calls = pd.DataFrame(
+        {"calls": counts, "total": totals, "max": maxima},
+        index=pd.Index(names, name="function"),
+    )
+    calls.insert(2, "mean", calls["total"] / calls["calls"])
+
+    histograms = np.array(histograms, dtype=np.int64)
+    latency = pd.DataFrame(
+        histograms.reshape(len(names), len(LATENCY_BUCKETS)),
+        index=pd.Index(names, name="function"),
+        columns=LATENCY_BUCKETS,
+    )
+
+    phase_df = pd.DataFrame.from_dict(
+        phases, orient="index", columns=["calls", "total"]
+    ).rename_axis("phase")
+    phase_df["mean"] = phase_df["total"] / phase_df["calls"]
+
+    cache_df = pd.DataFrame.from_dict(
+        cache, orient="index", columns=["hits", "misses"]
+    ).rename_axis("table")
+    cache_df["hit_rate"] = cache_df["hits"] / (cache_df["hits"] + cache_df["misses"])
+
+    return {"calls": calls, "latency": latency, "phases": phase_df, "cache": cache_df}
+
+
+def reset() -> None:
+    """Clears the query statistics recorded so far."""
+    global _stats
+
+    with _lock:
+        _stats = _QueryStats()
@@ -1,27 +1,297 @@
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Any, Callable, ClassVar, Hashable
 
+import pandas as pd
+import pyarrow as pa
 import pyarrow.parquet as pq
 
+from . import instrumentation
+from .core.registry import _merge_overlay, _overlay_path, _read_overlay
+from .dtypes import check_output, to_pandas, type_seqinfo
+from .instrumentation import _phase, _record_cache
+from .storage import ParquetStorage, SQLiteStorage, Storage
+
 __all__ = ["AssemblyInfo"]
 
 
 class AssemblyInfo:
-    _instance = None
+    """
+    Singleton handle on the assembly database.
+
+    The database is loaded once per process, the first time the class is
+    instantiated, and shared by every caller afterwards. Loading is guarded
+    by double-checked locking, so concurrent first calls from several
+    threads still read the parquet file exactly once.
+
+    Contigs shared by several patches are stored once, in a table of
+    distinct contigs, and each patch holds the positions of its contigs in
+    that table. Strings are loaded as Arrow-backed columns and
+    low-cardinality columns as categoricals. With the Arrow output (see
+    :meth:`set_output`), results are sliced from Arrow tables read from the
+    same files instead.
+
+    Assemblies registered with ``register_assembly`` are kept in a user
+    overlay file, appended to the tables when they are loaded. The overlay
+    is located when connecting, from the ``ASSEMBLYINFO_OVERLAY``
+    environment variable, which is left empty to disable it, or at
+    '~/.assemblyinfo/overlay.parquet'.
+
+    Seqinfo queries go through a storage backend. With a SQLite backend
+    (see :meth:`set_storage`) they read the SQLite file, and the parquet
+    files are only loaded once a function needs the in-memory tables.
+
+    Processes forked after the database is loaded inherit the instance and
+    share its memory copy-on-write. Call :meth:`preload` before forking
+    worker processes so that derived tables are shared as well, instead of
+    being rebuilt in every worker.
+    """
+
+    _instance: ClassVar[AssemblyInfo | None] = None
+    _lock: ClassVar[threading.RLock] = threading.RLock()
+    _warmup: ClassVar[list[Callable[[AssemblyInfo], Any]]] = []
+    _output: ClassVar[str] = "pandas"
+    _storage_backend: ClassVar[Storage | None] = None
+    # the number of per-query tables kept by ``_cached_query``
+    _query_cache_size: ClassVar[int] = 256
     _db_path = Path(__file__).parent / "data" / "db.parquet"
+    _contigs_path = Path(__file__).parent / "data" / "contigs.parquet"
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._load_db()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._load_db()
+                    cls._instance = instance
         return cls._instance
 
     def _load_db(self) -> None:
         """Private method to connect to the database."""
-        self._data = pq.read_table(self._db_path).to_pandas()
+        self._cache = {}
+        self._query_cache = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self._overlay_path = _overlay_path()
+        if self._storage_backend is None:
+            self._load_tables()
+
+    def _load_tables(self) -> None:
+        with _phase("load"):
+            self._data = to_pandas(pq.read_table(self._db_path))
+            # the seqinfo dtypes are set once, not on every query
+            self._contigs = type_seqinfo(to_pandas(pq.read_table(self._contigs_path)))
+            if self._overlay_path is not None and self._overlay_path.is_file():
+                _merge_overlay(self, _read_overlay(self._overlay_path))
+
+    def __getattr__(self, name: str) -> Any:
+        # with a storage backend, the tables are only loaded when first used
+        if name not in ["_data", "_contigs"] or "_cache_lock" not in vars(self):
+            raise AttributeError(name)
+        with self._cache_lock:
+            if name not in vars(self):
+                self._load_tables()
+        return vars(self)[name]
+
+    def _storage(self) -> Storage:
+        """Private method returning the backend queried by core functions."""
+        if self._storage_backend is not None:
+            return self._storage_backend
+        return self._cached("parquet_storage", lambda: ParquetStorage(self))
+
+    def _cached(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Private method to memoize tables derived from the database."""
+        try:
+            value = self._cache[key]
+            _record_cache(key, hit=True)
+            return value
+        except KeyError:
+            pass
+
+        with self._cache_lock:
+            if key not in self._cache:
+                _record_cache(key, hit=False)
+                self._cache[key] = factory()
+            else:
+                _record_cache(key, hit=True)
+            return self._cache[key]
+
+    def _cached_query(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Private method to memoize tables derived for a query, such as the
+        filtered seqinfo of a patch. Keys combine the resolved database row
+        with the query filters, and only the most recently used
+        ``_query_cache_size`` tables are kept.
+        """
+        with self._cache_lock:
+            if key in self._query_cache:
+                _record_cache(key[0], hit=True)
+                self._query_cache.move_to_end(key)
+                return self._query_cache[key]
+
+            _record_cache(key[0], hit=False)
+            value = self._query_cache[key] = factory()
+            while len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+            return value
+
+    @classmethod
+    def _reset_locks(cls) -> None:
+        """Private method to replace locks possibly held at fork time."""
+        cls._lock = threading.RLock()
+        if cls._instance is not None:
+            cls._instance._cache_lock = threading.RLock()
 
     @classmethod
     def connect(cls):
         """Returns the singleton instance of AssemblyInfo."""
         return cls()
+
+    @classmethod
+    def preload(cls):
+        """
+        Loads the database and builds its derived tables ahead of time.
+
+        Meant to be called in a parent process before forking workers, so
+        that all of them share the same loaded data.
+        """
+        instance = cls.connect()
+        for warmup in cls._warmup:
+            warmup(instance)
+        return instance
+
+    @classmethod
+    def set_output(cls, output: str = "pandas") -> None:
+        """
+        Sets the default result type of the functions taking ``output``.
+
+        Parameters
+        ----------
+        output : str
+            'pandas' (default) or 'arrow', to return ``pyarrow.Table``
+            slices of the data without building pandas objects.
+
+        Examples
+        --------
+        >>> AssemblyInfo.set_output("arrow")
+        >>> AssemblyInfo.connect().get_chromsizes("hg38")
+        pyarrow.Table
+        """
+        cls._output = check_output(output)
+
+    @classmethod
+    def set_storage(cls, storage: Storage | str | Path | None = None) -> None:
+        """
+        Sets the storage backend queried for seqinfo.
+
+        Parameters
+        ----------
+        storage : Union[Storage, str, Path], optional
+            A backend, or the path of a SQLite file written by
+            ``export_sqlite``. None (default) queries the parquet files
+            loaded in memory.
+
+        Examples
+        --------
+        >>> from assemblyinfo.storage import export_sqlite
+        >>> export_sqlite("db.sqlite")
+        >>> AssemblyInfo.set_storage("db.sqlite")
+        >>> AssemblyInfo.connect().get_chromsizes("hg38", length="> 1000000")
+        """
+        if isinstance(storage, (str, Path)):
+            storage = SQLiteStorage(storage)
+        if cls._storage_backend is not None:
+            cls._storage_backend.close()
+        cls._storage_backend = storage
+
+    @classmethod
+    def enable_instrumentation(cls, hooks=None) -> None:
+        """
+        Starts recording call counts, latencies and cache hit rates.
+
+        Parameters
+        ----------
+        hooks : List[Callable], optional
+            Callables receiving ``(event, name, value)`` for every record,
+            e.g. to forward them to a metrics system.
+
+        Examples
+        --------
+        >>> AssemblyInfo.enable_instrumentation()
+        >>> AssemblyInfo.connect().get_chromsizes("hg38")
+        >>> AssemblyInfo.stats()["calls"]
+        """
+        instrumentation.enable(cls, hooks=hooks)
+
+    @classmethod
+    def disable_instrumentation(cls) -> None:
+        """Stops recording query statistics."""
+        instrumentation.disable(cls)
+
+    @classmethod
+    def stats(cls, reset: bool = False):
+        """
+        Returns the query statistics recorded while instrumentation was on.
+
+        Parameters
+        ----------
+        reset : bool
+            Whether to clear the statistics after returning them.
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            Per-method 'calls' and 'latency' histograms, per-phase timings
+            ('phases') and memoized table hit rates ('cache').
+        """
+        stats = instrumentation.get_stats()
+        if reset:
+            instrumentation.reset()
+        return stats
+
+    @classmethod
+    def memory_usage(cls) -> pd.DataFrame:
+        """
+        Returns the memory footprint of the loaded tables, by column.
+
+        Returns
+        -------
+        pd.DataFrame
+            The dtype and size in bytes of every column of the database
+            ('db'), of the distinct contigs ('contigs') and of the memoized
+            DataFrames and Arrow tables, indexed by table and column. Sizes of nested
+            objects, such as the metadata dicts, are shallow.
+
+        Examples
+        --------
+        >>> AssemblyInfo.memory_usage().groupby("table")["bytes"].sum()
+        """
+        instance = cls.connect()
+        tables = {"db": instance._data, "contigs": instance._contigs}
+        for key, value in list(instance._cache.items()):
+            if isinstance(value, (pd.DataFrame, pa.Table)):
+                tables[str(key)] = value
+
+        usage = []
+        for name, table in tables.items():
+            if isinstance(table, pa.Table):
+                columns = {
+                    "column": table.column_names,
+                    "dtype": [str(column.type) for column in table.columns],
+                    "bytes": [column.nbytes for column in table.columns],
+                }
+            else:
+                columns = {
+                    "column": table.columns,
+                    "dtype": table.dtypes.astype(str).to_numpy(),
+                    "bytes": table.memory_usage(deep=True, index=False).to_numpy(),
+                }
+            usage.append(pd.DataFrame({"table": name, **columns}))
+        return pd.concat(usage, ignore_index=True).set_index(["table", "column"])
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=AssemblyInfo._reset_locks)
@@ -0,0 +1,278 @@
+"""
+Parsers of the NCBI assembly reports and UCSC chrom.sizes files.
+
+They are shared by the builder of the packaged database and by
+``AssemblyInfo.register_assembly``, so that registered assemblies hold the
+same metadata and seqinfo columns as packaged ones.
+"""
+
+from typing import Dict
+
+import pandas as pd
+
+__all__ = [
+    "merge_stat_info",
+    "parse_chrom_sizes",
+    "parse_chromosome_report",
+    "parse_metadata_report",
+    "parse_stats_report",
+    "process_chromosome_info",
+]
+
+
+def parse_metadata_report(text: str) -> Dict[str, str]:
+    """
+    Reads the report text line by line until a '##' is encountered,
+    then splits the read lines and builds a dictionary from them.
+
+    Parameters
+    ----------
+    text : str
+        The content of an NCBI ``*_assembly_report.txt`` file.
+
+    Returns
+    -------
+    Dict[str, str]
+        A dictionary containing the metadata information.
+    """
+    report_dict = {}
+    collected_lines = []
+
+    for line in text.split("\n"):
+        if line.strip() == "##" or len(line[1:].strip()) == 0:
+            break
+        collected_lines.append(line)
+
+    for item in collected_lines:
+        item = item[1:]
+        key, value = item.split(":", 1)  # Split only on the first colon
+        report_dict[key.strip().lower().replace(" ", "_")] = value.strip()
+
+    return report_dict
+
+
+def parse_stats_report(text: str) -> pd.DataFrame:
+    """
+    Reads the stats text line by line, then splits the read
+    lines and builds a DataFrame from them.
+
+    Parameters
+    ----------
+    text : str
+        The content of an NCBI ``*_assembly_stats.txt`` file.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame containing the stats information.
+    """
+    dfs = []
+    collected_lines = []
+
+    for line in text.split("\n"):
+        if line.startswith("#"):
+            continue
+        collected_lines.append(line)
+
+    for item in collected_lines:
+        if item.strip():
+            inner_df = pd.DataFrame(item.strip().split("\t")).T
+            inner_df = inner_df.mask(inner_df.eq("na")).infer_objects(copy=False)
+            inner_df.columns = [
+                "unit-name",
+                "molecule-name",
+                "molecule-type",
+                "sequence-type",
+                "statistic",
+                "value",
+            ]
+            dfs.append(inner_df)
+
+    return pd.concat(dfs)
+
+
+def parse_chromosome_report(text: str) -> pd.DataFrame:
+    """
+    Reads the sequence table of a report text line by line,
+    then splits the read lines and builds a DataFrame from them.
+
+    Parameters
+    ----------
+    text : str
+        The content of an NCBI ``*_assembly_report.txt`` file.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame containing the chromosome information.
+    """
+    dfs = []
+    collected_lines = []
+
+    for line in text.split("\n"):
+        if line.startswith("#"):
+            continue
+        collected_lines.append(line)
+
+    for item in collected_lines:
+        if item.strip():
+            inner_df = pd.DataFrame(item.strip().split("\t")).T
+            inner_df = inner_df.mask(inner_df.eq("na")).infer_objects(copy=False)
+            inner_df.columns = [
+                "ncbi",
+                "role",
+                "molecule",
+                "drop",
+                "genbank",
+                "drop1",
+                "refseq",
+                "unit",
+                "length",
+                "name",
+            ]
+            dfs.append(inner_df)
+
+    return pd.concat(dfs)
+
+
+def parse_chrom_sizes(text: str) -> pd.DataFrame:
+    """
+    Reads the lines of a UCSC chrom.sizes file.
+
+    Parameters
+    ----------
+    text : str
+        The content of a tab-separated ``*.chrom.sizes`` file, with one
+        sequence name and length per line.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame with the 'name' and 'length' of every sequence.
+    """
+    names, lengths = [], []
+
+    for line in text.split("\n"):
+        if not line.strip() or line.startswith("#"):
+            continue
+        name, length = line.strip().split("\t")[:2]
+        names.append(name)
+        lengths.append(int(length))
+
+    return pd.DataFrame(
+        {"name": names, "length": pd.array(lengths, dtype=pd.Int64Dtype())}
+    ).convert_dtypes()
+
+
+def process_chromosome_info(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Processes the chromosome information DataFrame.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The DataFrame containing the chromosome information.
+
+    Returns
+    -------
+    pd.DataFrame
+        A processed DataFrame containing the chromosome information.
+    """
+    df = df.drop(columns=["drop", "drop1"]).reset_index(drop=True)
+    df["role"] = [role.split("-")[0] for role in df["role"]]
+    df = df[~df["role"].isin(["pseudo"])]
+
+    df["unit"] = [
+        unit.split()[0].lower().strip() if unit.startswith("P") else unit
+        for unit in df["unit"]
+    ]
+
+    df["name"] = df["name"].fillna({idx: f"chr{x}" for idx, x in enumerate(df["ncbi"])})
+
+    df = df.dropna(how="all", axis=1)
+
+    alias = {
+        molecule: name
+        for name, molecule in list(
+            zip(
+                df[df["role"] == "assembled"]["name"],
+                df[df["role"] == "assembled"]["molecule"],
+            )
+        )
+    }
+
+    df["molecule"] = [
+        alias[mol] if pd.notna(mol) and mol in alias else mol for mol in df["molecule"]
+    ]
+
+    df = df.convert_dtypes()
+    df["length"] = df["length"].astype(pd.Int64Dtype())
+
+    return df
+
+
+def merge_stat_info(df: pd.DataFrame, idx: int, stats: pd.DataFrame):
+    """
+    Merges parsed stats information into the metadata and seqinfo of a row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The DataFrame to insert the stats information into.
+
+    idx : int
+        The index of the DataFrame to insert the stats information into.
+
+    stats : pd.DataFrame
+        The stats information, as returned by ``parse_stats_report``.
+    """
+    stats = stats[stats["unit-name"].isin(["all", "Primary Assembly", "non_nuclear"])]
+    stats["molecule-type"] = stats["molecule-type"].fillna("all")
+    stats["sequence-type"] = [s.split("-")[0] for s in stats["sequence-type"]]
+
+    # assembly
+    stats_all = stats[stats["molecule-type"] == "all"].reset_index(drop=True)
+
+    for i in stats_all.index:
+        if (
+            stats_all.loc[i, "unit-name"] == "Primary Assembly"
+            and stats_all.loc[i, "sequence-type"] == "all"
+        ):
+            stats_all.loc[i, "sequence-type"] = "primary"
+            stats_all.loc[i, "statistic"] = "-".join(
+                [stats_all.loc[i, "sequence-type"], stats_all.loc[i, "statistic"]]
+            )
+        elif stats_all.loc[i, "unit-name"] != "all":
+            tmp_name = stats_all.loc[i, "unit-name"].lower().replace(" ", "_")
+            stats_all.loc[i, "statistic"] = f"{tmp_name}-" + "-".join(
+                [stats_all.loc[i, "sequence-type"], stats_all.loc[i, "statistic"]]
+            )
+
+    df.at[idx, "metadata"] = df.loc[idx, "metadata"] | stats_all[
+        ["statistic", "value"]
+    ].set_index("statistic").astype(pd.Float64Dtype()).to_dict().get("value")
+
+    # chr
+    stats_chr = stats[stats["molecule-type"] != "all"].reset_index(drop=True)
+    stats_chr["statistic"] = [
+        "-".join([stats_chr.loc[idx, "sequence-type"], stats_chr.loc[idx, "statistic"]])
+        for idx in stats_chr.index
+    ]
+
+    for i in stats_chr.index:
+        if stats_chr.loc[i, "unit-name"] != "Primary Assembly":
+            name = stats_chr.loc[i, "unit-name"].lower().replace(" ", "_")
+            stats_chr.loc[i, "statistic"] = f"{name}-" + stats_chr.loc[i, "statistic"]
+
+    stats_chr = stats_chr[["molecule-name", "statistic", "value"]]
+    stats_chr = stats_chr.pivot(
+        index="molecule-name", columns="statistic", values="value"
+    ).astype(pd.Float64Dtype())
+    # drop all columns filled with None
+
+    tmp_df = pd.DataFrame.from_records(df.loc[idx, "seqinfo"]).set_index("ncbi")
+    df.at[idx, "seqinfo"] = (
+        pd.merge(tmp_df, stats_chr, left_index=True, right_index=True, how="left")
+        .reset_index()
+        .to_dict(orient="records")
+    )
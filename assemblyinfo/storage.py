@@ -0,0 +1,376 @@
+"""
+Storage backends of the assembly database.
+
+By default the parquet files are loaded into memory once per process. The
+SQLite backend instead keeps the database on disk, normalized into
+assembly, patch and contig tables with B-tree indexes on names, accessions
+and lengths, and pushes the contig filters down as parameterized SQL. A
+lookup then only reads the few pages it needs, which suits short-lived
+processes, and the file can be queried from non-Python tools as well.
+
+The SQLite file is exported from the parquet files with
+:func:`export_sqlite`, and selected with ``AssemblyInfo.set_storage``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .core.chrom import LENGTH_CONDITION, _filter_arrow, _filter_pandas, _lookup_row
+from .core.registry import _append_overlay, _read_overlay
+from .dtypes import STRING_DTYPE, compact, seqinfo_dtype, to_pandas
+
+__all__ = ["ParquetStorage", "SQLiteStorage", "Storage", "export_sqlite"]
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# patch columns of the database, without the assembly ones
+PATCH_COLUMNS = [
+    "patch",
+    "genbank_accession",
+    "refseq_accession",
+    "genbank_path",
+    "refseq_path",
+    "version",
+]
+ASSEMBLY_COLUMNS = ["assembly", "assembly_ucsc", "species", "common_name"]
+
+# identifier lookups, in the order they take precedence (see ``resolve``);
+# assembly names resolve to their latest patch
+LOOKUPS = [
+    (
+        "SELECT p.id FROM patches p JOIN assemblies a ON a.id = p.assembly_id"
+        " WHERE a.assembly = ? COLLATE NOCASE"
+        " ORDER BY p.version IS NOT 'latest', p.id LIMIT 1"
+    ),
+    (
+        "SELECT p.id FROM patches p JOIN assemblies a ON a.id = p.assembly_id"
+        " WHERE a.assembly_ucsc = ? COLLATE NOCASE"
+        " ORDER BY p.version IS NOT 'latest', p.id LIMIT 1"
+    ),
+    "SELECT id FROM patches WHERE patch = ? COLLATE NOCASE ORDER BY id LIMIT 1",
+    (
+        "SELECT id FROM patches WHERE genbank_accession = ? COLLATE NOCASE"
+        " ORDER BY id LIMIT 1"
+    ),
+    (
+        "SELECT id FROM patches WHERE refseq_accession = ? COLLATE NOCASE"
+        " ORDER BY id LIMIT 1"
+    ),
+]
+
+INDEXES = {
+    "assemblies_assembly": "assemblies (assembly COLLATE NOCASE)",
+    "assemblies_assembly_ucsc": "assemblies (assembly_ucsc COLLATE NOCASE)",
+    "patches_patch": "patches (patch COLLATE NOCASE)",
+    "patches_genbank_accession": "patches (genbank_accession COLLATE NOCASE)",
+    "patches_refseq_accession": "patches (refseq_accession COLLATE NOCASE)",
+    "contigs_name": "contigs (name)",
+    "contigs_ncbi": "contigs (ncbi)",
+    "contigs_genbank": "contigs (genbank)",
+    "contigs_refseq": "contigs (refseq)",
+    "contigs_length": "contigs (length)",
+}
+
+
+def _quote(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _sql_type(name: str, dtype) -> str:
+    if name == "length" or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _records(df: pd.DataFrame) -> list[tuple]:
+    """Returns the rows of a DataFrame, with missing values as None."""
+    values = df.astype(object).where(df.notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+class Storage(ABC):
+    """
+    Interface of the storage backends.
+
+    Patches are identified by their row in the database, so that results of
+    every backend line up with the in-memory tables.
+    """
+
+    @abstractmethod
+    def lookup(self, assembly: str) -> int:
+        """Returns the patch row of an assembly, patch or accession."""
+
+    @abstractmethod
+    def contigs(
+        self,
+        row: int,
+        roles: list[str] | None = None,
+        units: list[str] | None = None,
+        length: str | None = None,
+    ) -> pd.DataFrame:
+        """Returns the contigs of a patch passing the filters, as a seqinfo."""
+
+    def arrow_contigs(
+        self,
+        row: int,
+        roles: list[str] | None = None,
+        units: list[str] | None = None,
+        length: str | None = None,
+    ) -> pa.Table:
+        """Returns the contigs of a patch passing the filters, as Arrow."""
+        df = self.contigs(row, roles, units, length)
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases the resources held by the backend."""
+
+
+class ParquetStorage(Storage):
+    """The parquet files, loaded into memory by an ``AssemblyInfo``."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def lookup(self, assembly: str) -> int:
+        return _lookup_row(self.db, assembly)
+
+    def contigs(self, row, roles=None, units=None, length=None) -> pd.DataFrame:
+        return _filter_pandas(self.db, row, roles, units, length)
+
+    def arrow_contigs(self, row, roles=None, units=None, length=None) -> pa.Table:
+        return _filter_arrow(self.db, row, roles, units, length)
+
+    def close(self) -> None:
+        # the tables belong to the ``AssemblyInfo``, which outlives the backend
+        pass
+
+
+class SQLiteStorage(Storage):
+    """
+    A SQLite file written by :func:`export_sqlite`, opened read-only.
+
+    Every thread, and every forked process, opens its own connection, and
+    ``close`` closes those of every thread of the process.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise ValueError(f"ERROR: {self.path} does not exist!")
+        self._local = threading.local()
+        self._connections: list[tuple[int, sqlite3.Connection]] = []
+        self._connections_lock = threading.Lock()
+        self._types = None
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            with self._connections_lock:
+                self._connections.append((os.getpid(), connection))
+            local.connection, local.pid = connection, os.getpid()
+        return local.connection
+
+    def _contig_types(self) -> dict[str, object]:
+        """Returns the dtypes of the contig columns, as loaded from parquet."""
+        if self._types is None:
+            info = self._connection().execute("PRAGMA table_info(contigs)")
+            self._types = {
+                name: STRING_DTYPE if sql_type == "TEXT" else seqinfo_dtype(name)
+                for _, name, sql_type, *_ in info
+                if name != "id"
+            }
+        return self._types
+
+    def query(self, sql: str, params: tuple | list = ()) -> pd.DataFrame:
+        """Runs a parameterized query and returns its rows."""
+        return pd.read_sql_query(sql, self._connection(), params=params)
+
+    def lookup(self, assembly: str) -> int:
+        if not assembly or not isinstance(assembly, str):
+            raise ValueError("ERROR: you must provide an identifier!")
+
+        connection = self._connection()
+        for sql in LOOKUPS:
+            found = connection.execute(sql, (assembly.strip(),)).fetchone()
+            if found is not None:
+                return found[0]
+        raise ValueError(f"ERROR: {assembly} not in database!")
+
+    def contigs(self, row, roles=None, units=None, length=None) -> pd.DataFrame:
+        where, params = ["pc.patch_id = ?"], [int(row)]
+        if length:
+            match = LENGTH_CONDITION.match(length)
+            if not match:
+                raise ValueError(f"ERROR: {length} is not a valid length condition!")
+            where.append(f"c.length {match.group(1)} ?")
+            params.append(float(match.group(2)))
+        for column, values in [("role", roles), ("unit", units)]:
+            if values:
+                where.append(f"c.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+
+        types = self._contig_types()
+        columns = ", ".join(f"c.{_quote(c)}" for c in types)
+        df = self.query(
+            f"SELECT pc.position, {columns} FROM patch_contigs pc"
+            " JOIN contigs c ON c.id = pc.contig_id"
+            f" WHERE {' AND '.join(where)} ORDER BY pc.position",
+            params,
+        )
+        positions = df.pop("position").to_numpy(np.int64)
+        if len(where) > 1:
+            df.index = pd.Index(positions)
+        return compact(df.astype(types))
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            # every thread opens a new connection on its next query
+            self._local = threading.local()
+        for pid, connection in connections:
+            # connections inherited from a parent process are left to it
+            if pid == os.getpid():
+                connection.close()
+
+
+def export_sqlite(
+    path: str | Path,
+    db_path: str | Path = DATA_DIR / "db.parquet",
+    contigs_path: str | Path = DATA_DIR / "contigs.parquet",
+    overlay_path: str | Path | None = None,
+) -> None:
+    """
+    Exports the parquet database into a normalized SQLite file.
+
+    The file holds an 'assemblies' table, a 'patches' table (with the
+    metadata as JSON), the distinct 'contigs' and the 'patch_contigs'
+    table listing the contigs of each patch in order, with B-tree indexes
+    on names, accessions and lengths. Patch ids are the database rows.
+
+    The file is not updated by ``register_assembly``: to query registered
+    patches from it, export it again with the user overlay.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        The SQLite file to write, replaced if it exists.
+    db_path : Union[str, Path]
+        The 'db.parquet' file to export.
+    contigs_path : Union[str, Path]
+        The 'contigs.parquet' file to export.
+    overlay_path : Optional[Union[str, Path]]
+        A user overlay file whose registered patches are exported as well
+        (e.g. '~/.assemblyinfo/overlay.parquet').
+
+    Examples
+    --------
+    >>> export_sqlite("db.sqlite")
+    >>> AssemblyInfo.set_storage("db.sqlite")
+    """
+    if overlay_path is not None:
+        overlay_path = Path(overlay_path).expanduser()
+    data = to_pandas(pq.read_table(db_path))
+    contigs = to_pandas(pq.read_table(contigs_path))
+    if overlay_path is not None and Path(overlay_path).is_file():
+        data, contigs = _append_overlay(data, contigs, _read_overlay(overlay_path))
+
+    assemblies = data[ASSEMBLY_COLUMNS].drop_duplicates().reset_index(drop=True)
+    assembly_ids = (
+        data[ASSEMBLY_COLUMNS]
+        .merge(assemblies.reset_index(), how="left", on=ASSEMBLY_COLUMNS)["index"]
+        .to_numpy()
+    )
+    metadata = [json.dumps(m, default=str) if m else None for m in data["metadata"]]
+    patches = data[PATCH_COLUMNS].assign(metadata=metadata)
+    patches.insert(0, "assembly_id", assembly_ids)
+
+    sizes = data["contigs"].map(len).to_numpy()
+    patch_contigs = zip(
+        np.repeat(np.arange(len(data)), sizes).tolist(),
+        np.concatenate([np.arange(n) for n in sizes]).tolist(),
+        np.concatenate(data["contigs"].tolist()).tolist(),
+    )
+
+    contig_columns = [
+        f"{_quote(name)} {_sql_type(name, dtype)}"
+        for name, dtype in contigs.dtypes.items()
+    ]
+    names = ", ".join(_quote(c) for c in contigs.columns)
+    marks = ", ".join("?" * (len(contigs.columns) + 1))
+
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executescript(
+                f"""
+                CREATE TABLE assemblies (
+                    id INTEGER PRIMARY KEY,
+                    assembly TEXT NOT NULL,
+                    assembly_ucsc TEXT,
+                    species TEXT,
+                    common_name TEXT
+                );
+                CREATE TABLE patches (
+                    id INTEGER PRIMARY KEY,
+                    assembly_id INTEGER NOT NULL REFERENCES assemblies (id),
+                    patch TEXT NOT NULL,
+                    genbank_accession TEXT,
+                    refseq_accession TEXT,
+                    genbank_path TEXT,
+                    refseq_path TEXT,
+                    version TEXT,
+                    metadata TEXT
+                );
+                CREATE TABLE contigs (
+                    id INTEGER PRIMARY KEY,
+                    {", ".join(contig_columns)}
+                );
+                CREATE TABLE patch_contigs (
+                    patch_id INTEGER NOT NULL REFERENCES patches (id),
+                    position INTEGER NOT NULL,
+                    contig_id INTEGER NOT NULL REFERENCES contigs (id),
+                    PRIMARY KEY (patch_id, position)
+                ) WITHOUT ROWID;
+                """
+            )
+            connection.executemany(
+                "INSERT INTO assemblies VALUES (?, ?, ?, ?, ?)",
+                _records(assemblies.reset_index()),
+            )
+            connection.executemany(
+                "INSERT INTO patches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _records(patches.reset_index()),
+            )
+            connection.executemany(
+                f"INSERT INTO contigs (id, {names}) VALUES ({marks})",
+                _records(contigs.reset_index()),
+            )
+            connection.executemany(
+                "INSERT INTO patch_contigs VALUES (?, ?, ?)", patch_contigs
+            )
+            for name, target in INDEXES.items():
+                connection.execute(f"CREATE INDEX {name} ON {target}")
+        connection.execute("ANALYZE")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
@@ -0,0 +1,53 @@
+"""
+Benchmarks for the loading, lookup and build paths of assemblyinfo.
+
+Run them with ``hatch run bench:run`` or ``pytest benchmarks``. Results are
+stored as JSON by pytest-benchmark under ``.benchmarks/``, and a run can
+be compared against a stored one to catch regressions, e.g.::
+
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+DATA_DIR = Path(__file__).parent / "data"
+BUILD_DIR = Path(__file__).parents[1] / "assemblyinfo" / "build"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_user_overlay():
+    """Keeps the overlay of the user out of the benchmarks."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("ASSEMBLYINFO_OVERLAY", "")
+        yield
+
+
+@pytest.fixture(scope="session")
+def db():
+    return AssemblyInfo.preload()
+
+
+@pytest.fixture(scope="session")
+def build_module():
+    pytest.importorskip("requests")
+    pytest.importorskip("bs4")
+    sys.path.insert(0, str(BUILD_DIR))
+    import build
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def assembly_report():
+    path = DATA_DIR / "GCF_000001405.40_GRCh38.p14_assembly_report.txt"
+    return path.read_text()
+
+
+@pytest.fixture(scope="session")
+def assembly_stats():
+    path = DATA_DIR / "GCF_000001405.40_GRCh38.p14_assembly_stats.txt"
+    return path.read_text()
@@ -0,0 +1,34 @@
+import pandas as pd
+
+
+def test_parse_metadata_report(benchmark, build_module, assembly_report):
+    metadata = benchmark(build_module.parse_metadata_report, assembly_report)
+    assert metadata["assembly_name"] == "GRCh38.p14"
+
+
+def test_parse_chromosome_report(benchmark, build_module, assembly_report):
+    def parse():
+        df = build_module.parse_chromosome_report(assembly_report)
+        return build_module.process_chromosome_info(df)
+
+    seqinfo = benchmark(parse)
+    assert len(seqinfo) == 709
+
+
+def test_parse_stats_report(benchmark, build_module, assembly_stats):
+    stats = benchmark(build_module.parse_stats_report, assembly_stats)
+    assert len(stats) > 0
+
+
+def test_merge_stat_info(benchmark, build_module, assembly_report, assembly_stats):
+    metadata = build_module.parse_metadata_report(assembly_report)
+    seqinfo = build_module.process_chromosome_info(
+        build_module.parse_chromosome_report(assembly_report)
+    ).to_dict(orient="records")
+    stats = build_module.parse_stats_report(assembly_stats)
+
+    def setup():
+        df = pd.DataFrame({"metadata": [metadata], "seqinfo": [seqinfo]})
+        return (df, 0, stats), {}
+
+    benchmark.pedantic(build_module.merge_stat_info, setup=setup, rounds=5)
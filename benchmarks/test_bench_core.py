@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assemblyinfo import core
+
+_rng = np.random.default_rng(0)
+INTERVALS = pd.DataFrame(
+    {
+        "chrom": _rng.choice(
+            [f"chr{i}" for i in [*range(1, 23), "X", "Y", "M"]], 10**6
+        ),
+        "start": _rng.integers(0, 10**8, 10**6),
+    }
+).assign(end=lambda df: df["start"] + 1000)
+
+CALLS = {
+    "info": ((), {}),
+    "get_db": ((), {}),
+    "get_info": (("species", "homo_sapiens"), {}),
+    "get_species_info": (("homo_sapiens",), {}),
+    "get_organism_info": (("human",), {}),
+    "get_version": (("GRCh38.p14",), {}),
+    "build_assembly_info": None,
+    "get_assembly_metadata": (("hg38",), {}),
+    "available_assemblies": ((), {}),
+    "available_patches": (("GRCh38",), {}),
+    "available_species": ((), {}),
+    "available_accessions": (("hg38",), {}),
+    "get_genbank_accession": (("GRCh38.p14",), {}),
+    "get_refseq_accession": (("GRCh38.p14",), {}),
+    "get_patch_from_accession": (("GCF_000001405.40",), {}),
+    "get_assembly_from_accession": (("GCA_000001405.29",), {}),
+    "get_accession_versions": (("GCF_000001405",), {}),
+    "get_paired_accession": (("GCA_000001405.28",), {}),
+    "match_accessions": ((["GCF_000001405.40", "GCA_000001405"] * 1000,), {}),
+    "get_paired_accessions": ((["GCA_000001405.28", "GCF_000001405"] * 1000,), {}),
+    "resolve_accessions": ((["GCF_000001405.40", "GCA_000001635", "bad"] * 1000,), {}),
+    "filter_chromosome_data": (("hg38",), {"roles": ["assembled"]}),
+    "get_chromnames": (("hg38",), {"roles": ["assembled"]}),
+    "get_chromsizes": (("hg38",), {}),
+    "get_chrom_eq": (("hg38",), {}),
+    "get_seqinfo": (("hg38",), {}),
+    "find_sequence": ((["NC_000001.11", "CM000663.2", "chrM"],), {}),
+    "find_contigs": ((1_000_000, 2_000_000), {"roles": ["unplaced"]}),
+    "diff_patches": (("GRCh38.p13", "GRCh38.p14"), {}),
+    "diff_all_patches": ((), {}),
+    "Assembly": None,
+    "assembly_info": (("hg38",), {"roles": ["assembled"]}),
+    "AssemblyKey": None,
+    "register_assembly": None,
+    "resolve": (("Hg38",), {}),
+    "suggest": (("hg83",), {}),
+    "search": (("genome reference consortium",), {"fields": ["submitter"]}),
+    "get_metadata_table": ((), {}),
+    "query_metadata": (("latest and contig_N50 > 10e6",), {"sort_by": "date"}),
+    "get_chrom_ranks": (("hg38",), {}),
+    "sort_intervals": ((INTERVALS, "hg38"), {}),
+    "harmonize_dataset": None,
+    "detect_assemblies": None,
+    "sql": (
+        (
+            "SELECT assembly, count(*) FROM contigs "
+            "WHERE role = 'assembled' AND length > 100e6 GROUP BY assembly",
+        ),
+        {},
+    ),
+    "compute_stats": ((), {}),
+    "sample_positions": (("hg38", 1_000_000), {"roles": ["assembled"], "seed": 0}),
+    "sample_intervals": (("hg38", 100_000, 1_000), {"seed": 0}),
+    "iter_sample_positions": None,
+    "partition_genome": (("hg38",), {"n_chunks": 64, "split_contigs": True}),
+    "export_references": None,
+}
+
+
+def test_all_core_functions_benchmarked():
+    assert set(CALLS) == set(core.__all__)
+
+
+@pytest.mark.parametrize(
+    "name", [name for name, call in CALLS.items() if call is not None]
+)
+def test_core_call(benchmark, db, name):
+    args, kwargs = CALLS[name]
+    if name == "get_version":
+        benchmark(core.get_version, *args)
+    else:
+        benchmark(getattr(db, name), *args, **kwargs)
@@ -0,0 +1,55 @@
+from assemblyinfo import core
+from assemblyinfo.core.chrom import _seqinfo_table
+from assemblyinfo.interface import AssemblyInfo
+from assemblyinfo.storage import SQLiteStorage, export_sqlite
+
+
+def test_cold_load(benchmark):
+    def load():
+        instance = object.__new__(AssemblyInfo)
+        instance._load_db()
+        return instance
+
+    instance = benchmark.pedantic(load, rounds=5, iterations=1)
+    assert len(instance._data) > 0
+
+
+def test_warm_connect(benchmark, db):
+    assert benchmark(AssemblyInfo.connect) is db
+
+
+def test_cold_seqinfo_table(benchmark, db):
+    def setup():
+        instance = object.__new__(AssemblyInfo)
+        instance._data = db._data
+        instance._contigs = db._contigs
+        instance._cache = {}
+        instance._cache_lock = db._cache_lock
+        return (instance,), {}
+
+    table = benchmark.pedantic(_seqinfo_table, setup=setup, rounds=5)
+    assert len(table) > 0
+
+
+def test_cold_sqlite_lookup(benchmark, tmp_path):
+    path = tmp_path / "db.sqlite"
+    export_sqlite(path)
+
+    def lookup():
+        storage = SQLiteStorage(path)
+        try:
+            return storage.contigs(storage.lookup("hg38"), roles=["assembled"])
+        finally:
+            storage.close()
+
+    contigs = benchmark.pedantic(lookup, rounds=5, iterations=1)
+    assert len(contigs) == 25
+
+
+def test_bulk_translation(benchmark, db):
+    chromeq = core.get_chrom_eq(db, "hg38", providers=["ucsc", "refseq"])
+    mapping = chromeq.set_index("name")["refseq"].dropna()
+    names = mapping.index.to_series().sample(1_000_000, replace=True, random_state=0)
+
+    translated = benchmark(names.map, mapping)
+    assert translated.notna().all()
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_user_overlay():
+    """Keeps the overlay of the user out of the tests."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("ASSEMBLYINFO_OVERLAY", "")
+        yield
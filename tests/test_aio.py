@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from assemblyinfo import AsyncAssemblyInfo
+from assemblyinfo.aio import QUERIES
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_async_queries():
+    async def main():
+        async with AsyncAssemblyInfo(max_workers=2) as db:
+            assert await db.connect() is AssemblyInfo.connect()
+
+            chromsizes = await db.get_chromsizes("hg38", roles=["assembled"])
+            assert isinstance(chromsizes, pd.Series)
+            assert len(chromsizes) == 25
+
+            metadata = await db.get_assembly_metadata("hg38")
+            assert metadata["species"] == "homo_sapiens"
+
+            with pytest.raises(ValueError):
+                await db.filter_chromosome_data("NonExistentAssembly")
+
+    asyncio.run(main())
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_async_coalesces_identical_calls():
+    async def main():
+        executor = CountingExecutor()
+        async with AsyncAssemblyInfo(executor=executor) as db:
+            executor.submitted = 0
+            results = await asyncio.gather(
+                *[
+                    db.filter_chromosome_data("hg38", roles=["assembled"])
+                    for _ in range(8)
+                ],
+                db.filter_chromosome_data("hg38", roles=["alt"]),
+            )
+            # one computation for the eight identical calls, one for the other
+            assert executor.submitted == 2
+            assert all(r is results[0] for r in results[:8])
+            assert results[8] is not results[0]
+            assert not db._inflight
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_async_unknown_method():
+    db = AsyncAssemblyInfo()
+    for name in ["not_a_method", "set_output", "set_storage", "register_assembly"]:
+        with pytest.raises(AttributeError):
+            getattr(db, name)
+    db.close()
+
+    async def main():
+        async with AsyncAssemblyInfo(max_workers=1) as db:
+            with pytest.raises(ValueError):
+                await db.call("set_output", "arrow")
+
+    asyncio.run(main())
+    assert AssemblyInfo._output == "pandas"
+
+
+def test_async_queries_exist():
+    assert all(callable(getattr(AssemblyInfo, name, None)) for name in QUERIES)
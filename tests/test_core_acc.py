@@ -1,3 +1,4 @@
+import pandas as pd
 import pytest
 
 from assemblyinfo.interface import AssemblyInfo
@@ -53,3 +54,70 @@ def test_get_assembly_from_accession():
 
     with pytest.raises(ValueError):
         db.get_assembly_from_accession("NonExistentAssembly")
+
+
+def test_unversioned_accession():
+    db = AssemblyInfo.connect()
+
+    result = db.get_patch_from_accession("GCF_000001405")
+    assert result[:2] == ["GRCh38.p14", "GRCh38.p13"]
+
+    result = db.get_assembly_from_accession("gca_000001635")
+    assert result == ["GRCm39", "mm39"]
+
+    with pytest.raises(ValueError):
+        db.get_patch_from_accession("GCA_000000000")
+
+
+def test_get_accession_versions():
+    db = AssemblyInfo.connect()
+
+    result = db.get_accession_versions("GCF_000001405.26")
+    assert result[:3] == ["GCF_000001405.40", "GCF_000001405.39", "GCF_000001405.38"]
+    assert len(result) == len(set(result))
+
+
+def test_get_paired_accession():
+    db = AssemblyInfo.connect()
+
+    assert db.get_paired_accession("GCA_000001405.28") == ["GCF_000001405.39"]
+    assert db.get_paired_accession("GCF_000001405") == ["GCA_000001405.29"]
+    assert db.get_paired_accession("GCA_000001405.2") == []
+
+
+def test_match_accessions():
+    db = AssemblyInfo.connect()
+
+    accessions = ["GCF_000001405.40", "GCA_000001405", "GCA_000001405.99", "bad"]
+    rows = db.match_accessions(accessions)
+    assert rows[0] == rows[1] >= 0
+    assert rows[2:].tolist() == [-1, -1]
+
+    rows = db.match_accessions(["GCA_000001405.15"], ignore_version=True)
+    assert db._data["patch"].iat[rows[0]] == "GRCh38.p14"
+
+    paired = db.get_paired_accessions(["GCA_000001405.28", "GCF_000001405", "bad"])
+    assert paired.tolist()[:2] == ["GCF_000001405.39", "GCA_000001405.29"]
+    assert paired.isna().tolist() == [False, False, True]
+
+
+def test_resolve_accessions():
+    db = AssemblyInfo.connect()
+
+    sheet = pd.Series(
+        ["GCF_000001405.40", "gca_000001635", None, "bad", "GCA_000001405.99"],
+        index=list("abcde"),
+    )
+    result = db.resolve_accessions(sheet)
+    assert result.index.tolist() == list("abcde")
+    assert result["found"].tolist() == [True, True, False, False, False]
+    assert result.loc["a", ["assembly", "assembly_ucsc", "patch"]].tolist() == [
+        "GRCh38",
+        "hg38",
+        "GRCh38.p14",
+    ]
+    assert result.loc["b", "accession_type"] == "genbank"
+    assert result.loc["b", "species"] == "mus_musculus"
+    assert result.loc[["c", "d", "e"], "assembly"].isna().all()
+
+    assert db.resolve_accessions([]).empty
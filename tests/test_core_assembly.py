@@ -1,3 +1,4 @@
+import pytest
 
 from assemblyinfo.core.assembly import Assembly
 from assemblyinfo.interface import AssemblyInfo
@@ -19,3 +20,78 @@ def test_assembly_info_human():
     assert assembly.assembly == "hg38"
     assert assembly.species == "homo_sapiens"
     assert assembly.common_name == "human"
+
+
+def test_assembly_info_lazy():
+    db = AssemblyInfo.connect()
+
+    assembly = db.assembly_info("hg38", roles=["assembled"])
+    assert "seqinfo" not in vars(assembly)
+    assert "metadata" not in vars(assembly)
+
+    assert len(assembly.chromsizes) == 25
+    assert assembly.chromnames[0] == "chr1"
+    assert "seqinfo" in vars(assembly)
+    assert "metadata" not in vars(assembly)
+
+    assert assembly.chromeq.loc["chr1", "refseq"] == "NC_000001.11"
+    assert assembly.aliases["chr1"]["genbank"] == "CM000663.2"
+    assert assembly.metadata["species"] == "homo_sapiens"
+
+
+def test_assembly_info_shared_tables():
+    db = AssemblyInfo.connect()
+
+    first = db.assembly_info("hg38", provider="refseq", roles=["assembled"])
+    second = db.assembly_info("hg38", provider="refseq", roles=["assembled"])
+    assert first is not second
+    assert first.seqinfo is second.seqinfo
+    assert first.metadata is second.metadata
+    assert "NC_000001.11" in first.chromsizes.index
+
+    # aliases of the same patch share the tables too
+    alias = db.assembly_info("HG38", provider="refseq", roles=["assembled"])
+    assert alias.seqinfo is first.seqinfo
+    assert alias.metadata is first.metadata
+
+
+def test_assembly_info_bounded_cache(monkeypatch):
+    db = AssemblyInfo.connect()
+    monkeypatch.setattr(AssemblyInfo, "_query_cache_size", 4)
+
+    for size in range(10):
+        assert not db.assembly_info("hg38", length=f"> {size}").seqinfo.empty
+    assert len(db._query_cache) <= 4
+
+    with pytest.raises(ValueError):
+        db.assembly_info("NonExistentAssembly")
+
+    with pytest.raises(ValueError):
+        db.assembly_info("hg38", provider="NonExistentProvider")
+
+
+def test_assembly_eager_fields():
+    db = AssemblyInfo.connect()
+    lazy = db.assembly_info("hg38", roles=["assembled"])
+
+    assembly = Assembly(
+        "hg38",
+        "homo_sapiens",
+        "human",
+        lazy.seqinfo,
+        lazy.metadata,
+        lazy.aliases,
+    )
+    assert assembly.common_name == "human"
+    assert assembly.seqinfo is lazy.seqinfo
+    assert assembly.chromsizes.equals(lazy.chromsizes)
+    assert assembly.aliases["chr1"]["genbank"] == "CM000663.2"
+
+    # fields that are not given are loaded from the database
+    assembly = Assembly("hg38", species="homo_sapiens", db=db)
+    assert assembly.common_name == "human"
+    assert "seqinfo" not in vars(assembly)
+    assert len(assembly.chromnames) == len(db.get_chromnames("hg38"))
+
+    with pytest.raises(ValueError):
+        Assembly("hg38").seqinfo  # noqa: B018
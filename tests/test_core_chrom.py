@@ -1,4 +1,5 @@
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 from assemblyinfo.interface import AssemblyInfo
@@ -81,3 +82,57 @@ def test_get_seqinfo():
 
     with pytest.raises(ValueError):
         db.get_seqinfo("NonExistentAssembly")
+
+
+def test_compact_dtypes():
+    db = AssemblyInfo.connect()
+
+    result = db.filter_chromosome_data("hg38")
+    assert result["name"].dtype == pd.StringDtype("pyarrow")
+    assert isinstance(result["role"].dtype, pd.CategoricalDtype)
+    assert set(result["role"].cat.categories) == set(result["role"].dropna())
+
+    result = db.get_seqinfo("hg38")
+    assert isinstance(result["unit"].dtype, pd.CategoricalDtype)
+    assert result["length"].dtype == pd.Int64Dtype()
+    assert result["all-gc-perc"].dtype == pd.Float64Dtype()
+
+
+def test_arrow_output():
+    db = AssemblyInfo.connect()
+
+    result = db.filter_chromosome_data(
+        "hg38", roles=["assembled"], length=">= 50000000", output="arrow"
+    )
+    expected = db.filter_chromosome_data(
+        "hg38", roles=["assembled"], length=">= 50000000"
+    )
+    assert isinstance(result, pa.Table)
+    assert result["name"].to_pylist() == expected["name"].tolist()
+    # lengths are integers in both outputs
+    assert result.schema.field("length").type == pa.int64()
+    assert result["length"].to_pylist() == expected["length"].tolist()
+
+    result = db.get_chromsizes("hg38", provider="refseq", output="arrow")
+    assert result.column_names == ["refseq", "length"]
+    assert result.num_rows == len(db.get_chromsizes("hg38"))
+
+    result = db.get_chrom_eq("hg38", providers=["ucsc", "genbank"], output="arrow")
+    assert result.column_names == ["name", "genbank"]
+
+    result = db.get_seqinfo("hg38", output="arrow")
+    assert result["name"].to_pylist() == db.get_seqinfo("hg38").index.tolist()
+
+    AssemblyInfo.set_output("arrow")
+    try:
+        assert isinstance(db.get_seqinfo("hg38"), pa.Table)
+        assert isinstance(db.get_seqinfo("hg38", output="pandas"), pd.DataFrame)
+        assert db.get_chromnames("hg38")[0] == "chr1"
+    finally:
+        AssemblyInfo.set_output()
+
+    with pytest.raises(ValueError):
+        db.get_seqinfo("hg38", output="polars")
+
+    with pytest.raises(ValueError):
+        db.filter_chromosome_data("hg38", length="long", output="arrow")
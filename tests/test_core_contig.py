@@ -0,0 +1,44 @@
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_find_sequence():
+    db = AssemblyInfo.connect()
+
+    result = db.find_sequence("NC_000001.11")
+    assert set(result["assembly"]) == {"GRCh38"}
+    assert "GRCh38.p14" in result["patch"].tolist()
+    assert (result["provider"] == "refseq").all()
+    assert (result["name"] == "chr1").all()
+
+    result = db.find_sequence(["CM000663.2", "chrM", "nope"])
+    assert set(result["sequence"]) == {"CM000663.2", "chrM"}
+    chrM = result[(result["sequence"] == "chrM") & (result["patch"] == "GRCh38.p14")]
+    assert len(chrM) == 1
+
+    assert db.find_sequence("nope").empty
+
+
+def test_find_sequence_provider():
+    db = AssemblyInfo.connect()
+
+    result = db.find_sequence("chr1", provider="ucsc")
+    assert "hg38" in result["assembly_ucsc"].tolist()
+    assert db.find_sequence("chr1", provider="refseq").empty
+
+    with pytest.raises(ValueError):
+        db.find_sequence("chr1", provider="NonExistentProvider")
+
+
+def test_find_contigs():
+    db = AssemblyInfo.connect()
+
+    result = db.find_contigs(1_000_000, 1_100_000, roles=["unplaced"])
+    assert len(result) > 0
+    assert result["length"].between(1_000_000, 1_100_000).all()
+    assert result["length"].is_monotonic_increasing
+    assert (result["role"] == "unplaced").all()
+
+    result = db.find_contigs(min_length=200_000_000, units=["primary"])
+    assert "chr1" in result["name"].tolist()
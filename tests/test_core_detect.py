@@ -0,0 +1,102 @@
+import gzip
+import struct
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def _sam_header(chromsizes):
+    lines = [f"@SQ\tSN:{name}\tLN:{length}" for name, length in chromsizes.items()]
+    return "@HD\tVN:1.6\n" + "\n".join(lines) + "\n"
+
+
+def _write_bam(path, chromsizes):
+    text = b"@HD\tVN:1.6\n"
+    data = b"BAM\1" + struct.pack("<i", len(text)) + text
+    data += struct.pack("<i", len(chromsizes))
+    for name, length in chromsizes.items():
+        name = name.encode() + b"\0"
+        data += struct.pack("<i", len(name)) + name + struct.pack("<i", length)
+    with gzip.open(path, "wb") as f:
+        f.write(data)
+
+
+def _write_cram(path, chromsizes):
+    text = _sam_header(chromsizes).encode()
+    data = gzip.compress(struct.pack("<i", len(text)) + text)
+    # a raw ITF8 of the compressed size, on 2 bytes
+    size = bytes([0x80 | len(data) >> 8, len(data) & 0xFF])
+    block = bytes([1, 0, 0]) + size + bytes([0]) + data + b"\0" * 4
+    container = struct.pack("<i", len(block)) + bytes([0] * 8) + b"\0" * 4
+    path.write_bytes(b"CRAM" + bytes([3, 0]) + b"\0" * 20 + container + block)
+
+
+def test_detect_assemblies(tmp_path):
+    db = AssemblyInfo.connect()
+
+    chromsizes = db.get_chromsizes("GRCh38.p14")
+    (tmp_path / "ref.fa.fai").write_text(
+        "".join(f"{n}\t{n_bp}\t0\t60\t61\n" for n, n_bp in chromsizes.items())
+    )
+    refseq = db.get_chromsizes("hg38", provider="refseq", roles=["assembled"])
+    with gzip.open(tmp_path / "calls.vcf.gz", "wt") as f:
+        f.write("##fileformat=VCFv4.2\n")
+        for name, length in refseq.items():
+            f.write(f"##contig=<ID={name},length={length},assembly=hg38>\n")
+        f.write("#CHROM\tPOS\tID\n")
+    mm10 = db.get_chromsizes("mm10", roles=["assembled"])
+    (tmp_path / "mm10.dict").write_text(_sam_header(mm10))
+    (tmp_path / "reads.sam").write_text(_sam_header(mm10.iloc[:-2]) + "read\t0\n")
+    hg19 = db.get_chromsizes("hg19", provider="ncbi", roles=["assembled"])
+    _write_bam(tmp_path / "hg19.bam", hg19)
+    _write_cram(tmp_path / "mm10.cram", mm10)
+    (tmp_path / "broken.bam").write_bytes(b"nope")
+    (tmp_path / "notes.txt").write_text("skipped")
+
+    result = db.detect_assemblies(tmp_path, processes=2).set_index("path")
+    result.index = result.index.map(lambda p: p.rsplit("/", 1)[-1])
+    assert sorted(result.index) == [
+        "broken.bam",
+        "calls.vcf.gz",
+        "hg19.bam",
+        "mm10.cram",
+        "mm10.dict",
+        "reads.sam",
+        "ref.fa.fai",
+    ]
+
+    assert result.loc["ref.fa.fai", "patch"] == "GRCh38.p14"
+    assert result.loc["ref.fa.fai", "candidates"] == 1
+    assert result.loc["calls.vcf.gz", ["assembly", "provider"]].tolist() == [
+        "GRCh38",
+        "refseq",
+    ]
+    assert result.loc["hg19.bam", ["assembly", "provider"]].tolist() == [
+        "GRCh37",
+        "ncbi",
+    ]
+    for name in ["mm10.dict", "mm10.cram"]:
+        assert result.loc[name, ["assembly", "provider", "confidence"]].tolist() == [
+            "GRCm38",
+            "ucsc",
+            1.0,
+        ]
+    assert result.loc["reads.sam", "assembly"] == "GRCm38"
+    assert 0 < result.loc["reads.sam", "confidence"] < 1
+
+    assert result.loc["broken.bam", "error"]
+    assert result.loc["broken.bam", "patch"] is None
+
+
+def test_detect_assemblies_unknown(tmp_path):
+    db = AssemblyInfo.connect()
+
+    (tmp_path / "toy.fa.fai").write_text("contig1\t17\t0\t60\t61\n")
+    (tmp_path / "empty.vcf").write_text("##fileformat=VCFv4.2\n#CHROM\n")
+    result = db.detect_assemblies(
+        [tmp_path / "toy.fa.fai", tmp_path / "empty.vcf", tmp_path / "x.gff"],
+        processes=1,
+    )
+    assert result["patch"].isna().all()
+    assert result["confidence"].tolist() == [0.0, 0.0, 0.0]
+    assert result["error"].notna().tolist() == [False, False, True]
+    assert result["n_contigs"].tolist() == [1, 0, 0]
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_diff_patches():
+    db = AssemblyInfo.connect()
+
+    result = db.diff_patches("GRCh38.p13", "GRCh38.p14")
+    assert set(result) == {"added", "removed", "changed"}
+    assert all(isinstance(df, pd.DataFrame) for df in result.values())
+    assert len(result["added"]) > 0
+    assert result["added"]["length_a"].isna().all()
+    assert result["removed"]["length_b"].isna().all()
+
+    result = db.diff_patches("GRCh38.p14", "GRCh38.p14")
+    assert all(len(df) == 0 for df in result.values())
+
+    with pytest.raises(ValueError):
+        db.diff_patches("GRCh38.p14", "NonExistentAssembly")
+
+
+def test_diff_patches_across_assemblies():
+    db = AssemblyInfo.connect()
+
+    result = db.diff_patches("hg19", "hg38", provider="ucsc")
+    changed = result["changed"].set_index("name")
+    assert "chr1" in changed.index
+    assert changed.loc["chr1", "length_a"] == 249250621
+    assert changed.loc["chr1", "length_b"] == 248956422
+
+
+def test_diff_all_patches():
+    db = AssemblyInfo.connect()
+
+    result = db.diff_all_patches()
+    assert isinstance(result, pd.DataFrame)
+
+    pairs = result[["assembly", "patch_a", "patch_b"]].drop_duplicates()
+    assert ("GRCh38", "GRCh38.p13", "GRCh38.p14") in set(map(tuple, pairs.values))
+    assert (pairs["patch_a"] != pairs["patch_b"]).all()
+
+    single = db.diff_patches("GRCh38.p13", "GRCh38.p14")
+    bulk = result[(result["patch_a"] == "GRCh38.p13")]
+    assert (bulk["status"] == "added").sum() == len(single["added"])
+    assert (bulk["status"] == "removed").sum() == len(single["removed"])
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from assemblyinfo.core.chrom import _seqinfo_table
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_export_references(tmp_path):
+    db = AssemblyInfo.connect()
+    # the sources are sliced by binary search on the database row
+    assert _seqinfo_table(db)["row"].is_monotonic_increasing
+
+    result = db.export_references(
+        ["hg38", "ce11"],
+        tmp_path,
+        providers=["ucsc", "refseq"],
+        filters={"all": None, "primary": ["assembled"]},
+        processes=2,
+    )
+    assert len(result) == 2 * 2 * 2 * 4
+    assert result["written"].all()
+
+    chromsizes = db.get_chromsizes("hg38", roles=["assembled"])
+    lines = (tmp_path / "hg38.ucsc.primary.chrom.sizes").read_text().splitlines()
+    assert lines == [f"{name}\t{length}" for name, length in chromsizes.items()]
+
+    bed = (tmp_path / "hg38.ucsc.primary.bed").read_text().splitlines()
+    assert bed[0] == f"chr1\t0\t{chromsizes['chr1']}"
+
+    dictionary = (tmp_path / "hg38.refseq.primary.dict").read_text().splitlines()
+    assert dictionary[0].startswith("@HD\tVN:")
+    assert dictionary[1] == "@SQ\tSN:NC_000001.11\tLN:248956422\tAS:GRCh38.p14"
+    assert len(dictionary) == len(chromsizes) + 1
+
+    # offsets of a FASTA file with 60 bases per line
+    fai = [
+        line.split("\t")
+        for line in (tmp_path / "hg38.ucsc.primary.fa.fai").read_text().splitlines()
+    ]
+    assert fai[0] == ["chr1", "248956422", "6", "60", "61"]
+    assert int(fai[1][2]) == 6 + 248956422 + -(-248956422 // 60) + 6
+
+
+def test_export_references_skips_unchanged(tmp_path):
+    db = AssemblyInfo.connect()
+
+    first = db.export_references(["ce11"], tmp_path, processes=1)
+    assert first["written"].all()
+    assert not db.export_references(["ce11"], tmp_path)["written"].any()
+
+    (tmp_path / "ce11.ucsc.all.bed").unlink()
+    again = db.export_references(["ce11"], tmp_path).set_index("format")
+    assert again["written"].tolist() == [False, False, False, True]
+
+    forced = db.export_references(["ce11"], tmp_path, force=True)
+    assert forced["written"].all()
+
+    # files are skipped by the content hash of their source, not by filter
+    same = db.export_references(["ce11"], tmp_path, filters={"all": ["assembled"]})
+    assert not same["written"].any()
+
+    manifest = tmp_path / ".assemblyinfo-export.json"
+    hashes = json.loads(manifest.read_text())
+    hashes["ce11.ucsc.all.dict"] = "0" * 32
+    manifest.write_text(json.dumps(hashes))
+    changed = db.export_references(["ce11"], tmp_path).set_index("format")
+    assert changed["written"].tolist() == [False, False, True, False]
+
+
+def test_export_references_invalid(tmp_path):
+    db = AssemblyInfo.connect()
+
+    with pytest.raises(ValueError):
+        db.export_references(["hg38"], tmp_path, formats=["fasta"])
+    with pytest.raises(ValueError):
+        db.export_references(["hg38"], tmp_path, providers=["ensembl"])
+    with pytest.raises(ValueError):
+        db.export_references(["not_an_assembly"], tmp_path)
@@ -0,0 +1,102 @@
+import gzip
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+BED = [
+    "track name=peaks",
+    "1\t100\t200\tpeak1\t5",
+    "NC_000002.12\t0\t50\tpeak2\t7",
+    "chrUn_GL000195v1\t10\t20\tpeak3\t1",
+    "unknown\t10\t20\tpeak4\t1",
+    "chrM\t16000\t17000\tpeak5\t2",
+]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    directory = tmp_path / "input"
+    directory.mkdir()
+    (directory / "peaks.bed").write_text("\n".join(BED) + "\n")
+    with gzip.open(directory / "more.bed.gz", "wt") as f:
+        f.write("\n".join(BED[1:3]) + "\n")
+    table = pa.table(
+        {
+            "chrom": pa.array(["chr1", "2", "X", "chrM"]).dictionary_encode(),
+            "start": pa.array([5, 10, -1, 0], pa.int32()),
+            "end": pa.array([10, 20, 5, 100], pa.int32()),
+            "score": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    pq.write_table(table, directory / "intervals.parquet", row_group_size=2)
+    (directory / "notes.txt").write_text("skipped")
+    return directory
+
+
+def test_harmonize_dataset(dataset, tmp_path):
+    db = AssemblyInfo.connect()
+    output = tmp_path / "output"
+
+    result = db.harmonize_dataset(
+        dataset, output, "hg38", roles=["assembled"], processes=1, batch_size=2
+    )
+    assert result["input"].map(lambda p: p.rsplit("/", 1)[-1]).tolist() == [
+        "intervals.parquet",
+        "more.bed.gz",
+        "peaks.bed",
+    ]
+    assert result["rows"].tolist() == [4, 2, 5]
+    assert result["kept"].tolist() == [3, 2, 2]
+
+    bed = (output / "peaks.bed").read_text().splitlines()
+    assert bed == [
+        "track name=peaks",
+        "chr1\t100\t200\tpeak1\t5",
+        "chr2\t0\t50\tpeak2\t7",
+    ]
+    with gzip.open(output / "more.bed.gz", "rt") as f:
+        assert f.read().splitlines() == bed[1:]
+
+    table = pq.read_table(output / "intervals.parquet")
+    assert table["chrom"].to_pylist() == ["chr1", "chr2", "chrM"]
+    assert table["score"].to_pylist() == [1.0, 2.0, 4.0]
+
+
+def test_harmonize_dataset_options(dataset, tmp_path):
+    db = AssemblyInfo.connect()
+    paths = [dataset / "intervals.parquet", dataset / "peaks.bed"]
+
+    result = db.harmonize_dataset(
+        paths,
+        tmp_path / "refseq",
+        "hg38",
+        to_provider="refseq",
+        out_of_bounds="clip",
+        processes=2,
+    )
+    assert result["kept"].tolist() == [4, 4]
+    assert result["out_of_bounds"].tolist() == [1, 1]
+    table = pq.read_table(tmp_path / "refseq" / "intervals.parquet").to_pandas()
+    assert table["chrom"].tolist()[:2] == ["NC_000001.11", "NC_000002.12"]
+    assert table["start"].tolist()[2] == 0
+    bed = pd.read_csv(
+        tmp_path / "refseq" / "peaks.bed", sep="\t", skiprows=1, header=None
+    )
+    assert bed.iloc[-1].tolist() == ["NC_012920.1", 16000, 16569, "peak5", 2]
+
+    with pytest.raises(ValueError):
+        db.harmonize_dataset(
+            paths, tmp_path / "error", "hg38", out_of_bounds="error", processes=1
+        )
+    assert not (tmp_path / "error" / "intervals.parquet").exists()
+
+    with pytest.raises(ValueError):
+        db.harmonize_dataset(paths, tmp_path / "x", "hg38", out_of_bounds="wrap")
+    with pytest.raises(ValueError):
+        db.harmonize_dataset(dataset / "notes.txt", tmp_path / "x", "hg38")
+    with pytest.raises(ValueError):
+        db.harmonize_dataset(paths, tmp_path / "x", "hg38", to_provider="nope")
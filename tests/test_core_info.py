@@ -1,3 +1,6 @@
+import pandas as pd
+import pyarrow as pa
+
 from assemblyinfo.interface import AssemblyInfo
 
 
@@ -57,6 +60,17 @@ def test_get_assembly_metadata_t2t():
     assert len(rs) > 0, "The result if empty"
 
 
+def test_get_assembly_metadata_arrow():
+    genome_info = AssemblyInfo.connect()
+
+    rs = genome_info.get_assembly_metadata("hg38", output="arrow")
+    expected = genome_info.get_assembly_metadata("hg38")
+
+    assert isinstance(rs, pa.Table), "The result is not an Arrow table"
+    assert rs["patch"].to_pylist() == expected["patches"]
+    assert "contigs" not in rs.column_names
+
+
 def test_available_assemblies():
     genome_info = AssemblyInfo.connect()
 
@@ -96,3 +110,16 @@ def test_available_accessions():
 
     assert rs is not None, "The result is None"
     assert len(rs) > 0, "The result is empty"
+
+
+def test_get_db():
+    db = AssemblyInfo.connect()
+
+    result = db.get_db()
+    assert "seqinfo" in result.columns
+    assert result is db.get_db()
+
+    row = result.query("patch == 'GRCh38.p14'").index[0]
+    seqinfo = pd.DataFrame.from_records(result.at[row, "seqinfo"])
+    expected = db.get_seqinfo("GRCh38.p14").reset_index()
+    assert seqinfo["name"].tolist() == expected["name"].tolist()
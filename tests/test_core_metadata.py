@@ -0,0 +1,44 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_get_metadata_table():
+    db = AssemblyInfo.connect()
+
+    table = db.get_metadata_table()
+    assert len(table) == len(db.get_db())
+    assert table["date"].dtype.kind == "M"
+    assert table["contig_N50"].dtype == "Int64"
+    assert table["taxid"].dtype == "Int64"
+    assert table["gc_perc"].dtype == "float64"
+    assert isinstance(table["assembly_level"].dtype, pd.CategoricalDtype)
+
+    metadata = db.get_assembly_metadata("GRCh38")
+    hg38 = table[table["assembly_name"] == metadata["assembly_name"]].iloc[0]
+    assert hg38["contig_N50"] == metadata["contig-N50"]
+    assert hg38["date"] == pd.Timestamp(metadata["date"])
+
+    arrow = db.get_metadata_table(output="arrow")
+    assert isinstance(arrow, pa.Table)
+    assert arrow.column_names == table.columns.tolist()
+
+
+def test_query_metadata():
+    db = AssemblyInfo.connect()
+    table = db.get_metadata_table()
+
+    result = db.query_metadata("latest and contig_N50 > 10e6")
+    assert (result["contig_N50"] > 10e6).all()
+    assert result["latest"].all()
+    assert "GRCh38.p14" in result["patch"].tolist()
+
+    top = db.query_metadata(sort_by="contig_N50", ascending=False, limit=3)
+    assert top["contig_N50"].tolist() == table["contig_N50"].nlargest(3).tolist()
+
+    with pytest.raises(ValueError):
+        db.query_metadata("unknown_column > 1")
+    with pytest.raises(ValueError):
+        db.query_metadata(sort_by="unknown_column")
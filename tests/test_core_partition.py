@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def _chunk_lengths(regions):
+    return (regions["end"] - regions["start"]).groupby(regions["chunk"]).sum()
+
+
+def test_partition_genome():
+    db = AssemblyInfo.connect()
+    chromsizes = db.get_chromsizes("hg38")
+
+    regions = db.partition_genome("hg38", n_chunks=16)
+    assert regions.columns.tolist() == ["chunk", "chrom", "start", "end"]
+    assert sorted(regions["chunk"].unique()) == list(range(16))
+    # contigs are kept whole, each in a single chunk
+    assert (regions["start"] == 0).all()
+    assert sorted(regions["chrom"]) == sorted(chromsizes.index)
+    assert (regions["end"].to_numpy() == chromsizes[regions["chrom"]].to_numpy()).all()
+
+    # no chunk is longer than the longest contig or 4/3 of the mean
+    lengths = _chunk_lengths(regions)
+    assert lengths.sum() == chromsizes.sum()
+    assert lengths.max() <= max(chromsizes.max(), lengths.mean() * 4 / 3)
+
+
+def test_partition_genome_split():
+    db = AssemblyInfo.connect()
+    chromsizes = db.get_chromsizes("hg38", roles=["assembled"])
+
+    regions = db.partition_genome(
+        "hg38", target_size=50_000_000, roles=["assembled"], split_contigs=True
+    )
+    assert (regions["end"] - regions["start"]).max() <= 50_000_000
+    assert (regions["start"] % 50_000_000 == 0).all()
+    lengths = _chunk_lengths(regions)
+    assert lengths.sum() == chromsizes.sum()
+    assert len(lengths) == np.ceil(chromsizes.sum() / 50_000_000)
+
+    balanced = _chunk_lengths(
+        db.partition_genome("hg38", n_chunks=8, roles=["assembled"], split_contigs=True)
+    )
+    assert balanced.max() <= balanced.mean() * 4 / 3
+
+    # regions of each chunk follow the assembly order
+    chunk = regions[regions["chunk"] == 0]
+    ranks = chromsizes.index.get_indexer(chunk["chrom"])
+    assert (np.diff(ranks) >= 0).all()
+
+
+def test_partition_genome_invalid():
+    db = AssemblyInfo.connect()
+
+    with pytest.raises(ValueError):
+        db.partition_genome("hg38")
+    with pytest.raises(ValueError):
+        db.partition_genome("hg38", n_chunks=4, target_size=1_000)
+    with pytest.raises(ValueError):
+        db.partition_genome("hg38", n_chunks=0)
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assemblyinfo.core.acc import _build_accession_index
+from assemblyinfo.core.chrom import _arrow_contigs, _build_seqinfo_table
+from assemblyinfo.core.contig import _build_contig_index, _contig_index
+from assemblyinfo.core.detect import _build_length_index, _length_index
+from assemblyinfo.core.info import _arrow_db
+from assemblyinfo.core.search import _build_search_index
+from assemblyinfo.interface import AssemblyInfo
+
+COLUMNS = [
+    "Sequence-Name",
+    "Sequence-Role",
+    "Assigned-Molecule",
+    "Assigned-Molecule-Location/Type",
+    "GenBank-Accn",
+    "Relationship",
+    "RefSeq-Accn",
+    "Assembly-Unit",
+    "Sequence-Length",
+    "UCSC-style-name",
+]
+SEQUENCES = [
+    "1 assembled-molecule 1 Chromosome CM999999.1 = NC_999999.1 @ 1000 chr1",
+    "2 assembled-molecule 2 Chromosome CM999998.1 = NC_999998.1 @ 500 chr2",
+]
+REPORT = "\n".join(
+    [
+        "# Assembly name:  TestAsm.p1",
+        "# Organism name:  Homo sapiens (human)",
+        "# Taxid:          9606",
+        "# Date:           2024-01-01",
+        "# GenBank assembly accession: GCA_999999999.1",
+        "# RefSeq assembly accession:  GCF_999999999.1",
+        "#",
+        "# " + "\t".join(COLUMNS),
+        *[
+            "\t".join(sequence.split()).replace("@", "Primary Assembly")
+            for sequence in SEQUENCES
+        ],
+        "",
+    ]
+)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASSEMBLYINFO_OVERLAY", str(tmp_path / "overlay.parquet"))
+    instance = object.__new__(AssemblyInfo)
+    instance._load_db()
+    return instance
+
+
+def test_register_assembly_report(db, tmp_path):
+    path = tmp_path / "TestAsm_assembly_report.txt"
+    path.write_text(REPORT)
+    db.resolve("hg38")
+    db.get_patch_from_accession("GCF_000001405.40")
+    db.available_patches("hg38")
+    assert db.search("GCA_999999999.1").empty
+    data, index = db._data, db._cache["resolve_index"]
+
+    key = db.register_assembly(path)
+    # the tables and indexes are swapped in, not modified in place
+    assert len(db._data) == len(data) + 1
+    assert len(db._cache["resolve_index"]) > len(index)
+    # the extended indexes are those built from every row
+    pd.testing.assert_frame_equal(
+        db._cache["accession_index"], _build_accession_index(db)
+    )
+    pd.testing.assert_frame_equal(db._cache["search_index"], _build_search_index(db))
+    assert key.patch == "TestAsm.p1"
+    assert key.assembly == "TestAsm"
+    assert key.species == "homo_sapiens"
+
+    assert db.resolve("testasm").patch == "TestAsm.p1"
+    assert db.resolve("GCA_999999999.1").row == key.row
+    assert db.search("GCA_999999999.1")["patch"].tolist() == ["TestAsm.p1"]
+    assert db.get_patch_from_accession("GCF_999999999") == ["TestAsm.p1"]
+    assert db.get_genbank_accession("TestAsm.p1") == ["GCA_999999999.1"]
+    assert db.available_patches("TestAsm") == ["TestAsm.p1"]
+    assert db.get_chromsizes("TestAsm").to_dict() == {"chr1": 1000, "chr2": 500}
+    assert db.find_sequence(["NC_999999.1"])["patch"].tolist() == ["TestAsm.p1"]
+    assert db.resolve("hg38").patch == "GRCh38.p14"
+
+    table = db.get_chromsizes("TestAsm", output="arrow")
+    assert table["length"].to_pylist() == [1000, 500]
+
+
+def test_register_assembly_chrom_sizes(db, tmp_path):
+    path = tmp_path / "K562.chrom.sizes"
+    path.write_text("chr1\t1000\nchr2\t500\nchr_decoy\t20\n")
+
+    with pytest.raises(ValueError):
+        db.register_assembly(path)
+    with pytest.raises(ValueError):
+        db.register_assembly(path, assembly="K562")
+
+    key = db.register_assembly(path, assembly="K562", species="homo_sapiens")
+    assert key.patch == "K562"
+    assert db.get_chromnames("K562") == ["chr1", "chr2", "chr_decoy"]
+
+    with pytest.raises(ValueError):
+        db.register_assembly(path, assembly="K562", species="homo_sapiens")
+
+    # the overlay is merged by later connections
+    other = object.__new__(AssemblyInfo)
+    other._load_db()
+    assert len(other._data) == len(db._data)
+    assert other.get_chromsizes("K562").tolist() == [1000, 500, 20]
+
+
+def test_register_assembly_demotes_latest(db, tmp_path):
+    first = tmp_path / "TestAsm_p1_assembly_report.txt"
+    first.write_text(REPORT)
+    db.register_assembly(first, assembly_ucsc="tstAsm1")
+    second = tmp_path / "TestAsm_p2_assembly_report.txt"
+    second.write_text(
+        REPORT.replace("TestAsm.p1", "TestAsm.p2").replace("999999999.1", "999999999.2")
+    )
+    db.register_assembly(second)
+
+    versions = db._data.set_index("patch")["version"]
+    assert pd.isna(versions["TestAsm.p1"])
+    assert versions["TestAsm.p2"] == "latest"
+    assert db.resolve("testasm").patch == "TestAsm.p2"
+    assert db.resolve("tstasm1").patch == "TestAsm.p2"
+
+    # the previous patch is demoted in the overlay as well
+    other = object.__new__(AssemblyInfo)
+    other._load_db()
+    assert other.resolve("testasm").patch == "TestAsm.p2"
+    overlay = pd.read_parquet(tmp_path / "overlay.parquet")
+    assert overlay["version"].tolist() == [None, "latest"]
+
+
+def test_register_assembly_without_overlay(tmp_path, monkeypatch):
+    # the overlay is located when connecting, and an empty path disables it
+    instance = object.__new__(AssemblyInfo)
+    instance._load_db()
+    assert instance._overlay_path is None
+    path = tmp_path / "TestAsm_assembly_report.txt"
+    path.write_text(REPORT)
+    with pytest.raises(ValueError):
+        instance.register_assembly(path)
+
+    monkeypatch.setenv("ASSEMBLYINFO_OVERLAY", "~/overlay.parquet")
+    instance._load_db()
+    assert instance._overlay_path.is_absolute()
+
+
+def test_register_assembly_metadata(db, tmp_path):
+    path = tmp_path / "TestAsm_assembly_report.txt"
+    path.write_text(REPORT)
+    db.register_assembly(path)
+
+    metadata = db.get_assembly_metadata("TestAsm")
+    assert metadata["assembly_name"] == "TestAsm.p1"
+    assert metadata["patches"] == ["TestAsm.p1"]
+    assert metadata["genbank"] == ["GCA_999999999.1"]
+
+
+def _postings(index):
+    return {
+        name: sorted(zip(index.positions[start:stop], index.columns[start:stop]))
+        for name, start, stop in zip(index.names, index.bounds, index.bounds[1:])
+    }
+
+
+def test_register_assembly_extends_contig_indexes(db, tmp_path):
+    contig_index = _contig_index(db)
+    _length_index(db)
+    arrow_contigs, arrow_db = _arrow_contigs(db), _arrow_db(db)
+    path = tmp_path / "TestAsm_assembly_report.txt"
+    path.write_text(REPORT)
+    key = db.register_assembly(path)
+
+    # the cached tables are extended, and equal those built from every row
+    assert db._cache["contig_index"] is not contig_index
+    pd.testing.assert_frame_equal(
+        db._cache["seqinfo_table"], _build_seqinfo_table(db), check_categorical=False
+    )
+    extended, built = db._cache["contig_index"], _build_contig_index(db)
+    assert _postings(extended) == _postings(built)
+    assert np.array_equal(extended.by_length, built.by_length)
+    assert np.array_equal(extended.lengths, built.lengths)
+    extended, built = db._cache["length_index"], _build_length_index(db)
+    for field in built._fields:
+        if field != "fingerprints":
+            assert np.array_equal(getattr(extended, field), getattr(built, field))
+    assert extended.fingerprints == built.fingerprints
+    assert db._cache["arrow_contigs"].num_rows > arrow_contigs.num_rows
+    assert db._cache["arrow_db"].num_rows == arrow_db.num_rows + 1
+
+    assert db.find_sequence(["CM999998.1"])["patch"].tolist() == ["TestAsm.p1"]
+    assert db.get_seqinfo("TestAsm", output="arrow")["length"].to_pylist() == [
+        1000,
+        500,
+    ]
+    assert key.row == len(db._data) - 1
@@ -0,0 +1,89 @@
+import pytest
+
+from assemblyinfo.core.resolve import KIND_COLUMNS, AssemblyKey, _rows
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_resolve_assembly_names():
+    db = AssemblyInfo.connect()
+
+    for identifier in ["hg38", "Hg38", " HG38 ", "GRCh38", "grch38"]:
+        key = db.resolve(identifier)
+        assert isinstance(key, AssemblyKey)
+        assert key.assembly == "GRCh38"
+        assert key.assembly_ucsc == "hg38"
+        assert key.patch == "GRCh38.p14"
+        assert key.species == "homo_sapiens"
+
+    assert db.resolve("hg38").kind == "ucsc"
+    assert db.resolve("GRCh38").kind == "assembly"
+
+
+def test_resolve_patches_and_accessions():
+    db = AssemblyInfo.connect()
+
+    key = db.resolve("GRCh38.p13")
+    assert key.kind == "patch"
+    assert key.patch == "GRCh38.p13"
+
+    key = db.resolve("GCF_000001405.40")
+    assert key.kind == "refseq"
+    assert key.accession == "GCF_000001405.40"
+    assert key.patch == "GRCh38.p14"
+
+    key = db.resolve("gca_000001635.7")
+    assert key.kind == "genbank"
+    assert key.patch == "GRCm38.p5"
+
+    assert db.resolve("GRCh38", kinds=["patch"]).patch == "GRCh38"
+
+
+def test_resolve_species():
+    db = AssemblyInfo.connect()
+
+    key = db.resolve("human")
+    assert key.kind == "common_name"
+    assert key.species == "homo_sapiens"
+    assert key.row is None
+
+    with pytest.raises(ValueError, match="common_name"):
+        db.resolve("human", kinds=["assembly", "ucsc"])
+
+
+def test_resolve_suggestions():
+    db = AssemblyInfo.connect()
+
+    assert "hg38" in db.suggest("hg83")
+    assert db.suggest("GRCh38.p41", kinds=["patch"])[0].startswith("GRCh38.p")
+
+    with pytest.raises(ValueError, match="Did you mean"):
+        db.resolve("GRCh83")
+
+    with pytest.raises(ValueError):
+        db.resolve("")
+
+
+def test_core_functions_use_resolver():
+    db = AssemblyInfo.connect()
+
+    assert len(db.get_chromsizes("HG38", roles=["assembled"])) == 25
+    assert len(db.filter_chromosome_data("GRCh38.p13")) < len(
+        db.filter_chromosome_data("GRCh38.p14")
+    )
+    assert db.get_assembly_metadata("Hg38")["species"] == "homo_sapiens"
+    assert db.available_patches("hg38")[0].startswith("GRCh38")
+
+
+def test_rows_match_column_scan():
+    db = AssemblyInfo.connect()
+
+    queries = [
+        ("assembly", "GRCh38"),
+        ("ucsc", "hg38"),
+        ("species", "mus_musculus"),
+    ]
+    for kind, value in queries:
+        scan = db._data.index[db._data[KIND_COLUMNS[kind]].eq(value)].to_numpy()
+        assert len(scan) > 1
+        assert _rows(db, kind, value).tolist() == scan.tolist()
+    assert len(_rows(db, "patch", "GRCh83")) == 0
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_sample_positions():
+    db = AssemblyInfo.connect()
+    chromsizes = db.get_chromsizes("hg38", roles=["assembled"])
+
+    chroms, positions = db.sample_positions(
+        "hg38", 200_000, roles=["assembled"], seed=0
+    )
+    assert len(chroms) == len(positions) == 200_000
+    assert chroms.categories.tolist() == chromsizes.index.tolist()
+    assert (positions >= 0).all()
+    assert (positions < chromsizes.reindex(np.asarray(chroms)).to_numpy()).all()
+
+    # contigs are drawn in proportion to their length
+    frequencies = pd.Series(chroms).value_counts(normalize=True, sort=False)
+    assert np.allclose(frequencies, chromsizes / chromsizes.sum(), atol=0.005)
+
+    again = db.sample_positions("hg38", 200_000, roles=["assembled"], seed=0)
+    assert np.array_equal(again[1], positions)
+
+    refseq, _ = db.sample_positions("hg38", 10, provider="refseq", seed=0)
+    assert set(refseq.categories) <= set(
+        db.get_chromsizes("hg38", provider="refseq").index
+    )
+
+
+def test_iter_sample_positions():
+    db = AssemblyInfo.connect()
+
+    _, positions = db.sample_positions("hg38", 10_000, seed=1)
+    chunks = list(db.iter_sample_positions("hg38", 10_000, chunk_size=3_000, seed=1))
+    assert [len(p) for _, p in chunks] == [3_000, 3_000, 3_000, 1_000]
+    assert np.array_equal(np.concatenate([p for _, p in chunks]), positions)
+
+
+def test_sample_intervals():
+    db = AssemblyInfo.connect()
+    chromsizes = db.get_chromsizes("hg38")
+
+    intervals = db.sample_intervals("hg38", 10_000, 100_000, seed=0)
+    assert intervals.columns.tolist() == ["chrom", "start", "end"]
+    assert (intervals["end"] - intervals["start"] == 100_000).all()
+    assert (intervals["start"] >= 0).all()
+    lengths = chromsizes.reindex(intervals["chrom"].astype(str)).to_numpy()
+    assert (intervals["end"].to_numpy() <= lengths).all()
+
+    # contigs shorter than the intervals are never drawn
+    short = chromsizes.index[chromsizes < 100_000]
+    assert not intervals["chrom"].isin(short).any()
+
+    with pytest.raises(ValueError):
+        db.sample_intervals("hg38", 10, 10**10)
+    with pytest.raises(ValueError):
+        db.sample_intervals("hg38", 10, 0)
+
+
+def test_sample_shares_contig_sizes_of_aliases():
+    db = AssemblyInfo.connect()
+    before = len(db._query_cache)
+
+    first = db.sample_positions("hg38", 10, roles=["assembled"], seed=0)
+    alias = db.sample_positions("GRCh38", 10, roles=["assembled"], seed=0)
+    assert np.array_equal(first[1], alias[1])
+    # the aliases resolve to one patch row, so one entry is cached
+    assert len(db._query_cache) <= before + 1
@@ -0,0 +1,49 @@
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_search():
+    db = AssemblyInfo.connect()
+
+    result = db.search("PRJNA31257", fields=["bioproject"])
+    assert not result.empty
+    assert set(result["assembly"]) == {"GRCh37", "GRCh38"}
+    assert result.columns.tolist() == [
+        "assembly",
+        "assembly_ucsc",
+        "patch",
+        "species",
+        "genbank_accession",
+        "refseq_accession",
+    ]
+
+    # every token must match, case-insensitively
+    consortium = db.search("Genome Reference Consortium")
+    assert set(consortium["patch"]) >= {"GRCh38.p14", "GRCh37.p13"}
+    assert db.search("genome reference consortium xyzzy").empty
+
+    # accessions are tokens, and so are their parts
+    patch = db.search("GCA_000001405.29")
+    assert patch["patch"].tolist() == ["GRCh38.p14"]
+    assert set(db.search("000001405")["assembly"]) >= {"GRCh37", "GRCh38"}
+
+    assert db.search("9606", fields=["taxid"])["species"].eq("homo_sapiens").all()
+    assert db.search("9606", fields=["bioproject"]).empty
+    assert db.search("").empty
+
+
+def test_search_prefix():
+    db = AssemblyInfo.connect()
+
+    assert db.search("GCA_0000014").empty
+    prefix = db.search("GCA_0000014", prefix=True)
+    assert prefix["genbank_accession"].str.startswith("GCA_0000014").all()
+    assert "GRCh38.p14" in prefix["patch"].tolist()
+
+
+def test_search_invalid_field():
+    db = AssemblyInfo.connect()
+
+    with pytest.raises(ValueError):
+        db.search("9606", fields=["unknown"])
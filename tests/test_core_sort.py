@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_get_chrom_ranks():
+    db = AssemblyInfo.connect()
+
+    ranks = db.get_chrom_ranks("hg38")
+    assert ranks.index.name == "name"
+    assert ranks.tolist() == list(range(len(ranks)))
+    assert ranks.index[:24].tolist() == [f"chr{i}" for i in [*range(1, 23), "X", "Y"]]
+    assert ranks.index[-1] == "chrM"
+
+    seqinfo = db.get_seqinfo("hg38")
+    roles = seqinfo.loc[ranks.index[:-1], "role"].astype(str)
+    assert roles.drop_duplicates().tolist() == [
+        "assembled",
+        "unlocalized",
+        "unplaced",
+        "novel",
+        "alt",
+        "fix",
+    ]
+
+    refseq = db.get_chrom_ranks("GRCh38.p14", provider="refseq")
+    assert refseq["NC_000001.11"] == ranks["chr1"]
+    assert refseq["NC_012920.1"] == ranks["chrM"]
+
+    with pytest.raises(ValueError):
+        db.get_chrom_ranks("hg38", provider="NonExistentProvider")
+
+
+def test_sort_intervals():
+    db = AssemblyInfo.connect()
+
+    df = pd.DataFrame(
+        {
+            "chrom": ["chrM", "chr10", "unknown", "chr2", "chr10", "chrX", None, "1"],
+            "start": [5, 20, 0, 7, 10, 3, 0, 100],
+            "end": [6, 30, 1, 8, 15, 4, 1, 200],
+        }
+    )
+    result = db.sort_intervals(df, "hg38")
+    assert result.index.tolist() == [7, 3, 4, 1, 5, 0, 2, 6]
+
+    result = db.sort_intervals(
+        df.rename(columns={"chrom": "CHROM"}),
+        "hg38",
+        chrom="CHROM",
+        end=None,
+        provider="ucsc",
+    )
+    assert result["CHROM"].tolist()[:5] == ["chr2", "chr10", "chr10", "chrX", "chrM"]
+
+    with pytest.raises(ValueError):
+        db.sort_intervals(df, "NonExistentAssembly")
@@ -0,0 +1,51 @@
+import pyarrow as pa
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+pytest.importorskip("duckdb")
+
+
+def test_sql_views():
+    db = AssemblyInfo.connect()
+
+    result = db.sql("SELECT * FROM patches")
+    assert len(result) == len(db._data)
+    assert result["patch"].tolist() == db._data["patch"].tolist()
+
+    result = db.sql("SELECT latest_patch FROM assemblies WHERE assembly = 'GRCh38'")
+    assert result["latest_patch"].tolist() == ["GRCh38.p14"]
+
+    result = db.sql(
+        "SELECT name, length FROM contigs WHERE patch = ? ORDER BY position",
+        ["GRCh38.p14"],
+    )
+    chromsizes = db.get_chromsizes("GRCh38.p14")
+    assert result["name"].tolist() == chromsizes.index.tolist()
+    assert result["length"].tolist() == chromsizes.tolist()
+
+    result = db.sql(
+        "SELECT value, number FROM metadata WHERE patch = $patch AND key = $key",
+        {"patch": "GRCh38.p14", "key": "total-length"},
+    )
+    metadata = db._data.set_index("patch").at["GRCh38.p14", "metadata"]
+    assert result["number"].tolist() == [metadata["total-length"]]
+
+
+def test_sql_cross_assembly():
+    db = AssemblyInfo.connect()
+
+    result = db.sql(
+        "SELECT c.assembly, count(*) AS n FROM contigs c "
+        "JOIN assemblies a ON c.patch = a.latest_patch "
+        "WHERE c.role = 'assembled' AND c.length > 100e6 GROUP BY c.assembly",
+        output="arrow",
+    )
+    assert isinstance(result, pa.Table)
+    counts = dict(zip(result["assembly"].to_pylist(), result["n"].to_pylist()))
+    expected = db.filter_chromosome_data("GRCh38", roles=["assembled"])
+    expected = expected.query("length > 100e6")
+    assert counts["GRCh38"] == len(expected)
+
+    with pytest.raises(ValueError):
+        db.sql("SELECT 1", output="polars")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+
+
+def _naive_nx(lengths, level):
+    lengths = np.sort(lengths)[::-1]
+    position = np.flatnonzero(np.cumsum(lengths) * 100 >= lengths.sum() * level)[0]
+    return lengths[position], position + 1
+
+
+def test_compute_stats():
+    db = AssemblyInfo.connect()
+
+    stats = db.compute_stats()
+    assert len(stats) == len(db.get_db())
+
+    hg38 = db.compute_stats(["hg38", "GRCh37.p13"]).set_index("patch")
+    assert hg38.index.tolist() == ["GRCh38.p14", "GRCh37.p13"]
+    for patch in hg38.index:
+        seqinfo = db.get_seqinfo(patch)
+        lengths = seqinfo["length"].to_numpy(np.int64)
+        row = hg38.loc[patch]
+        assert row["contig_count"] == len(seqinfo)
+        assert row["total_length"] == lengths.sum()
+        assert row["assembled_length"] == lengths[seqinfo["role"] == "assembled"].sum()
+        assert row["unplaced_count"] == (seqinfo["role"] == "unplaced").sum()
+        assert (row["N50"], row["L50"]) == _naive_nx(lengths, 50)
+        assert (row["N90"], row["L90"]) == _naive_nx(lengths, 90)
+
+
+def test_compute_stats_filters():
+    db = AssemblyInfo.connect()
+
+    assembled = db.compute_stats(["hg38"], roles=["assembled"]).iloc[0]
+    chromsizes = db.get_chromsizes("hg38", roles=["assembled"])
+    assert assembled["contig_count"] == len(chromsizes)
+    assert assembled["total_length"] == chromsizes.sum()
+    assert assembled["N50"] == db.get_chromsizes("hg38")["chrX"]
+    assert assembled["L50"] == 8
+
+    empty = db.compute_stats(["hg38"], roles=["unknown"]).iloc[0]
+    assert empty["contig_count"] == 0
+    assert empty[["N50", "L50", "N90", "L90"]].isna().all()
+
+    with pytest.raises(ValueError):
+        db.compute_stats(["not_an_assembly"])
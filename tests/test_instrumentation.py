@@ -0,0 +1,45 @@
+from assemblyinfo import core
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_instrumentation_disabled_by_default():
+    assert AssemblyInfo.get_chromsizes is core.get_chromsizes
+
+
+def test_instrumentation_stats():
+    db = AssemblyInfo.connect()
+    events = []
+
+    AssemblyInfo.stats(reset=True)
+    AssemblyInfo.enable_instrumentation(hooks=[lambda *event: events.append(event)])
+    try:
+        assert AssemblyInfo.get_chromsizes is not core.get_chromsizes
+        db.get_chromsizes("hg38", roles=["assembled"])
+        db.get_chromsizes("hg38", roles=["assembled"])
+        db.diff_patches("GRCh38.p13", "GRCh38.p14")
+    finally:
+        AssemblyInfo.disable_instrumentation()
+
+    assert AssemblyInfo.get_chromsizes is core.get_chromsizes
+
+    stats = AssemblyInfo.stats(reset=True)
+    assert stats["calls"].loc["get_chromsizes", "calls"] == 2
+    assert stats["calls"].loc["filter_chromosome_data", "calls"] == 2
+    assert stats["latency"].loc["get_chromsizes"].sum() == 2
+    assert {"lookup", "filter", "build"} <= set(stats["phases"].index)
+    assert stats["cache"].loc["resolve_index", "hits"] >= 1
+
+    assert ("call", "get_chromsizes") in {event[:2] for event in events}
+    assert "phase" in {event[0] for event in events}
+
+    db.get_chromsizes("hg38")
+    assert len(AssemblyInfo.stats()["calls"]) == 0
+
+    # the hooks passed to enable are removed by disable
+    count = len(events)
+    AssemblyInfo.enable_instrumentation()
+    try:
+        db.get_chromsizes("hg38")
+    finally:
+        AssemblyInfo.disable_instrumentation()
+    assert len(events) == count
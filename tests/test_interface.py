@@ -0,0 +1,92 @@
+import threading
+
+import assemblyinfo
+from assemblyinfo.interface import AssemblyInfo
+
+
+def test_connect_returns_singleton():
+    assert assemblyinfo.connect() is AssemblyInfo.connect()
+    assert AssemblyInfo() is AssemblyInfo.connect()
+
+
+def test_concurrent_connect_loads_once(monkeypatch):
+    calls = []
+    load_db = AssemblyInfo._load_db
+
+    def counting_load_db(self):
+        calls.append(threading.get_ident())
+        load_db(self)
+
+    monkeypatch.setattr(AssemblyInfo, "_instance", None)
+    monkeypatch.setattr(AssemblyInfo, "_load_db", counting_load_db)
+
+    n_threads = 32
+    barrier = threading.Barrier(n_threads)
+    instances = [None] * n_threads
+
+    def worker(i):
+        barrier.wait()
+        instances[i] = AssemblyInfo.connect()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(instance is instances[0] for instance in instances)
+    assert hasattr(instances[0], "_data")
+
+
+def test_concurrent_cached_builds_once():
+    db = AssemblyInfo.connect()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return object()
+
+    n_threads = 16
+    barrier = threading.Barrier(n_threads)
+    values = [None] * n_threads
+
+    def worker(i):
+        barrier.wait()
+        values[i] = db._cached("test_concurrent_cached_builds_once", factory)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(value is values[0] for value in values)
+
+
+def test_preload():
+    db = assemblyinfo.preload()
+    assert db is AssemblyInfo.connect()
+    assert "seqinfo_table" in db._cache
+
+
+def test_contigs_shared_across_patches():
+    db = AssemblyInfo.connect()
+    data = db._data.set_index("patch")
+
+    assert len(db._contigs) < sum(len(c) for c in db._data["contigs"])
+    p13 = set(data.loc["GRCh38.p13", "contigs"])
+    p14 = set(data.loc["GRCh38.p14", "contigs"])
+    assert len(p13 & p14) / len(p13) > 0.9
+
+
+def test_memory_usage():
+    db = AssemblyInfo.connect()
+    db.get_seqinfo("hg38")
+
+    usage = AssemblyInfo.memory_usage()
+    assert {"db", "contigs"} <= set(usage.index.get_level_values("table"))
+    assert (usage["bytes"] > 0).all()
+    assert usage.loc[("db", "species"), "dtype"] == "category"
+    assert usage.loc[("contigs", "name"), "dtype"] == "string"
@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from assemblyinfo.interface import AssemblyInfo
+from assemblyinfo.storage import SQLiteStorage, Storage, export_sqlite
+
+
+@pytest.fixture(scope="module")
+def sqlite_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("storage") / "db.sqlite"
+    export_sqlite(path)
+    return path
+
+
+def test_export_sqlite(sqlite_path):
+    db = AssemblyInfo.connect()
+
+    with sqlite3.connect(sqlite_path) as connection:
+        (patches,) = connection.execute("SELECT count(*) FROM patches").fetchone()
+        (contigs,) = connection.execute("SELECT count(*) FROM contigs").fetchone()
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM contigs WHERE refseq = ?", ["x"]
+        ).fetchall()
+
+    assert patches == len(db._data)
+    assert contigs == len(db._contigs)
+    assert "contigs_refseq" in plan[0][-1]
+
+
+def test_sqlite_storage(sqlite_path):
+    db = AssemblyInfo.connect()
+    queries = [
+        ("hg38", {}),
+        ("GRCh38.p13", {"roles": ["assembled", "alt-scaffold"], "length": "> 100000"}),
+        ("mm10", {"units": ["non-nuclear"]}),
+    ]
+    expected = [db.filter_chromosome_data(a, **kwargs) for a, kwargs in queries]
+    seqinfo = db.get_seqinfo("canFam6")
+
+    AssemblyInfo.set_storage(sqlite_path)
+    try:
+        assert isinstance(db._storage(), SQLiteStorage)
+        for (assembly, kwargs), frame in zip(queries, expected):
+            result = db.filter_chromosome_data(assembly, **kwargs)
+            pd.testing.assert_frame_equal(result, frame, check_categorical=False)
+
+        result = db.get_seqinfo("CANFAM6")
+        pd.testing.assert_frame_equal(result, seqinfo, check_categorical=False)
+
+        with pytest.raises(ValueError):
+            db.get_seqinfo("NonExistentAssembly")
+
+        with pytest.raises(ValueError):
+            db.get_chromsizes("hg38", length="long")
+    finally:
+        AssemblyInfo.set_storage()
+
+
+def test_sqlite_storage_missing_file(tmp_path):
+    with pytest.raises(ValueError):
+        AssemblyInfo.set_storage(tmp_path / "missing.sqlite")
+
+
+def test_sqlite_storage_close(sqlite_path):
+    storage = SQLiteStorage(sqlite_path)
+    connections = [storage._connection()]
+    thread = threading.Thread(target=lambda: connections.append(storage._connection()))
+    thread.start()
+    thread.join()
+    assert connections[0] is not connections[1]
+
+    storage.close()
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+    assert isinstance(storage.lookup("hg38"), int)
+    storage.close()
+
+
+def test_storage_is_abstract():
+    with pytest.raises(TypeError):
+        Storage()
+
+
+def test_sqlite_storage_registered_patches(sqlite_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("ASSEMBLYINFO_OVERLAY", str(tmp_path / "overlay.parquet"))
+    db = object.__new__(AssemblyInfo)
+    db._load_db()
+    path = tmp_path / "K562.chrom.sizes"
+    path.write_text("chr1\t1000\nchr2\t500\n")
+    key = db.register_assembly(path, assembly="K562", species="homo_sapiens")
+
+    # registration does not update a SQLite file
+    with pytest.raises(ValueError):
+        SQLiteStorage(sqlite_path).lookup("K562")
+
+    exported = tmp_path / "overlay.sqlite"
+    export_sqlite(exported, overlay_path=db._overlay_path)
+    AssemblyInfo.set_storage(exported)
+    try:
+        assert db._storage().lookup("K562") == key.row
+        assert db.get_chromsizes("K562").to_dict() == {"chr1": 1000, "chr2": 500}
+        assert len(db.get_chromsizes("hg38", roles=["assembled"])) == 25
+    finally:
+        AssemblyInfo.set_storage()